@@ -0,0 +1,458 @@
+# benchmark.py
+"""Banc d'essai des algorithmes de tri.
+
+Balaye SORTING_ALGORITHMS x tailles x types de désordre, avec des tours de
+chauffe puis des mesures répétées sur des listes générées à graine fixe.
+Les résultats (médiane/p95 du temps, comparaisons, échanges ; passes ou
+écritures selon sorting.COUNTER_LABELS, rappelés dans les champs
+'comparisons_label' et 'swaps_label' de chaque résultat) sont écrits en
+JSON ou CSV pour pouvoir suivre les performances d'une version à l'autre.
+
+Avec --cache-dir, chaque mesure est mémorisée sur disque (voir result_cache.py) :
+une nouvelle exécution ne mesure que les combinaisons absentes du cache ou
+mesurées avec une autre version de sorting.py.
+
+Avec --jobs N, les combinaisons sont réparties sur N processus. --cpus fixe
+les cœurs utilisés (un cœur par processus, pour des mesures comparables) et
+--timeout abandonne les combinaisons trop longues (tris quadratiques sur de
+grandes tailles). Les résultats sont émis au fil de l'eau : en CSV et en JSON
+Lines, chaque ligne est écrite dès que sa mesure est terminée.
+
+Les tris parallèles de parallel_sort.py (« Parallel Merge Sort »,
+« Sample Sort ») ne sont mesurés que s'ils sont demandés avec -a. Ils
+utilisent --sort-workers processus (défaut : un par cœur) ; leur accélération
+par rapport au Merge Sort séquentiel, mesuré sur la même liste, est rapportée
+dans la colonne speedup. Mieux vaut alors garder --jobs 1 : les mesures ne se
+disputent pas les cœurs.
+
+Avec --profile, chaque combinaison est aussi rejouée une fois pas à pas sur
+une copie instrumentée (voir metrics.py) : lectures, écritures, déplacements,
+mémoire auxiliaire maximale, profondeur de pile et temps par phase (colonne
+phase_s, en secondes de l'exécution instrumentée) complètent le résultat.
+Cette exécution est bien plus lente que le tri mesuré : à réserver aux tailles
+modestes, ou à combiner avec --timeout.
+
+Exemple :
+    python benchmark.py --sizes 1000 10000 --repeat 5 --format csv -o bench.csv
+    python benchmark.py --sizes 100000 --jobs 8 --cpus 2-9 --timeout 60 -f jsonl
+    python benchmark.py -a "Sample Sort" --sizes 2000000 --only-sizes -d random --sort-workers 8
+    python benchmark.py -a "Heap Sort" "Merge Sort" --sizes 10000 --only-sizes --profile -f csv
+"""
+import argparse
+import contextlib
+import csv
+import functools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import LIST_SIZE_OPTIONS, DISORDER_OPTIONS, DEFAULT_MIN_VAL, DEFAULT_MAX_VAL
+from metrics import profile_sort
+from sorting import SORTING_ALGORITHMS, SORTING_ALGORITHMS_FAST, counter_labels, generate_list
+from parallel_sort import PARALLEL_ALGORITHMS, default_workers
+from result_cache import ResultCache, cache_key
+
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# Mesures détaillées de --profile (None sans --profile et pour les tris parallèles)
+PROFILE_FIELDS = ['reads', 'writes', 'moves', 'aux_peak', 'max_depth', 'phase_s']
+RESULT_FIELDS = [
+    'algorithm', 'size', 'disorder', 'seed', 'repeat',
+    'median_s', 'p95_s', 'min_s', 'comparisons', 'swaps', 'comparisons_label', 'swaps_label',
+    'workers', 'speedup',
+] + PROFILE_FIELDS + ['status']
+BASELINE_ALGORITHM = "Merge Sort" # Référence des accélérations des tris parallèles
+FORMATS = ['json', 'jsonl', 'csv']
+
+
+class JobTimeout(Exception):
+    """Une combinaison a dépassé son temps limite."""
+
+
+def _percentile(values, pct):
+    """Percentile par rang le plus proche (values non vide)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def make_input(size, disorder_type, seed, min_val=DEFAULT_MIN_VAL, max_val=DEFAULT_MAX_VAL):
+    """Génère la liste d'entrée reproductible pour (taille, désordre, graine)."""
+    return generate_list(size, min_val, max_val, disorder_type, seed=seed)
+
+
+def time_algorithm(sort_function, data, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """Chronomètre une version rapide sur des copies de `data`.
+
+    Retourne (durées, comparaisons, échanges). Les compteurs sont ceux du
+    dernier passage : ils sont déterministes pour une entrée donnée.
+    """
+    for _ in range(warmup):
+        sort_function(data[:])
+
+    timings = []
+    comparisons = swaps = 0
+    for _ in range(repeat):
+        arr = data[:]
+        start = time.perf_counter()
+        _, comparisons, swaps = sort_function(arr)
+        timings.append(time.perf_counter() - start)
+    return timings, comparisons, swaps
+
+
+@contextlib.contextmanager
+def _time_limit(timeout):
+    """Lève JobTimeout après `timeout` secondes (Unix, thread principal seulement).
+
+    Ailleurs, la limite est ignorée : la mesure va jusqu'au bout.
+    """
+    if (not timeout or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise JobTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+_last_input = (None, None) # (paramètres, liste) : réutilisée par les combinaisons suivantes
+
+
+def _input_for(size, disorder_type, seed):
+    global _last_input
+    params = (size, disorder_type, seed)
+    if _last_input[0] != params:
+        _last_input = (params, make_input(size, disorder_type, seed))
+    return _last_input[1]
+
+
+def _sort_function(name, workers=None):
+    """Version rapide de `name` ; les tris parallèles reçoivent leur nombre de processus."""
+    if name in PARALLEL_ALGORITHMS:
+        return functools.partial(PARALLEL_ALGORITHMS[name], workers=workers or default_workers())
+    return SORTING_ALGORITHMS_FAST[name]
+
+
+def measure(name, size, disorder_type, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT,
+            warmup=DEFAULT_WARMUP, timeout=None, workers=None, profile=False):
+    """Mesure une combinaison et retourne son résultat (dict).
+
+    Exécutée dans le processus courant ou dans un processus du pool : la liste
+    est régénérée à partir de la graine plutôt que transmise. Pour un tri
+    parallèle, BASELINE_ALGORITHM est aussi mesuré sur la même liste et le
+    rapport des médianes est rapporté dans 'speedup'. Avec `profile`, le
+    générateur d'un tri séquentiel est rejoué sur une copie instrumentée pour
+    remplir PROFILE_FIELDS.
+    """
+    parallel = name in PARALLEL_ALGORITHMS
+    first_label, second_label = counter_labels(name)
+    result = {
+        'algorithm': name,
+        'size': size,
+        'disorder': disorder_type,
+        'seed': seed,
+        'repeat': repeat,
+        'median_s': None,
+        'p95_s': None,
+        'min_s': None,
+        'comparisons': None,
+        'swaps': None,
+        'comparisons_label': first_label, # Ce que comptent réellement les deux compteurs
+        'swaps_label': second_label,
+        'workers': (workers or default_workers()) if parallel else 1,
+        'speedup': None,
+        'reads': None,
+        'writes': None,
+        'moves': None,
+        'aux_peak': None,
+        'max_depth': None,
+        'phase_s': None,
+        'status': 'ok',
+    }
+    data = _input_for(size, disorder_type, seed)
+    metrics = None
+    try:
+        with _time_limit(timeout):
+            timings, comparisons, swaps = time_algorithm(
+                _sort_function(name, workers), data, repeat, warmup)
+            if parallel:
+                baseline, _, _ = time_algorithm(
+                    SORTING_ALGORITHMS_FAST[BASELINE_ALGORITHM], data, repeat, warmup)
+                result['speedup'] = _median(baseline) / _median(timings)
+            if profile and not parallel:
+                _, metrics = profile_sort(SORTING_ALGORITHMS[name], data, name)
+    except JobTimeout:
+        result['status'] = 'timeout'
+        return result
+    result.update({
+        'median_s': _median(timings),
+        'p95_s': _percentile(timings, 95),
+        'min_s': min(timings),
+        'comparisons': comparisons,
+        'swaps': swaps,
+    })
+    if metrics is not None:
+        result.update({
+            'reads': metrics.reads,
+            'writes': metrics.writes,
+            'moves': metrics.moves,
+            'aux_peak': metrics.aux_peak,
+            'max_depth': metrics.max_depth,
+            'phase_s': metrics.phase_times,
+        })
+    return result
+
+
+def parse_cpu_list(text):
+    """'0,2-5' -> [0, 2, 3, 4, 5]"""
+    cpus = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError("liste de cœurs vide")
+    return cpus
+
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_to_cpu(cpu):
+    """Attache le processus courant à un cœur (Linux ; ignoré ailleurs)."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+
+
+def _init_worker(cpus, counter):
+    """Initialisation d'un processus du pool : un cœur distinct par processus."""
+    if cpus:
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        _pin_to_cpu(cpus[index % len(cpus)])
+
+
+def run_benchmark(algorithms=None, sizes=None, disorders=None, repeat=DEFAULT_REPEAT,
+                  warmup=DEFAULT_WARMUP, seed=DEFAULT_SEED, on_result=None, cache=None,
+                  jobs=1, cpus=None, timeout=None, workers=None, profile=False):
+    """Exécute le balayage complet et retourne la liste des résultats (dicts).
+
+    `on_result`, si fourni, est appelé avec chaque résultat dès qu'il est prêt
+    (dans l'ordre d'achèvement quand jobs > 1). `cache` (ResultCache), si
+    fourni, sert les combinaisons déjà mesurées. La liste retournée suit
+    toujours l'ordre du balayage (taille, désordre, algorithme). `workers`
+    fixe le nombre de processus des tris parallèles (défaut : un par cœur).
+    `profile` ajoute les mesures détaillées (PROFILE_FIELDS).
+    """
+    algorithms = algorithms or list(SORTING_ALGORITHMS_FAST.keys())
+    sizes = sizes or sorted(LIST_SIZE_OPTIONS.values())
+    disorders = disorders or DISORDER_OPTIONS
+
+    combinations = [(name, size, disorder_type)
+                    for size in sizes for disorder_type in disorders for name in algorithms]
+    results = [None] * len(combinations)
+    pending = []
+    for index, (name, size, disorder_type) in enumerate(combinations):
+        key = cache_key(name, size, disorder_type, DEFAULT_MIN_VAL, DEFAULT_MAX_VAL, seed, repeat, warmup)
+        if name in PARALLEL_ALGORITHMS:
+            key += (workers or default_workers(),)
+        if profile:
+            key += ('profile',)
+        result = cache.get_result(key) if cache is not None else None
+        if result is not None:
+            result.setdefault('status', 'ok') # Entrées enregistrées avant l'ajout du statut
+            result.setdefault('workers', 1) # ... et avant les tris parallèles
+            result.setdefault('speedup', None)
+            labels = counter_labels(name) # ... et avant les noms des compteurs
+            result.setdefault('comparisons_label', labels[0])
+            result.setdefault('swaps_label', labels[1])
+            for field in PROFILE_FIELDS: # ... et avant --profile
+                result.setdefault(field, None)
+            results[index] = result
+            if on_result:
+                on_result(result)
+        else:
+            pending.append((index, key))
+
+    def done(index, key, result):
+        if cache is not None and result['status'] == 'ok':
+            cache.put_result(key, result)
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    if jobs <= 1:
+        if cpus:
+            _pin_to_cpu(cpus[0])
+        for index, key in pending:
+            done(index, key, measure(*combinations[index], seed, repeat, warmup, timeout, workers, profile))
+        return results
+
+    # Les plus grosses tailles d'abord : elles dominent la durée totale
+    pending.sort(key=lambda item: -combinations[item[0]][1])
+    counter = multiprocessing.Value('i', 0)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cpus, counter)) as executor:
+        futures = {executor.submit(measure, *combinations[index], seed, repeat, warmup, timeout,
+                                   workers, profile): (index, key)
+                   for index, key in pending}
+        for future in as_completed(futures):
+            index, key = futures[future]
+            done(index, key, future.result())
+    return results
+
+
+def write_json(results, stream):
+    payload = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    json.dump(payload, stream, indent=2)
+    stream.write('\n')
+
+
+def _csv_row(result):
+    """Résultat aplati pour le CSV : phase_s devient 'phase=secondes;...'."""
+    phases = result.get('phase_s')
+    if not phases:
+        return result
+    row = dict(result)
+    row['phase_s'] = ';'.join(f"{phase}={seconds:.6f}" for phase, seconds in phases.items())
+    return row
+
+
+def write_csv(results, stream):
+    writer = csv.DictWriter(stream, fieldnames=RESULT_FIELDS)
+    writer.writeheader()
+    writer.writerows(_csv_row(result) for result in results)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des algorithmes de tri.")
+    parser.add_argument('-a', '--algorithms', nargs='+',
+                        choices=list(SORTING_ALGORITHMS_FAST.keys()) + list(PARALLEL_ALGORITHMS.keys()),
+                        metavar='ALGO', help="Algorithmes à mesurer (défaut : tous les tris séquentiels)")
+    parser.add_argument('-s', '--sizes', nargs='+', type=int,
+                        help="Tailles supplémentaires, ajoutées à celles de LIST_SIZE_OPTIONS")
+    parser.add_argument('--only-sizes', action='store_true',
+                        help="N'utiliser que les tailles passées avec --sizes")
+    parser.add_argument('-d', '--disorders', nargs='+', choices=DISORDER_OPTIONS,
+                        help="Types de désordre (défaut : tous)")
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT, help="Mesures par combinaison")
+    parser.add_argument('-w', '--warmup', type=int, default=DEFAULT_WARMUP, help="Tours de chauffe")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Graine de génération des listes")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='json')
+    parser.add_argument('-o', '--output', help="Fichier de sortie (défaut : sortie standard)")
+    parser.add_argument('--cache-dir', help="Répertoire du cache des mesures (réutilisées d'une exécution à l'autre)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Processus de mesure en parallèle (0 : un par cœur disponible)")
+    parser.add_argument('--cpus', help="Cœurs à utiliser, un par processus (ex. 2-9 ou 1,3,5)")
+    parser.add_argument('--timeout', type=float, help="Durée maximale (s) d'une combinaison, chauffe comprise")
+    parser.add_argument('--sort-workers', type=int,
+                        help="Processus de chaque tri parallèle (défaut : un par cœur disponible)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Ajouter lectures, écritures, déplacements, mémoire auxiliaire, profondeur "
+                             "et temps par phase (exécution instrumentée, lente)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat doit être au moins 1")
+    if args.only_sizes and not args.sizes:
+        parser.error("--only-sizes nécessite --sizes")
+    if args.jobs < 0:
+        parser.error("--jobs doit être positif")
+    if args.sort_workers is not None and args.sort_workers < 1:
+        parser.error("--sort-workers doit être positif")
+    if args.cpus:
+        try:
+            args.cpus = parse_cpu_list(args.cpus)
+        except ValueError as e:
+            parser.error(f"--cpus invalide : {e}")
+    if args.jobs == 0:
+        args.jobs = len(args.cpus or available_cpus())
+    if args.cpus and args.jobs > len(args.cpus):
+        parser.error("--jobs ne peut pas dépasser le nombre de cœurs de --cpus")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    sizes = set(args.sizes or [])
+    if not args.only_sizes:
+        sizes.update(LIST_SIZE_OPTIONS.values())
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        # CSV et JSON Lines s'écrivent ligne à ligne, dès qu'une mesure est prête
+        emit = None
+        if args.format == 'csv':
+            csv_writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+            csv_writer.writeheader()
+            emit = lambda result: csv_writer.writerow(_csv_row(result))
+        elif args.format == 'jsonl':
+            emit = lambda result: out.write(json.dumps(result) + '\n')
+
+        def on_result(result):
+            if result['status'] == 'timeout':
+                timing = f"abandon après {args.timeout:g}s"
+            else:
+                timing = f"médiane={result['median_s']:.6f}s p95={result['p95_s']:.6f}s"
+                if result.get('speedup') is not None:
+                    timing += f" accélération={result['speedup']:.2f}x ({result['workers']} processus)"
+            print(f"{result['algorithm']:<15} n={result['size']:<8} {result['disorder']:<14} {timing}",
+                  file=sys.stderr)
+            if emit:
+                emit(result)
+                out.flush()
+
+        cache = ResultCache(args.cache_dir) if args.cache_dir else None
+        results = run_benchmark(args.algorithms, sorted(sizes), args.disorders,
+                                args.repeat, args.warmup, args.seed, on_result=on_result, cache=cache,
+                                jobs=args.jobs, cpus=args.cpus, timeout=args.timeout,
+                                workers=args.sort_workers, profile=args.profile)
+        if cache is not None:
+            print(f"Cache: {cache.hits} mesures réutilisées, {cache.misses} effectuées", file=sys.stderr)
+        if args.format == 'json':
+            write_json(results, out)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# binning.py
+"""Agrégation d'une liste en colonnes d'écran (min, max, moyenne par colonne).
+
+Quand la liste compte plus d'éléments que la zone de dessin n'a de pixels de
+large, chaque colonne représente un groupe contigu d'éléments. Les agrégats
+sont maintenus au fil des écritures : dessiner coûte O(largeur) et non O(n).
+"""
+
+
+class ColumnBins:
+    """Min/max/somme par colonne, mis à jour incrémentalement à chaque écriture."""
+
+    def __init__(self, num_bins):
+        self.num_bins = num_bins
+        self.size = 0
+        self._values = [] # Copie des valeurs agrégées, pour connaître l'ancienne valeur
+        self.mins = []
+        self.maxs = []
+        self.sums = []
+        self.counts = []
+
+    def bin_of(self, i):
+        return i * self.num_bins // self.size
+
+    def _bounds(self, b):
+        """Indices [début, fin) des éléments de la colonne b."""
+        n, k = self.size, self.num_bins
+        return (b * n + k - 1) // k, ((b + 1) * n + k - 1) // k
+
+    def _recompute(self, b):
+        start, stop = self._bounds(b)
+        chunk = self._values[start:stop]
+        if chunk:
+            self.mins[b] = min(chunk)
+            self.maxs[b] = max(chunk)
+            self.sums[b] = sum(chunk)
+        self.counts[b] = len(chunk)
+
+    def rebuild(self, data):
+        """Recalcule toutes les colonnes (O(n)) : début de tri ou saut d'état."""
+        self.size = len(data)
+        self._values = list(data)
+        k = self.num_bins
+        self.mins = [0.0] * k
+        self.maxs = [0.0] * k
+        self.sums = [0.0] * k
+        self.counts = [0] * k
+        if self.size:
+            for b in range(k):
+                self._recompute(b)
+
+    def update(self, indices, data):
+        """Reporte les écritures aux `indices` de `data`.
+
+        Une colonne n'est recalculée entièrement que si l'ancienne valeur était
+        son min ou son max ; sinon la mise à jour est en O(1).
+        """
+        values = self._values
+        for i in indices:
+            new = data[i]
+            old = values[i]
+            if new == old:
+                continue
+            values[i] = new
+            b = self.bin_of(i)
+            self.sums[b] += new - old
+            if old == self.mins[b] or old == self.maxs[b]:
+                self._recompute(b)
+                continue
+            if new < self.mins[b]:
+                self.mins[b] = new
+            if new > self.maxs[b]:
+                self.maxs[b] = new
+
+    def mean(self, b):
+        count = self.counts[b]
+        return self.sums[b] / count if count else 0.0
+
+    def bins_for(self, indices):
+        """Colonnes couvrant des indices surlignés (tuple ou range)."""
+        if isinstance(indices, range):
+            if not indices:
+                return range(0)
+            return range(self.bin_of(indices.start), self.bin_of(indices.stop - 1) + 1)
+        return {self.bin_of(i) for i in indices if 0 <= i < self.size}
@@ -1,5 +1,4 @@
 # config.py
-import pygame
 import os
 
 # --- Core Settings ---
@@ -118,4 +117,5 @@ LIST_SIZE_OPTIONS = {
     "Très Grande": 250 # Adjust based on performance
 }
 
-DISORDER_OPTIONS = ['random', 'nearly_sorted', 'reversed', 'sorted'] # Added 'sorted'
\ No newline at end of file
+DISORDER_OPTIONS = ['random', 'nearly_sorted', 'reversed', 'sorted', # Added 'sorted'
+                    'few_unique', 'organ_pipe', 'sawtooth', 'runs', 'zipf'] # Voir input_generator.py
\ No newline at end of file
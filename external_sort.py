@@ -0,0 +1,207 @@
+# external_sort.py
+"""Tri externe : trier des données plus volumineuses que la mémoire disponible.
+
+1. L'entrée (une suite de listes de nombres, ex. number_io.iter_number_chunks)
+   est découpée en runs d'au plus `run_size` éléments.
+2. Chaque run est trié en mémoire (merge_sort_fast par défaut), dans des
+   processus séparés si `workers` > 1, puis écrit dans un fichier temporaire
+   binaire (flottants 'd').
+3. Les runs sont fusionnés par un tas de k têtes de lecture tamponnées ; au-delà
+   de `fan_in` runs, la fusion se fait en plusieurs passes.
+
+Les compteurs suivent la convention de merge_sort : une comparaison par test
+entre deux éléments, une écriture ('swaps') par élément placé, à chaque tri de
+run comme à chaque passe de fusion. À valeurs égales, le run le plus ancien
+passe d'abord : le tri reste stable si celui des runs l'est.
+"""
+import os
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sorting import merge_sort_fast
+
+DEFAULT_RUN_SIZE = 1_000_000 # Éléments par run (une liste Python d'environ 32 Mo)
+DEFAULT_FAN_IN = 128 # Runs fusionnés à la fois (fichiers ouverts simultanément)
+READ_BUFFER = 8192 # Éléments lus d'un coup par tête de lecture
+WRITE_BUFFER = 65536 # Éléments fusionnés transmis d'un coup à la sortie
+
+
+def _sort_run(sort_function, values, path):
+    """Trie sur place le run `values` (liste neuve ou array('d') reçu par le processus)
+    et l'écrit dans `path`. Retourne (comparaisons, écritures)."""
+    arr, comparisons, writes = sort_function(values)
+    if not isinstance(arr, array):
+        arr = array('d', arr) # 8 octets par nombre, bien moins que la liste
+    with open(path, 'wb') as f:
+        arr.tofile(f)
+    return comparisons, writes
+
+
+class _RunReader:
+    """Tête de lecture tamponnée sur un run binaire."""
+
+    def __init__(self, path, buffer_size=READ_BUFFER):
+        self._file = open(path, 'rb')
+        self._buffer_size = buffer_size
+        self.values = array('d')
+        self.pos = 0
+
+    def refill(self):
+        """Charge le bloc suivant ; False quand le run est épuisé."""
+        values = array('d')
+        try:
+            values.fromfile(self._file, self._buffer_size)
+        except EOFError: # Dernier bloc incomplet : les éléments lus sont gardés
+            pass
+        self.values = values
+        self.pos = 0
+        return len(values) > 0
+
+    def close(self):
+        self._file.close()
+
+
+def _less(a, b):
+    """Ordre des têtes [valeur, run] : à égalité, le run le plus ancien d'abord."""
+    return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+
+def _sift_down(heap, i):
+    """Tamisage vers le bas ; retourne le nombre de comparaisons effectuées."""
+    n = len(heap)
+    item = heap[i]
+    comparisons = 0
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        right = child + 1
+        if right < n:
+            comparisons += 1
+            if _less(heap[right], heap[child]):
+                child = right
+        comparisons += 1
+        if not _less(heap[child], item):
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = item
+    return comparisons
+
+
+def merge_runs(paths, emit, read_buffer=READ_BUFFER, write_buffer=WRITE_BUFFER):
+    """Fusion k-voies des runs triés `paths` ; `emit(array)` reçoit la sortie par blocs.
+
+    Retourne (comparaisons, écritures).
+    """
+    readers = [_RunReader(path, read_buffer) for path in paths]
+    try:
+        heap = []
+        for r, reader in enumerate(readers):
+            if reader.refill():
+                heap.append([reader.values[0], r])
+                reader.pos = 1
+        comparisons = 0
+        for i in range(len(heap) // 2 - 1, -1, -1):
+            comparisons += _sift_down(heap, i)
+
+        writes = 0
+        out = array('d')
+        while heap:
+            top = heap[0]
+            out.append(top[0])
+            if len(out) >= write_buffer:
+                emit(out)
+                writes += len(out)
+                out = array('d')
+            reader = readers[top[1]]
+            if reader.pos < len(reader.values) or reader.refill():
+                top[0] = reader.values[reader.pos]
+                reader.pos += 1
+            else: # Run épuisé : la dernière feuille remonte à la racine
+                last = heap.pop()
+                if not heap:
+                    break
+                heap[0] = last
+            comparisons += _sift_down(heap, 0)
+        if out:
+            emit(out)
+            writes += len(out)
+        return comparisons, writes
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+def external_sort(chunks, emit, sort_function=merge_sort_fast, run_size=DEFAULT_RUN_SIZE,
+                  workers=1, tmpdir=None, fan_in=DEFAULT_FAN_IN):
+    """Trie la suite de listes de nombres `chunks` ; `emit(array)` reçoit le résultat par blocs.
+
+    Au plus `workers` runs sont triés en même temps : la mémoire utilisée reste
+    de l'ordre de (workers + 1) x run_size éléments. `sort_function` est une
+    version rapide de sorting.py (fonction de module, transmissible aux processus).
+    Retourne (nombre d'éléments, comparaisons, écritures).
+    """
+    if run_size < 1 or fan_in < 2:
+        raise ValueError("run_size doit être >= 1 et fan_in >= 2")
+
+    with tempfile.TemporaryDirectory(prefix='papyrus_runs_', dir=tmpdir) as workdir:
+        paths = []
+        comparisons = writes = count = 0
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        in_flight = deque()
+
+        def spill(run):
+            nonlocal comparisons, writes
+            path = os.path.join(workdir, f'run{len(paths):06d}.bin')
+            paths.append(path)
+            if executor is None:
+                c, w = _sort_run(sort_function, run, path)
+                comparisons += c
+                writes += w
+                return
+            if len(in_flight) >= workers: # Pas plus de runs en mémoire que de processus
+                c, w = in_flight.popleft().result()
+                comparisons += c
+                writes += w
+            in_flight.append(executor.submit(_sort_run, sort_function, array('d', run), path))
+
+        try:
+            run = []
+            for chunk in chunks:
+                run.extend(chunk)
+                count += len(chunk)
+                while len(run) >= run_size:
+                    spill(run[:run_size])
+                    del run[:run_size]
+            if run:
+                spill(run)
+            while in_flight:
+                c, w = in_flight.popleft().result()
+                comparisons += c
+                writes += w
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        # Passes intermédiaires tant qu'il y a trop de runs pour une seule fusion
+        generation = 0
+        while len(paths) > fan_in:
+            generation += 1
+            merged = []
+            for start in range(0, len(paths), fan_in):
+                group = paths[start:start + fan_in]
+                path = os.path.join(workdir, f'pass{generation}_{len(merged):06d}.bin')
+                with open(path, 'wb') as f:
+                    c, w = merge_runs(group, lambda block: block.tofile(f))
+                comparisons += c
+                writes += w
+                for old in group:
+                    os.remove(old)
+                merged.append(path)
+            paths = merged
+
+        c, w = merge_runs(paths, emit)
+        return count, comparisons + c, writes + w
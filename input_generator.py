@@ -0,0 +1,265 @@
+# input_generator.py
+"""Génération rapide et reproductible des listes d'entrée.
+
+Les valeurs sont produites par blocs : avec NumPy (vectorisé) s'il est
+installé, sinon avec le module random. Une même graine redonne la même liste
+pour un même moteur (les deux moteurs ne tirent pas les mêmes nombres).
+
+Aucune forme ne nécessite de trier la liste entière : les listes triées sont
+tirées directement dans l'ordre (statistiques d'ordre de lois uniformes,
+calculées en somme cumulée de logarithmes), ce qui permet aussi de produire
+des tailles énormes bloc par bloc avec iter_chunks.
+
+Formes disponibles (DISTRIBUTIONS) :
+    random         valeurs uniformes
+    sorted         croissante
+    reversed       décroissante
+    nearly_sorted  croissante, puis inversion_fraction * n échanges aléatoires
+                   (dans chaque bloc quand la liste est produite par blocs)
+    few_unique     `unique` valeurs distinctes, réparties uniformément
+    organ_pipe     croissante jusqu'au milieu, puis décroissante
+    sawtooth       dents croissantes de `period` éléments
+    runs           suites croissantes de `run_length` éléments
+    zipf           `unique` valeurs distinctes, fréquences en loi de Zipf (`zipf_a`)
+"""
+import bisect
+import math
+import random
+from array import array
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError: # NumPy absent : moteur random
+    np = None
+    HAS_NUMPY = False
+
+DISTRIBUTIONS = ['random', 'sorted', 'reversed', 'nearly_sorted', 'few_unique',
+                 'organ_pipe', 'sawtooth', 'runs', 'zipf']
+BACKENDS = ['auto', 'numpy', 'python']
+OUTPUTS = ['list', 'array', 'numpy']
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+DEFAULT_PARAMS = {
+    'inversion_fraction': 0.1, # Échanges / n pour nearly_sorted (0.1 : comme generate_list)
+    'unique': 16, # Valeurs distinctes pour few_unique et zipf
+    'period': None, # Longueur d'une dent de sawtooth (None : n // 8)
+    'run_length': 64, # Longueur des suites de runs
+    'zipf_a': 1.2, # Exposant de Zipf
+}
+
+
+def _resolve_backend(backend):
+    if backend == 'auto':
+        return 'numpy' if HAS_NUMPY else 'python'
+    if backend == 'numpy' and not HAS_NUMPY:
+        raise ValueError("le moteur 'numpy' nécessite NumPy")
+    if backend not in BACKENDS:
+        raise ValueError(f"moteur inconnu : {backend}")
+    return backend
+
+
+def _params(size, overrides):
+    unknown = set(overrides) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise TypeError(f"paramètres inconnus : {', '.join(sorted(unknown))}")
+    params = dict(DEFAULT_PARAMS, **overrides)
+    if params['period'] is None:
+        params['period'] = max(2, size // 8)
+    params['inversion_fraction'] = min(0.5, max(0.0, params['inversion_fraction']))
+    params['unique'] = max(1, params['unique'])
+    params['run_length'] = max(1, params['run_length'])
+    params['period'] = max(2, params['period'])
+    return params
+
+
+def _zipf_weights(unique, a):
+    """Poids cumulés des rangs 1..unique pour une loi de Zipf tronquée."""
+    cumulative = []
+    total = 0.0
+    for rank in range(1, unique + 1):
+        total += rank ** -a
+        cumulative.append(total)
+    return [c / total for c in cumulative]
+
+
+class _PythonSource:
+    """Moteur random : un bloc = une liste de floats."""
+
+    def __init__(self, seed, size, min_val, max_val, params):
+        self.rng = random.Random(seed)
+        self.size, self.min_val, self.max_val, self.params = size, min_val, max_val, params
+        self.span = max_val - min_val
+        self.log_x = 0.0 # Log de la dernière statistique d'ordre (sorted/reversed)
+        unique = params['unique']
+        self.levels = [self.rng.uniform(min_val, max_val) for _ in range(unique)]
+        self.zipf_cumulative = _zipf_weights(unique, params['zipf_a'])
+
+    def uniform(self, count):
+        uniform, lo, hi = self.rng.uniform, self.min_val, self.max_val
+        return [uniform(lo, hi) for _ in range(count)]
+
+    def descending_fractions(self, start, count):
+        """Fractions x dans ]0, 1] des statistiques d'ordre n - start, ..., décroissantes."""
+        random_, log, exp = self.rng.random, math.log, math.exp
+        log_x = self.log_x
+        out = []
+        for j in range(self.size - start, self.size - start - count, -1):
+            log_x += log(1.0 - random_()) / j # 1 - U dans ]0, 1] : log défini
+            out.append(exp(log_x))
+        self.log_x = log_x
+        return out
+
+    def sorted_values(self, start, count, reverse):
+        lo, span = self.min_val, self.span
+        fractions = self.descending_fractions(start, count)
+        if reverse:
+            return [lo + span * x for x in fractions]
+        return [lo + span * (1.0 - x) for x in fractions]
+
+    def swap_pairs(self, values, swaps):
+        positions = self.rng.sample(range(len(values)), 2 * swaps)
+        for a, b in zip(positions[:swaps], positions[swaps:]):
+            values[a], values[b] = values[b], values[a]
+        return values
+
+    def choose(self, count):
+        levels, rng = self.levels, self.rng
+        return [levels[rng.randrange(len(levels))] for _ in range(count)]
+
+    def zipf(self, count):
+        levels, cumulative, random_ = self.levels, self.zipf_cumulative, self.rng.random
+        last = len(levels) - 1
+        return [levels[min(last, bisect.bisect_left(cumulative, random_()))] for _ in range(count)]
+
+    def shape(self, start, count, fraction):
+        """Valeurs déterministes lo + span * fraction(position)."""
+        lo, span = self.min_val, self.span
+        return [lo + span * fraction(p) for p in range(start, start + count)]
+
+    def runs(self, count):
+        values = self.uniform(count)
+        step = self.params['run_length']
+        for s in range(0, count, step):
+            values[s:s + step] = sorted(values[s:s + step])
+        return values
+
+
+class _NumpySource:
+    """Moteur NumPy : un bloc = un tableau float64."""
+
+    def __init__(self, seed, size, min_val, max_val, params):
+        self.rng = np.random.default_rng(seed)
+        self.size, self.min_val, self.max_val, self.params = size, min_val, max_val, params
+        self.span = max_val - min_val
+        self.log_x = 0.0
+        unique = params['unique']
+        self.levels = self.rng.uniform(min_val, max_val, unique)
+        weights = np.arange(1, unique + 1, dtype=np.float64) ** -params['zipf_a']
+        self.zipf_p = weights / weights.sum()
+
+    def uniform(self, count):
+        return self.rng.uniform(self.min_val, self.max_val, count)
+
+    def descending_fractions(self, start, count):
+        j = np.arange(self.size - start, self.size - start - count, -1, dtype=np.float64)
+        log_x = self.log_x + np.cumsum(np.log1p(-self.rng.random(count)) / j)
+        if count:
+            self.log_x = float(log_x[-1])
+        return np.exp(log_x)
+
+    def sorted_values(self, start, count, reverse):
+        fractions = self.descending_fractions(start, count)
+        if reverse:
+            return self.min_val + self.span * fractions
+        return self.min_val + self.span * (1.0 - fractions)
+
+    def swap_pairs(self, values, swaps):
+        positions = self.rng.choice(len(values), 2 * swaps, replace=False)
+        a, b = positions[:swaps], positions[swaps:]
+        values[a], values[b] = values[b], values[a].copy() # Positions distinctes : pas de conflit
+        return values
+
+    def choose(self, count):
+        return self.levels[self.rng.integers(0, len(self.levels), count)]
+
+    def zipf(self, count):
+        return self.levels[self.rng.choice(len(self.levels), count, p=self.zipf_p)]
+
+    def shape(self, start, count, fraction):
+        positions = np.arange(start, start + count, dtype=np.float64)
+        return self.min_val + self.span * fraction(positions)
+
+    def runs(self, count):
+        values = self.uniform(count)
+        step = self.params['run_length']
+        full = count - count % step
+        if full:
+            values[:full] = np.sort(values[:full].reshape(-1, step), axis=1).ravel()
+        values[full:] = np.sort(values[full:])
+        return values
+
+
+def _chunk(source, distribution, start, count):
+    size, params = source.size, source.params
+    if distribution == 'sorted':
+        return source.sorted_values(start, count, reverse=False)
+    if distribution == 'reversed':
+        return source.sorted_values(start, count, reverse=True)
+    if distribution == 'nearly_sorted':
+        values = source.sorted_values(start, count, reverse=False)
+        swaps = min(count // 2, max(1, int(count * params['inversion_fraction']))) if count >= 2 else 0
+        return source.swap_pairs(values, swaps) if swaps else values
+    if distribution == 'few_unique':
+        return source.choose(count)
+    if distribution == 'zipf':
+        return source.zipf(count)
+    if distribution == 'organ_pipe':
+        last = max(1, size - 1)
+        return source.shape(start, count, lambda p: 1.0 - abs(2.0 * p / last - 1.0))
+    if distribution == 'sawtooth':
+        period = params['period']
+        return source.shape(start, count, lambda p: (p % period) / (period - 1))
+    if distribution == 'runs':
+        return source.runs(count)
+    return source.uniform(count) # 'random' et formes inconnues
+
+
+def iter_chunks(size, min_val=0.0, max_val=100.0, distribution='random', seed=None,
+                chunk_size=DEFAULT_CHUNK_SIZE, backend='auto', **params):
+    """Produit la liste demandée par blocs d'au plus `chunk_size` valeurs.
+
+    Les blocs sont des listes (moteur random) ou des tableaux float64 (NumPy).
+    La mémoire utilisée ne dépend que de `chunk_size`, pas de `size`.
+    """
+    backend = _resolve_backend(backend)
+    params = _params(size, params)
+    if distribution == 'runs' and chunk_size < size: # Des blocs faits de suites entières
+        chunk_size = max(params['run_length'], chunk_size - chunk_size % params['run_length'])
+    source_class = _NumpySource if backend == 'numpy' else _PythonSource
+    source = source_class(seed, size, min_val, max_val, params)
+    for start in range(0, size, chunk_size):
+        yield _chunk(source, distribution, start, min(chunk_size, size - start))
+
+
+def generate(size, min_val=0.0, max_val=100.0, distribution='random', seed=None,
+             output='list', typecode='d', backend='auto', **params):
+    """Liste complète de `size` valeurs (un seul bloc : nearly_sorted échange sur toute la liste).
+
+    `output` : 'list', 'array' (array.array de type `typecode`) ou 'numpy'.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"sortie inconnue : {output}")
+    if output == 'numpy' and not HAS_NUMPY:
+        raise ValueError("la sortie 'numpy' nécessite NumPy")
+    values = next(iter_chunks(size, min_val, max_val, distribution, seed,
+                              chunk_size=max(1, size), backend=backend, **params), [])
+    if output == 'numpy':
+        return np.asarray(values, dtype=np.float32 if typecode == 'f' else np.float64)
+    if output == 'array':
+        if isinstance(values, list):
+            return array(typecode, values)
+        result = array(typecode)
+        result.frombytes(values.astype(np.float32 if typecode == 'f' else np.float64).tobytes())
+        return result
+    return values if isinstance(values, list) else values.tolist()
@@ -1,8 +1,55 @@
 # main.py
+"""Triage en ligne de commande.
+
+Sans argument, depuis un terminal : mode interactif. Avec des arguments, ou
+quand l'entrée standard est redirigée : mode non interactif pour les
+traitements par lots, par exemple :
+    python main.py -a "Quick Sort" -i nombres.txt -o tries.txt
+    cat nombres.txt | python main.py -a "Merge Sort" > tries.txt
+    cat nombres.txt | python main.py > tries.txt
+    python main.py -a "Heap Sort" --generate 1000000 --seed 1 -o tries.txt
+    python main.py -a "Quick Sort" --compact -i nombres.txt -o tries.txt
+Les nombres (séparés par des blancs ou des virgules) sont lus et écrits par
+blocs ; les statistiques vont sur la sortie d'erreur. Avec --compact, ils sont
+stockés et triés dans un array.array('d') plutôt qu'une liste. Avec --external,
+le tri se fait par runs sur disque (voir external_sort.py) et la mémoire
+utilisée ne dépend plus de la taille du fichier :
+    python main.py --external --run-size 2000000 --workers 4 -i enorme.txt -o tries.txt
+Les tris parallèles (voir parallel_sort.py) utilisent --workers processus, un
+par cœur par défaut ; --speedup chronomètre aussi le Merge Sort séquentiel :
+    python main.py -a "Sample Sort" --compact --generate 5000000 --workers 8 --speedup -o tries.txt
+Quand seuls les plus petits éléments ou la médiane comptent, --top K (tri
+partiel par tas), --select RANG ou --median (introselect) évitent de trier
+toute la liste. Avec --external, --top lit l'entrée au fil de l'eau et ne
+garde que K nombres en mémoire :
+    python main.py --median -i nombres.txt
+    python main.py --external --top 100 -i enorme.txt -o plus_petits.txt
+Avec --profile, le tri est rejoué pas à pas sur une copie instrumentée (voir
+metrics.py) : lectures, écritures, déplacements, mémoire auxiliaire maximale,
+profondeur de pile et temps par phase s'ajoutent aux statistiques. Beaucoup
+plus lent qu'un tri normal, à réserver aux listes de taille modeste :
+    python main.py -a "Heap Sort" --generate 20000 --profile -o /dev/null
+"""
+import argparse
+import functools
 import random
-from sorting import SORTING_ALGORITHMS_TIMED, generate_list # Utilise les versions timées ici
+import sys
+import time
+from itertools import chain
+from config import DEFAULT_MIN_VAL, DEFAULT_MAX_VAL, DISORDER_OPTIONS
+from external_sort import external_sort, DEFAULT_RUN_SIZE
+from input_generator import iter_chunks
+from number_io import iter_number_chunks, read_numbers, write_numbers, open_input, open_output
+from metrics import profile_sort
+from parallel_sort import PARALLEL_ALGORITHMS, default_workers
+from sorting import SORTING_ALGORITHMS_TIMED, SORTING_ALGORITHMS_FAST, counter_labels, generate_list # Utilise les versions timées ici
+from sorting import SORTING_ALGORITHMS, nth_element, nth_element_fast, partial_sort, partial_sort_fast, streaming_top_k
+
+DEFAULT_ALGORITHM = "Quick Sort"
+BASELINE_ALGORITHM = "Merge Sort" # Référence de --speedup
 
-def main():
+
+def interactive_main():
     print("Bienvenue aux Papyrus de Héron - Triage en Ligne de Commande")
     print("----------------------------------------------------------")
 
@@ -71,5 +118,231 @@ def main():
     print("\n----------------------------------------------------------")
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Les Papyrus de Héron - Triage en ligne de commande")
+    parser.add_argument('-a', '--algorithm', default=DEFAULT_ALGORITHM,
+                        choices=list(SORTING_ALGORITHMS_FAST.keys()) + list(PARALLEL_ALGORITHMS.keys()))
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-i', '--input', help="Fichier de nombres à trier ('-' : entrée standard, défaut)")
+    source.add_argument('-g', '--generate', type=int, metavar='TAILLE', help="Générer une liste de cette taille")
+    parser.add_argument('--min', type=float, default=DEFAULT_MIN_VAL, help="Valeur minimale (avec --generate)")
+    parser.add_argument('--max', type=float, default=DEFAULT_MAX_VAL, help="Valeur maximale (avec --generate)")
+    parser.add_argument('-d', '--disorder', choices=DISORDER_OPTIONS, default='random', help="Désordre (avec --generate)")
+    parser.add_argument('--seed', type=int, help="Graine (avec --generate)")
+    parser.add_argument('-o', '--output', help="Fichier de sortie ('-' : sortie standard, défaut)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Ne pas afficher les statistiques")
+    parser.add_argument('--compact', action='store_true',
+                        help="Stocker les nombres dans un tableau typé (8 octets par nombre) trié sur place")
+    parser.add_argument('--external', action='store_true',
+                        help="Tri externe par runs sur disque, pour les données plus grandes que la mémoire")
+    parser.add_argument('--run-size', type=int, default=DEFAULT_RUN_SIZE,
+                        help="Éléments triés en mémoire à la fois (avec --external)")
+    parser.add_argument('--workers', type=int,
+                        help="Processus du tri parallèle (défaut : un par cœur) ou triant les runs "
+                             "(avec --external, défaut : 1)")
+    parser.add_argument('--speedup', action='store_true',
+                        help=f"Chronométrer aussi {BASELINE_ALGORITHM} et afficher l'accélération")
+    parser.add_argument('--tmpdir', help="Répertoire des fichiers temporaires (avec --external)")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--top', type=int, metavar='K',
+                           help="N'écrire que les K plus petits nombres, triés (tri partiel par tas)")
+    selection.add_argument('--select', type=int, metavar='RANG',
+                           help="N'écrire que le nombre de ce rang (0 : minimum) dans l'ordre trié")
+    selection.add_argument('--median', action='store_true', help="N'écrire que la médiane (inférieure)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Rejouer le tri instrumenté : lectures, écritures, déplacements, mémoire "
+                             "auxiliaire, profondeur et temps par phase (beaucoup plus lent)")
+    args = parser.parse_args(argv)
+    if args.generate is not None and args.generate <= 0:
+        parser.error("--generate doit être positif")
+    if args.run_size < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--run-size et --workers doivent être positifs")
+    if args.top is not None and args.top < 1:
+        parser.error("--top doit être positif")
+    if args.select is not None and args.select < 0:
+        parser.error("--select doit être positif ou nul")
+    if args.external and (args.select is not None or args.median):
+        parser.error("--select et --median ne sont pas disponibles avec --external (--top l'est)")
+    if args.external and args.algorithm in PARALLEL_ALGORITHMS:
+        parser.error("--external trie ses runs avec un algorithme séquentiel (--workers pour les paralléliser)")
+    if args.profile and (args.external or args.algorithm in PARALLEL_ALGORITHMS):
+        parser.error("--profile n'est disponible qu'avec les tris séquentiels en mémoire")
+    return args
+
+
+def external_main(args, log):
+    """Mode --external : lecture par blocs, runs triés sur disque, fusion vers la sortie."""
+    if args.generate is not None:
+        # Générée bloc par bloc : la liste complète n'existe jamais en mémoire
+        stream = None
+        chunks = (chunk if isinstance(chunk, list) else chunk.tolist()
+                  for chunk in iter_chunks(args.generate, args.min, args.max, args.disorder, args.seed,
+                                           chunk_size=args.run_size))
+    else:
+        stream = open_input(args.input or '-')
+        chunks = iter_number_chunks(stream)
+    out = open_output(args.output)
+    if args.top is not None:
+        return streaming_top_main(args, log, stream, chunks, out)
+    start = time.perf_counter()
+    try:
+        count, comparisons, swaps = external_sort(
+            chunks, lambda block: write_numbers(out, block), SORTING_ALGORITHMS_FAST[args.algorithm],
+            args.run_size, args.workers or 1, args.tmpdir)
+    except ValueError as e:
+        print(f"Erreur de lecture : {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not None and stream is not sys.stdin.buffer:
+            stream.close()
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+    first_label, second_label = external_counter_labels(args.algorithm)
+    log(f"Tri externe ({args.algorithm} par runs de {args.run_size}) : {count} nombres en "
+        f"{time.perf_counter() - start:.3f} s, {comparisons} {first_label}, {swaps} {second_label}")
+    return 0
+
+
+def external_counter_labels(algorithm):
+    """Noms des compteurs du tri externe : ceux du tri des runs cumulés avec ceux
+    de la fusion (comparaisons et écritures, comme le Merge Sort)."""
+    return tuple(run if run == merge else f"{run} + {merge}"
+                 for run, merge in zip(counter_labels(algorithm), counter_labels("Merge Sort")))
+
+
+def streaming_top_main(args, log, stream, chunks, out):
+    """--external --top K : un seul parcours de l'entrée, K nombres gardés en mémoire."""
+    count = 0
+
+    def values():
+        nonlocal count
+        for chunk in chunks:
+            count += len(chunk)
+            yield chunk
+
+    start = time.perf_counter()
+    try:
+        top, comparisons, swaps = streaming_top_k(chain.from_iterable(values()), args.top)
+        write_numbers(out, top)
+    except ValueError as e:
+        print(f"Erreur de lecture : {e}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not None and stream is not sys.stdin.buffer:
+            stream.close()
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+    log(f"Top {args.top} au fil de l'eau : {count} nombres en {time.perf_counter() - start:.3f} s, "
+        f"{comparisons} comparaisons, {swaps} échanges")
+    return 0
+
+
+def batch_main(args):
+    """Mode non interactif : lit ou génère, trie avec la version rapide, écrit le résultat."""
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    if args.external:
+        return external_main(args, log)
+
+    typecode = 'd' if args.compact else None
+    start = time.perf_counter()
+    if args.generate is not None:
+        list_data = generate_list(args.generate, args.min, args.max, args.disorder, seed=args.seed,
+                                  typecode=typecode)
+    else:
+        stream = open_input(args.input or '-')
+        try:
+            list_data = read_numbers(stream, typecode=typecode)
+        except ValueError as e:
+            print(f"Erreur de lecture : {e}", file=sys.stderr)
+            return 1
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    log(f"{len(list_data)} nombres chargés en {time.perf_counter() - start:.3f} s")
+
+    n = len(list_data)
+    if args.top is not None:
+        k = min(args.top, n)
+        sort_function = functools.partial(partial_sort_fast, k=k)
+        profile_function = functools.partial(partial_sort, k=k)
+        label = f"Partial Sort (top {k})"
+        labels = counter_labels("Partial Sort (top 10 %)")
+    elif args.select is not None or args.median:
+        rank = (n - 1) // 2 if args.median else args.select
+        if n and rank >= n:
+            print(f"Rang {rank} hors de la liste ({n} nombres)", file=sys.stderr)
+            return 1
+        sort_function = functools.partial(nth_element_fast, k=rank)
+        profile_function = functools.partial(nth_element, k=rank)
+        label = f"Quickselect (rang {rank})" if n else "Quickselect (liste vide)"
+        labels = counter_labels("Quickselect (médiane)")
+    elif args.algorithm in PARALLEL_ALGORITHMS:
+        workers = args.workers or default_workers()
+        sort_function = functools.partial(PARALLEL_ALGORITHMS[args.algorithm], workers=workers)
+        profile_function = None # Refusé par parse_args
+        label = f"{args.algorithm} ({workers} processus)"
+        labels = counter_labels(args.algorithm)
+    else:
+        sort_function = SORTING_ALGORITHMS_FAST[args.algorithm]
+        profile_function = SORTING_ALGORITHMS[args.algorithm]
+        label = args.algorithm
+        labels = counter_labels(args.algorithm)
+    baseline_data = list_data[:] if args.speedup else None
+    profile_data = list_data[:] if args.profile else None
+
+    start = time.perf_counter()
+    sorted_list, comparisons, swaps = sort_function(list_data)
+    elapsed = time.perf_counter() - start
+    first_label, second_label = labels
+    log(f"{label} : {elapsed:.3f} s, {comparisons} {first_label}, {swaps} {second_label}")
+    if args.top is not None:
+        sorted_list = sorted_list[:k]
+    elif (args.select is not None or args.median) and n:
+        sorted_list = sorted_list[rank:rank + 1]
+
+    if baseline_data is not None:
+        start = time.perf_counter()
+        SORTING_ALGORITHMS_FAST[BASELINE_ALGORITHM](baseline_data)
+        baseline = time.perf_counter() - start
+        log(f"{BASELINE_ALGORITHM} séquentiel : {baseline:.3f} s, accélération {baseline / elapsed:.2f}x")
+
+    if profile_data is not None:
+        def log_profile(metrics):
+            log('\n'.join(metrics.lines()))
+            if metrics.writes_mismatch():
+                log(f"Écritures déclarées par les étapes : {metrics.declared_writes} "
+                    f"(mesurées : {metrics.writes})")
+
+        profile_sort(profile_function, profile_data, f"{label} (instrumenté)", labels,
+                     hooks=(log_profile,))
+
+    start = time.perf_counter()
+    out = open_output(args.output)
+    try:
+        write_numbers(out, sorted_list)
+    finally:
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+    log(f"Résultat écrit en {time.perf_counter() - start:.3f} s")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv and sys.stdin.isatty():
+        interactive_main()
+        return 0
+    return batch_main(parse_args(argv))
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
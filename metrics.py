@@ -0,0 +1,250 @@
+# metrics.py
+"""Mesures détaillées d'une exécution de tri.
+
+Au-delà des deux compteurs du protocole (comparaisons et échanges), un tri
+peut être mesuré en :
+    lectures      éléments lus, dans la liste et dans ses copies auxiliaires
+    écritures     éléments écrits dans la liste (chaque StepEvent swap ou write ;
+                  avec une InstrumentedArray, affectations réellement comptées)
+    déplacements  écritures + éléments copiés dans des tampons auxiliaires
+                  (tranches L/R du tri fusion, copie de la liste des tris par
+                  distribution...)
+    mémoire aux.  maximum d'entrées auxiliaires vivantes (copies, clés, seaux)
+    profondeur    maximum de la récursion ou de la pile explicite
+    phases        temps et étapes par phase (construction du tas / extraction,
+                  pivot / partition, copie / fusion...)
+
+Les générateurs de sorting.py déclarent phase, profondeur et mémoire
+auxiliaire dans les champs du StepEvent ; un MetricsRecorder les observe
+étape par étape. Les lectures et les copies ne sont visibles qu'à travers une
+InstrumentedArray : profile_sort exécute le générateur sur une telle copie
+instrumentée (beaucoup plus lente qu'un tri normal, mais toutes les mesures
+sont renseignées).
+
+Les résultats forment un SortMetrics passé aux fonctions `hooks` plutôt
+qu'affiché : le visualiseur, la ligne de commande et le banc d'essai
+consomment les mêmes nombres. Un champ non mesuré reste à None.
+"""
+import sys
+import time
+
+from step_event import OP_SWAP, OP_WRITE
+
+DEFAULT_COUNTER_LABELS = ("comparaisons", "échanges")
+DEFAULT_PHASE = 'tri' # Étapes produites sans phase déclarée
+
+
+class SortMetrics:
+    """Mesures d'une exécution ; les champs non mesurés valent None."""
+
+    __slots__ = ('algorithm', 'size', 'labels', 'elapsed', 'comparisons', 'swaps', 'steps',
+                 'reads', 'writes', 'declared_writes', 'moves', 'aux_peak', 'max_depth',
+                 'phase_times', 'phase_steps')
+
+    def __init__(self, algorithm='', size=0, labels=None):
+        self.algorithm = algorithm
+        self.size = size
+        self.labels = labels or DEFAULT_COUNTER_LABELS # Noms des deux compteurs du protocole
+        self.elapsed = None # Secondes
+        self.comparisons = None
+        self.swaps = None
+        self.steps = None # Événements produits par le générateur
+        self.reads = None
+        self.writes = None
+        self.declared_writes = None # Écritures déclarées par les StepEvent, si `writes` est mesuré
+        self.moves = None
+        self.aux_peak = None
+        self.max_depth = None
+        self.phase_times = None # {phase: secondes}
+        self.phase_steps = None # {phase: étapes}
+
+    def as_dict(self):
+        """Champs sous forme de dict (sérialisable en JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def writes_mismatch(self):
+        """Vrai si les écritures mesurées diffèrent de celles déclarées par les événements."""
+        return self.declared_writes is not None and self.declared_writes != self.writes
+
+    def lines(self):
+        """Lignes de texte lisibles, sans les champs non mesurés."""
+        first_label, second_label = self.labels
+        lines = [f"Algorithme: {self.algorithm}"]
+        if self.elapsed is not None:
+            lines.append(f"Temps d'exécution: {self.elapsed:.6f} secondes")
+        for label, value in ((first_label.capitalize(), self.comparisons),
+                             (second_label.capitalize(), self.swaps),
+                             ("Étapes", self.steps),
+                             ("Lectures", self.reads),
+                             ("Écritures", self.writes),
+                             ("Déplacements", self.moves),
+                             ("Mémoire auxiliaire max", self.aux_peak),
+                             ("Profondeur max", self.max_depth)):
+            if value is not None:
+                lines.append(f"{label}: {value}")
+        if self.phase_steps:
+            total = sum(self.phase_times.values()) if self.phase_times else 0.0
+            for phase, steps in self.phase_steps.items():
+                text = f"  Phase {phase}: {steps} étapes"
+                if self.phase_times and total > 0:
+                    seconds = self.phase_times.get(phase, 0.0)
+                    text += f", {seconds:.6f} s ({100 * seconds / total:.1f} %)"
+                lines.append(text)
+        return lines
+
+
+def print_metrics(metrics, file=None):
+    """Hook par défaut : affiche les mesures (sortie standard par défaut)."""
+    print('\n'.join(metrics.lines()), file=file or sys.stdout)
+
+
+class MetricsRecorder:
+    """Observe les StepEvent d'un tri (observe) et en tire un SortMetrics (finish).
+
+    Avec `timed`, l'horloge est lue à chaque étape pour répartir le temps entre
+    les phases : le temps écoulé entre deux événements revient à la phase du
+    second (le générateur déclare la phase avant d'en faire le travail).
+    `counter` (AccessCounter d'une InstrumentedArray) fournit lectures, copies
+    et écritures mesurées ; celles-ci remplacent les écritures déduites des
+    événements, gardées dans `declared_writes` pour repérer un événement mal
+    déclaré (SortMetrics.writes_mismatch).
+    """
+
+    def __init__(self, algorithm='', size=0, labels=None, timed=True, counter=None, hooks=()):
+        self.algorithm = algorithm
+        self.size = size
+        self.labels = labels
+        self.counter = counter
+        self.hooks = hooks
+        self.steps = 0
+        self.writes = 0
+        self.aux_peak = 0
+        self.max_depth = 0
+        self.phase = None # Phase de la dernière étape
+        self.comparisons = 0
+        self.swaps = 0
+        self.phase_steps = {}
+        self.phase_times = {} if timed else None
+        self._timed = timed
+        self._clock = time.perf_counter
+        self._start = self._since = self._last = self._clock()
+        self._phase_start_step = 0
+
+    def observe(self, event):
+        """Prend en compte une étape (à appeler pour chaque événement produit)."""
+        self.steps += 1
+        op = event.op
+        if op == OP_WRITE:
+            self.writes += len(event.swapped)
+        elif op == OP_SWAP:
+            self.writes += 2
+        if event.aux > self.aux_peak:
+            self.aux_peak = event.aux
+        if event.depth > self.max_depth:
+            self.max_depth = event.depth
+        phase = event.phase or DEFAULT_PHASE
+        if phase != self.phase:
+            self._close_phase(self.steps - 1)
+            self.phase = phase
+        if self._timed:
+            self._last = self._clock()
+        self.comparisons = event.comparisons
+        self.swaps = event.swaps
+
+    def _close_phase(self, step):
+        """Crédite la phase courante des étapes (et du temps) écoulés depuis son début."""
+        if self.phase is not None:
+            self.phase_steps[self.phase] = self.phase_steps.get(self.phase, 0) + step - self._phase_start_step
+            if self._timed:
+                self.phase_times[self.phase] = self.phase_times.get(self.phase, 0.0) + self._last - self._since
+        self._phase_start_step = step
+        self._since = self._last
+
+    def finish(self):
+        """Retourne le SortMetrics de l'exécution et le passe à chaque hook."""
+        self._close_phase(self.steps)
+        metrics = SortMetrics(self.algorithm, self.size, self.labels)
+        metrics.elapsed = self._clock() - self._start if self._timed else None
+        metrics.comparisons = self.comparisons
+        metrics.swaps = self.swaps
+        metrics.steps = self.steps
+        metrics.writes = self.writes
+        metrics.aux_peak = self.aux_peak
+        metrics.max_depth = self.max_depth
+        metrics.phase_steps = dict(self.phase_steps)
+        metrics.phase_times = dict(self.phase_times) if self._timed else None
+        if self.counter is not None:
+            metrics.declared_writes = self.writes
+            metrics.writes = self.counter.writes
+            metrics.reads = self.counter.reads
+            metrics.moves = self.counter.writes + self.counter.copies
+        for hook in self.hooks:
+            hook(metrics)
+        return metrics
+
+
+class AccessCounter:
+    """Compteurs partagés par une InstrumentedArray et ses copies auxiliaires."""
+
+    __slots__ = ('reads', 'writes', 'copies')
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0 # Écritures dans la liste triée
+        self.copies = 0 # Éléments copiés ou écrits dans des tampons auxiliaires
+
+
+class InstrumentedArray:
+    """Tampon qui compte ses accès ; s'utilise à la place d'une liste dans les générateurs.
+
+    Les algorithmes n'utilisent que len(), l'indexation, l'affectation et les
+    tranches : une tranche est une copie auxiliaire, elle-même instrumentée.
+    """
+
+    __slots__ = ('data', 'counter', 'aux')
+
+    def __init__(self, data, counter=None, aux=False):
+        self.data = data
+        self.counter = counter or AccessCounter()
+        self.aux = aux
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            part = self.data[index]
+            self.counter.reads += len(part)
+            self.counter.copies += len(part)
+            return InstrumentedArray(part, self.counter, aux=True)
+        self.counter.reads += 1
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        if self.aux:
+            self.counter.copies += 1
+        else:
+            self.counter.writes += 1
+        self.data[index] = value
+
+    def __iter__(self):
+        self.counter.reads += len(self.data)
+        return iter(self.data)
+
+    def __repr__(self):
+        return f"InstrumentedArray({self.data!r})"
+
+
+def profile_sort(sort_function, data, algorithm='', labels=None, hooks=()):
+    """Exécute le générateur `sort_function` sur une copie instrumentée de `data`.
+
+    Retourne (liste triée, SortMetrics) avec toutes les mesures renseignées ;
+    le temps est celui de l'exécution instrumentée, bien plus lente qu'un tri
+    non tracé : seules les proportions entre phases sont significatives.
+    """
+    arr = InstrumentedArray(list(data))
+    recorder = MetricsRecorder(algorithm, len(arr), labels, counter=arr.counter, hooks=hooks)
+    observe = recorder.observe
+    for event in sort_function(arr):
+        observe(event)
+    return arr.data, recorder.finish()
@@ -0,0 +1,79 @@
+# number_io.py
+"""Lecture et écriture de listes de nombres par blocs, pour les gros fichiers.
+
+La lecture se fait par blocs binaires de taille fixe. Chaque bloc est découpé
+sur les blancs (et les virgules), et le nombre coupé en fin de bloc est
+reporté au suivant : la mémoire ne dépasse jamais un bloc de texte plus les
+nombres déjà lus. L'écriture formate les nombres par lots et les écrit en
+quelques gros appels.
+"""
+import sys
+from array import array
+
+READ_CHUNK_BYTES = 1 << 20 # 1 Mio de texte par lecture
+WRITE_BATCH = 65536 # Nombres formatés par écriture
+
+
+def iter_number_chunks(stream, chunk_bytes=READ_CHUNK_BYTES):
+    """Produit les nombres de `stream` (binaire) par listes de flottants, bloc par bloc.
+
+    Lève ValueError avec la valeur fautive si un élément n'est pas un nombre.
+    """
+    pending = b''
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            break
+        block = pending + block.replace(b',', b' ')
+        # Le dernier élément peut être coupé : on le garde pour le bloc suivant
+        cut = len(block)
+        while cut and not block[cut - 1:cut].isspace():
+            cut -= 1
+        pending = block[cut:]
+        tokens = block[:cut].split()
+        if tokens:
+            yield _parse(tokens)
+    if pending.strip():
+        yield _parse(pending.split())
+
+
+def _parse(tokens):
+    try:
+        return list(map(float, tokens))
+    except ValueError:
+        for token in tokens:
+            try:
+                float(token)
+            except ValueError:
+                raise ValueError(f"nombre invalide : {token[:40].decode('utf-8', 'replace')!r}") from None
+        raise
+
+
+def read_numbers(stream, chunk_bytes=READ_CHUNK_BYTES, typecode=None):
+    """Lit tous les nombres de `stream` (binaire) dans une liste, ou dans un
+    array.array compact si `typecode` est donné ('d' ou 'f')."""
+    numbers = array(typecode) if typecode else []
+    for chunk in iter_number_chunks(stream, chunk_bytes):
+        numbers.extend(chunk)
+    return numbers
+
+
+def write_numbers(stream, values, batch=WRITE_BATCH):
+    """Écrit `values` dans `stream` (binaire), un nombre par ligne, par lots de `batch`."""
+    for start in range(0, len(values), batch):
+        lines = '\n'.join(map(repr, values[start:start + batch]))
+        stream.write(lines.encode('ascii') + b'\n')
+
+
+def open_input(path):
+    """Flux binaire de lecture : fichier, ou entrée standard pour '-'."""
+    if path == '-':
+        return sys.stdin.buffer
+    return open(path, 'rb')
+
+
+def open_output(path):
+    """Flux binaire d'écriture : fichier, ou sortie standard pour '-' / None."""
+    if path in (None, '-'):
+        return sys.stdout.buffer
+    return open(path, 'wb')
@@ -0,0 +1,367 @@
+# parallel_sort.py
+"""Tris parallèles sur plusieurs cœurs.
+
+Les données sont copiées une fois dans un bloc de mémoire partagée
+(multiprocessing.shared_memory) sous forme de tableau typé ('d' pour une
+liste) : les processus s'y attachent par son nom et lisent ou écrivent
+directement leurs tranches, sans que les nombres soient sérialisés entre
+processus. Seuls des indices et des compteurs transitent par le pool.
+
+parallel_merge_sort
+    Chaque processus trie un segment contigu (merge_sort_fast par défaut),
+    puis les segments sont fusionnés deux à deux, entre deux tampons, en
+    log2(workers) passes. Chaque fusion est découpée en morceaux de sortie
+    de même taille (le point de coupe dans chaque moitié est trouvé par
+    dichotomie) : tous les processus travaillent à chaque passe.
+sample_sort
+    Un échantillon trié fournit workers - 1 pivots. Chaque processus classe
+    les éléments de son segment par dichotomie, puis les recopie à leur place
+    dans le tampon de sortie, seau par seau ; les seaux sont enfin triés en
+    parallèle. Un seau est réservé à chaque valeur de pivot : les doublons ne
+    déséquilibrent pas les seaux et ces seaux-là n'ont pas besoin d'être triés.
+
+Les deux fonctions trient `arr` en place (list, array.array, memoryview
+inscriptible ou tableau NumPy contigu) et retournent (arr, comparaisons,
+écritures), avec les conventions de merge_sort_fast. Les éléments d'une liste
+sont convertis en flottants. En dessous de PARALLEL_MIN_SIZE éléments, ou
+avec un seul processus, le tri séquentiel est appelé directement.
+"""
+import contextlib
+import os
+import random
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from sorting import merge_sort_fast
+
+PARALLEL_MIN_SIZE = 20_000 # En dessous, le démarrage des processus coûte plus qu'il ne rapporte
+SAMPLE_OVERSAMPLING = 32 # Éléments échantillonnés par seau
+BUCKET_TYPECODE = 'I' # Numéro de seau de chaque élément (tampon partagé)
+
+
+def default_workers():
+    """Nombre de cœurs utilisables par le processus courant."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _typecode_of(arr):
+    if isinstance(arr, list):
+        return 'd'
+    with memoryview(arr) as view:
+        return view.format
+
+
+@contextlib.contextmanager
+def _shared_buffers(typecodes, n):
+    """Blocs partagés de n éléments, un par typecode ; détruits à la sortie."""
+    blocks = []
+    try:
+        for typecode in typecodes:
+            blocks.append(SharedMemory(create=True, size=max(1, n * array(typecode).itemsize)))
+        yield blocks
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+@contextlib.contextmanager
+def _attach(name, typecode, n):
+    """Vue typée de n éléments sur un bloc partagé existant."""
+    block = SharedMemory(name=name)
+    view = block.buf.cast(typecode)[:n] # La taille du bloc est arrondie à la page
+    try:
+        yield view
+    finally:
+        view.release()
+        block.close()
+
+
+def _load(arr, view):
+    """Copie arr dans la vue partagée."""
+    if isinstance(arr, list):
+        view[:] = array(view.format, arr)
+    else:
+        with memoryview(arr) as source:
+            view[:] = source
+
+
+def _store(view, arr):
+    """Recopie la vue partagée dans arr (en place)."""
+    if isinstance(arr, list):
+        arr[:] = view.tolist()
+    else:
+        with memoryview(arr) as target:
+            target[:] = view
+
+
+def _split(n, parts):
+    """Bornes de `parts` segments contigus de tailles égales (à un près)."""
+    return [(n * k // parts, n * (k + 1) // parts) for k in range(parts)]
+
+
+# --- Tâches exécutées dans les processus ---
+
+def _sort_segment(name, typecode, n, start, stop, sort_function):
+    """Trie view[start:stop] avec une version rapide de sorting.py. Retourne (comparaisons, écritures)."""
+    with _attach(name, typecode, n) as view:
+        values, comparisons, writes = sort_function(view[start:stop].tolist())
+        view[start:stop] = array(typecode, values)
+    return comparisons, writes
+
+
+def _co_rank(view, lo, mid, hi, k):
+    """Nombre d'éléments de view[lo:mid] parmi les k premiers de la fusion stable
+    de view[lo:mid] et view[mid:hi]. Retourne (nombre, comparaisons)."""
+    low = max(0, k - (hi - mid))
+    high = min(k, mid - lo)
+    comparisons = 0
+    while low < high:
+        i = (low + high) // 2
+        comparisons += 1
+        if view[mid + k - i - 1] < view[lo + i]:
+            high = i
+        else:
+            low = i + 1
+    return low, comparisons
+
+
+def _merge_lists(left, right):
+    """Fusion stable de deux listes triées. Retourne (liste, comparaisons)."""
+    out = []
+    append = out.append
+    i = j = 0
+    n1, n2 = len(left), len(right)
+    comparisons = 0
+    while i < n1 and j < n2:
+        comparisons += 1
+        if left[i] <= right[j]:
+            append(left[i])
+            i += 1
+        else:
+            append(right[j])
+            j += 1
+    out.extend(left[i:])
+    out.extend(right[j:])
+    return out, comparisons
+
+
+def _merge_piece(src_name, dst_name, typecode, n, lo, mid, hi, k0, k1):
+    """Écrit dans dst[lo + k0:lo + k1] les éléments k0 à k1 de la fusion de
+    src[lo:mid] et src[mid:hi]. Retourne (comparaisons, écritures)."""
+    with _attach(src_name, typecode, n) as src, _attach(dst_name, typecode, n) as dst:
+        i0, c0 = _co_rank(src, lo, mid, hi, k0)
+        i1, c1 = _co_rank(src, lo, mid, hi, k1)
+        left = src[lo + i0:lo + i1].tolist()
+        right = src[mid + k0 - i0:mid + k1 - i1].tolist()
+        out, comparisons = _merge_lists(left, right)
+        dst[lo + k0:lo + k1] = array(typecode, out)
+    return comparisons + c0 + c1, k1 - k0
+
+
+def _search_costs(count):
+    """Comparaisons d'une recherche dichotomique (bisect_left) parmi `count`
+    pivots, selon l'indice trouvé : chaque résultat correspond à un seul chemin."""
+    costs = [0] * (count + 1)
+
+    def walk(low, high, depth):
+        if low == high:
+            costs[low] = depth
+            return
+        mid = (low + high) // 2
+        walk(low, mid, depth + 1)
+        walk(mid + 1, high, depth + 1)
+
+    walk(0, count, 0)
+    return costs
+
+
+def _classify(src_name, ids_name, typecode, n, start, stop, splitters):
+    """Numérote le seau de chaque élément de src[start:stop] (dans ids).
+
+    Seau 2k : entre les pivots k - 1 et k (exclus) ; seau 2k + 1 : égal au
+    pivot k. Retourne (tailles des seaux, comparaisons).
+    """
+    count = len(splitters)
+    costs = _search_costs(count)
+    sizes = [0] * (2 * count + 1)
+    comparisons = 0
+    with _attach(src_name, typecode, n) as src, _attach(ids_name, BUCKET_TYPECODE, n) as ids:
+        values = src[start:stop].tolist()
+        buckets = array(BUCKET_TYPECODE, bytes(len(values) * ids.itemsize))
+        for pos, x in enumerate(values):
+            k = bisect_left(splitters, x)
+            comparisons += costs[k]
+            if k < count:
+                comparisons += 1 # x < splitters[k] ou égalité
+                bucket = 2 * k if x < splitters[k] else 2 * k + 1
+            else:
+                bucket = 2 * k
+            buckets[pos] = bucket
+            sizes[bucket] += 1
+        ids[start:stop] = buckets
+    return sizes, comparisons
+
+
+def _scatter(src_name, ids_name, dst_name, typecode, n, start, stop, offsets):
+    """Recopie src[start:stop] dans dst, chaque seau à partir de offsets[seau]. Retourne les écritures."""
+    with _attach(src_name, typecode, n) as src, _attach(ids_name, BUCKET_TYPECODE, n) as ids, \
+            _attach(dst_name, typecode, n) as dst:
+        groups = [[] for _ in offsets]
+        for x, bucket in zip(src[start:stop].tolist(), ids[start:stop].tolist()):
+            groups[bucket].append(x)
+        for group, offset in zip(groups, offsets):
+            if group:
+                dst[offset:offset + len(group)] = array(typecode, group)
+    return stop - start
+
+
+# --- Tris parallèles ---
+
+def parallel_merge_sort(arr, workers=None, sort_function=merge_sort_fast):
+    """Tri fusion parallèle. Retourne (arr, comparaisons, écritures)."""
+    n = len(arr)
+    workers = workers or default_workers()
+    if workers <= 1 or n < PARALLEL_MIN_SIZE:
+        return sort_function(arr)
+
+    typecode = _typecode_of(arr)
+    comparisons = writes = 0
+    with _shared_buffers((typecode, typecode), n) as (first, second), \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        with _attach(first.name, typecode, n) as view:
+            _load(arr, view)
+
+        # Segments triés en parallèle
+        segments = _split(n, workers)
+        futures = [executor.submit(_sort_segment, first.name, typecode, n, start, stop, sort_function)
+                   for start, stop in segments]
+        for future in futures:
+            c, w = future.result()
+            comparisons += c
+            writes += w
+
+        # Fusions deux à deux ; chaque passe est découpée en `workers` morceaux de sortie
+        src, dst = first, second
+        piece = -(-n // workers)
+        while len(segments) > 1:
+            merged = []
+            futures = []
+            for s in range(0, len(segments) - 1, 2):
+                lo, mid = segments[s]
+                hi = segments[s + 1][1]
+                for k0 in range(0, hi - lo, piece):
+                    futures.append(executor.submit(_merge_piece, src.name, dst.name, typecode, n,
+                                                   lo, mid, hi, k0, min(k0 + piece, hi - lo)))
+                merged.append((lo, hi))
+            if len(segments) % 2: # Segment sans partenaire : recopié tel quel
+                lo, hi = segments[-1]
+                with _attach(src.name, typecode, n) as s_view, _attach(dst.name, typecode, n) as d_view:
+                    d_view[lo:hi] = s_view[lo:hi]
+                writes += hi - lo
+                merged.append((lo, hi))
+            for future in futures:
+                c, w = future.result()
+                comparisons += c
+                writes += w
+            segments = merged
+            src, dst = dst, src
+
+        with _attach(src.name, typecode, n) as view:
+            _store(view, arr)
+    return arr, comparisons, writes
+
+
+def sample_sort(arr, workers=None, sort_function=merge_sort_fast):
+    """Tri par échantillonnage parallèle. Retourne (arr, comparaisons, écritures)."""
+    n = len(arr)
+    workers = workers or default_workers()
+    if workers <= 1 or n < PARALLEL_MIN_SIZE:
+        return sort_function(arr)
+
+    typecode = _typecode_of(arr)
+    comparisons = writes = 0
+    with _shared_buffers((typecode, typecode, BUCKET_TYPECODE), n) as (src, dst, ids), \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        with _attach(src.name, typecode, n) as view:
+            _load(arr, view)
+            # Pivots : quantiles d'un échantillon (graine fixe : résultat reproductible)
+            rng = random.Random(n)
+            sample = [view[rng.randrange(n)] for _ in range(workers * SAMPLE_OVERSAMPLING)]
+        sample, c, _ = sort_function(sample)
+        comparisons += c
+        splitters = [sample[k * len(sample) // workers] for k in range(1, workers)]
+
+        # Classement : taille de chaque seau dans chaque segment
+        segments = _split(n, workers)
+        futures = [executor.submit(_classify, src.name, ids.name, typecode, n, start, stop, splitters)
+                   for start, stop in segments]
+        counts = []
+        for future in futures:
+            sizes, c = future.result()
+            counts.append(sizes)
+            comparisons += c
+
+        # Position de départ de chaque (segment, seau) : seaux dans l'ordre,
+        # puis segments dans l'ordre (la répartition est stable)
+        buckets = len(counts[0])
+        offsets = [[0] * buckets for _ in segments]
+        bounds = []
+        position = 0
+        for bucket in range(buckets):
+            start = position
+            for s in range(len(segments)):
+                offsets[s][bucket] = position
+                position += counts[s][bucket]
+            bounds.append((start, position))
+
+        futures = [executor.submit(_scatter, src.name, ids.name, dst.name, typecode, n, start, stop, offsets[s])
+                   for s, (start, stop) in enumerate(segments)]
+        for future in futures:
+            writes += future.result()
+
+        # Tri des seaux entre pivots (les seaux « égal au pivot » sont déjà triés)
+        futures = [executor.submit(_sort_segment, dst.name, typecode, n, start, stop, sort_function)
+                   for bucket, (start, stop) in enumerate(bounds)
+                   if bucket % 2 == 0 and stop - start > 1]
+        for future in futures:
+            c, w = future.result()
+            comparisons += c
+            writes += w
+
+        with _attach(dst.name, typecode, n) as view:
+            _store(view, arr)
+    return arr, comparisons, writes
+
+
+PARALLEL_ALGORITHMS = {
+    "Parallel Merge Sort": parallel_merge_sort,
+    "Sample Sort": sample_sort,
+}
+
+
+def measure_speedup(parallel_function, data, workers=None, baseline=merge_sort_fast):
+    """Chronomètre un tri parallèle et `baseline` (merge_sort séquentiel) sur des copies de `data`.
+
+    Retourne un dict : durées (s), accélération (baseline / parallèle) et processus utilisés.
+    """
+    workers = workers or default_workers()
+    arr = data[:]
+    start = time.perf_counter()
+    parallel_function(arr, workers)
+    parallel_s = time.perf_counter() - start
+    arr = data[:]
+    start = time.perf_counter()
+    baseline(arr)
+    baseline_s = time.perf_counter() - start
+    return {
+        'workers': workers,
+        'parallel_s': parallel_s,
+        'baseline_s': baseline_s,
+        'speedup': baseline_s / parallel_s if parallel_s else None,
+    }
@@ -0,0 +1,151 @@
+# race.py
+"""Course entre plusieurs algorithmes de tri sur des copies de la même liste.
+
+Chaque couloir (RaceLane) fait tourner un générateur de SORTING_ALGORITHMS.
+La course (Race) les fait avancer au même rythme selon l'un des deux modes :
+
+    'comparisons' : une horloge commune en nombre de comparaisons ; chaque
+                    couloir avance jusqu'à l'avoir atteinte. Celui qui compare
+                    le moins termine en premier.
+    'time'        : chaque couloir reçoit la même tranche de temps réel par
+                    frame. Celui qui travaille le plus vite termine en premier.
+
+Les tris par distribution (Radix, Bucket, Counting) ne comparent rien : leur
+premier compteur compte des passes. Ils n'ont pas leur place sur l'horloge
+commune et ne peuvent courir qu'en mode 'time' (voir `uncounted`).
+
+Le module ne dessine rien : le visualiseur lit l'état des couloirs.
+"""
+import time
+
+LOCKSTEP_MODES = ['comparisons', 'time']
+DEADLINE_CHECK_MASK = 0x3F # Horloge consultée toutes les 64 étapes
+
+
+class RaceLane:
+    """Un algorithme de la course : son générateur et le dernier état obtenu."""
+
+    def __init__(self, name, sort_function, data, counts_comparisons=True):
+        self.name = name
+        self.counts_comparisons = counts_comparisons # Premier compteur = comparaisons
+        self.list_data = data
+        self.generator = sort_function(data)
+        self.compared = ()
+        self.swapped = ()
+        self.comparisons = 0
+        self.swaps = 0
+        self.steps = 0
+        self.busy_time = 0.0 # Temps réel passé dans le générateur
+        self.finished = False
+        self.rank = None # Ordre d'arrivée, à partir de 1
+
+    def advance(self, deadline, target=None, max_steps=None):
+        """Avance jusqu'à `target` comparaisons (ou sans limite), `max_steps` étapes
+        ou `deadline`. Retourne True si le générateur est épuisé."""
+        generator = self.generator
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        event = None
+        taken = 0
+        comparisons = self.comparisons
+        exhausted = False
+        try:
+            while target is None or comparisons < target:
+                if max_steps is not None and taken >= max_steps:
+                    break
+                event = next(generator)
+                comparisons = event.comparisons
+                taken += 1
+                if not taken & DEADLINE_CHECK_MASK and perf_counter() > deadline:
+                    break
+        except StopIteration:
+            exhausted = True
+        finally:
+            if event is not None:
+                self.list_data = event.arr
+                self.compared = event.compared
+                self.swapped = event.swapped
+                self.comparisons = event.comparisons
+                self.swaps = event.swaps
+            self.steps += taken
+            self.busy_time += perf_counter() - start
+        return exhausted
+
+
+class Race:
+    """Fait avancer les couloirs en parallèle (au sens de l'affichage) et les classe."""
+
+    def __init__(self, algorithms, names, data, mode='comparisons', uncounted=()):
+        """`uncounted` : noms des algorithmes dont le premier compteur n'est pas
+        un nombre de comparaisons (admis seulement en mode 'time')."""
+        self.lanes = [RaceLane(name, algorithms[name], data[:], name not in uncounted) for name in names]
+        self.mode = mode
+        self.clock = 0.0 # Horloge en comparaisons (mode 'comparisons')
+        self.arrivals = 0
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        if mode not in LOCKSTEP_MODES:
+            raise ValueError(f"Mode de course inconnu : {mode}")
+        if mode == 'comparisons':
+            uncounted = [lane.name for lane in self.lanes if not lane.counts_comparisons]
+            if uncounted:
+                raise ValueError(f"Mode 'comparisons' impossible, sans comparaisons : {', '.join(uncounted)}")
+        self._mode = mode
+
+    @property
+    def done(self):
+        return self.arrivals == len(self.lanes)
+
+    def active_lanes(self):
+        return [lane for lane in self.lanes if not lane.finished]
+
+    def _finish_lane(self, lane):
+        lane.finished = True
+        lane.compared = ()
+        lane.swapped = ()
+        self.arrivals += 1
+        lane.rank = self.arrivals
+
+    def update(self, comparisons, time_budget):
+        """Une frame de course.
+
+        `comparisons` fait avancer l'horloge commune (mode 'comparisons') ;
+        `time_budget` (s) est partagé équitablement entre les couloirs actifs.
+        """
+        active = self.active_lanes()
+        if not active:
+            return
+        self.clock += comparisons
+        lane_budget = time_budget / len(active)
+        target = self.clock if self.mode == 'comparisons' else None
+        for lane in active:
+            if lane.advance(time.perf_counter() + lane_budget, target):
+                self._finish_lane(lane)
+        if target is not None:
+            # Un couloir freiné par le budget ne laisse pas l'horloge s'envoler :
+            # au plus une frame d'avance sur le plus lent
+            behind = [lane.comparisons for lane in self.lanes if not lane.finished]
+            if behind:
+                self.clock = min(self.clock, min(behind) + comparisons)
+
+    def step(self):
+        """Pas-à-pas : une étape pour chaque couloir actif."""
+        for lane in self.active_lanes():
+            if lane.advance(float('inf'), max_steps=1):
+                self._finish_lane(lane)
+        self.clock = max([self.clock] + [lane.comparisons for lane in self.lanes])
+
+    def finish(self):
+        """Termine tous les couloirs ; le classement suit le mode de course."""
+        active = self.active_lanes()
+        for lane in active:
+            while not lane.advance(float('inf')):
+                pass
+        key = (lambda lane: lane.comparisons) if self.mode == 'comparisons' else (lambda lane: lane.busy_time)
+        for lane in sorted(active, key=key):
+            self._finish_lane(lane)
@@ -0,0 +1,186 @@
+# result_cache.py
+"""Cache LRU des traces et résultats de tri, en mémoire et optionnellement sur disque.
+
+Une exécution est entièrement déterminée par (algorithme, taille, désordre,
+min, max, graine) et par le code qui génère et trie la liste. Relancer le même tri (touche R,
+bancs d'essai répétés) peut donc être servi depuis le cache au lieu d'être
+recalculé.
+
+Les clés disque incluent une empreinte de sorting.py, metrics.py, parallel_sort.py et input_generator.py :
+modifier un algorithme ou un générateur invalide automatiquement les entrées
+enregistrées avec l'ancien code. Sur
+disque, les traces sont des fichiers .trc compressés (relus par projection
+mémoire) et les résultats des fichiers .json ; les plus anciens sont supprimés
+au-delà de `max_disk_bytes`.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import input_generator
+import metrics
+import parallel_sort
+import sorting
+from sort_trace import SortTrace, save_trace, load_trace
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_MEMORY_STEPS = 20_000_000 # Étapes de traces gardées en mémoire au total
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+CACHE_SUFFIXES = ('.trc', '.json')
+
+
+def _code_version():
+    """Empreinte du code des tris et de la génération des listes, intégrée aux clés disque.
+
+    Le moteur de génération en fait partie : avec ou sans NumPy, une même
+    graine ne donne pas la même liste.
+    """
+    digest = hashlib.sha1(str(input_generator.HAS_NUMPY).encode('ascii'))
+    for module in (sorting, metrics, parallel_sort, input_generator):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(algorithm, size, disorder_type, min_val, max_val, seed, *extra):
+    """Clé d'une exécution ; `extra` distingue des variantes (ex. répétitions d'un banc d'essai)."""
+    return (algorithm, size, disorder_type, float(min_val), float(max_val), seed) + extra
+
+
+class ResultCache:
+    """LRU de traces (SortTrace/MappedTrace) et de résultats (dicts JSON)."""
+
+    def __init__(self, directory=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_memory_steps=DEFAULT_MAX_MEMORY_STEPS, max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+                 version=None):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_memory_steps = max_memory_steps
+        self.max_disk_bytes = max_disk_bytes
+        self.version = version or _code_version()
+        self._entries = OrderedDict() # (type, clé) -> trace ou résultat
+        self._memory_steps = 0 # Étapes des SortTrace en mémoire (les fichiers projetés ne comptent pas)
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _cost(value):
+        return len(value) if isinstance(value, SortTrace) else 0
+
+    def _path(self, kind, key):
+        digest = hashlib.sha1(repr((self.version, kind, key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + ('.trc' if kind == 'trace' else '.json'))
+
+    def _remember(self, kind, key, value):
+        entry = (kind, key)
+        old = self._entries.pop(entry, None)
+        if old is not None:
+            self._memory_steps -= self._cost(old)
+        self._entries[entry] = value
+        self._memory_steps += self._cost(value)
+        # Évince les plus anciennes entrées, jamais celle qui vient d'être ajoutée
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self._memory_steps > self.max_memory_steps):
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_steps -= self._cost(evicted)
+
+    def _recall(self, kind, key):
+        entry = (kind, key)
+        value = self._entries.get(entry)
+        if value is not None:
+            self._entries.move_to_end(entry)
+        return value
+
+    def _touch(self, path):
+        """Marque un fichier comme récemment utilisé (l'éviction disque suit mtime)."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get_trace(self, key):
+        """Trace mémorisée pour `key`, ou None."""
+        trace = self._recall('trace', key)
+        if trace is None and self.directory:
+            path = self._path('trace', key)
+            if os.path.exists(path):
+                try:
+                    trace = load_trace(path)
+                except (OSError, ValueError): # Fichier tronqué ou d'un autre format
+                    trace = None
+                else:
+                    self._touch(path)
+                    self._remember('trace', key, trace)
+        if trace is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return trace
+
+    def put_trace(self, key, trace):
+        self._remember('trace', key, trace)
+        if self.directory and isinstance(trace, SortTrace):
+            path = self._path('trace', key)
+            tmp = path + '.tmp'
+            save_trace(trace, tmp, compress=True)
+            os.replace(tmp, path)
+            self._trim_disk()
+
+    def get_result(self, key):
+        """Résultat (dict) mémorisé pour `key`, ou None."""
+        result = self._recall('result', key)
+        if result is None and self.directory:
+            path = self._path('result', key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                result = None
+            else:
+                self._touch(path)
+                self._remember('result', key, result)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put_result(self, key, result):
+        self._remember('result', key, result)
+        if self.directory:
+            path = self._path('result', key)
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp, path)
+            self._trim_disk()
+
+    def _trim_disk(self):
+        """Supprime les fichiers les moins récemment utilisés au-delà de max_disk_bytes."""
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(CACHE_SUFFIXES):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        files.sort()
+        for _, size, path in files[:-1]: # Le fichier le plus récent est toujours gardé
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError: # Fichier encore projeté en mémoire (Windows)
+                continue
+            total -= size
+
+    def clear(self):
+        """Vide le cache mémoire (les fichiers sur disque sont conservés)."""
+        self._entries.clear()
+        self._memory_steps = 0
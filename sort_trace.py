@@ -0,0 +1,392 @@
+# sort_trace.py
+"""Enregistrement compact d'une exécution de tri, rejouable et navigable.
+
+Un générateur de SORTING_ALGORITHMS est vidé une fois dans un journal
+d'événements à colonnes fixes (tableaux `array`) : type d'opération, indices
+comparés, indices écrits, valeurs écrites et compteurs. Des instantanés
+complets de la liste sont pris toutes les K étapes (images clés), ce qui
+permet d'aller à n'importe quelle étape en O(K), de reculer et de parcourir
+une frise temporelle sans relancer l'algorithme.
+
+Avec K >= n (valeur par défaut), les instantanés ne coûtent pas plus que le
+journal lui-même : la mémoire reste proportionnelle au nombre d'étapes.
+Les valeurs sont stockées en flottants double précision.
+
+Une trace se sauvegarde dans un fichier binaire versionné (save_trace) et se
+relit par projection mémoire (load_trace) : seuls l'en-tête et l'index sont lus
+à l'ouverture, les événements sont décodés par blocs à la demande.
+
+Format (petit-boutiste, version 2 ; la version 1, sans type d'étape, reste lisible) :
+    en-tête FILE_HEADER, nom de l'algorithme (UTF-8), bourrage à 8 octets
+    images clés : (steps // K + 1) x n flottants 'd' (la première est l'entrée)
+    index des blocs : (offset, longueur) en 2 x u64 par bloc
+    blocs d'événements : enregistrements EVENT_RECORD, compressés zlib si
+    FLAG_COMPRESSED
+"""
+import argparse
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from step_event import OP_COMPARE, OP_MARK, OP_WRITE, WRITE_OPS, StepEvent
+
+DEFAULT_KEYFRAME_INTERVAL = 1024 # K minimal ; porté à n pour les grandes listes
+
+# Nature des indices comparés / échangés d'une étape (2 bits chacun dans l'opcode,
+# le type d'étape StepEvent.op occupe les 4 bits de poids fort)
+KIND_NONE = 0
+KIND_TUPLE = 1
+KIND_RANGE = 2
+MAX_COMPARED = 3 # (low, mid, high) du pivot médiane-de-trois
+MAX_SWAPPED = 2
+
+_NO_INDEX = -1
+
+# --- Format de fichier ---
+FILE_MAGIC = b'PAPYTRC\0'
+FILE_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+FLAG_COMPRESSED = 1
+# magic, version, flags, n, étapes, K, comparaisons finales, échanges finaux, étapes par bloc, longueur du nom
+FILE_HEADER = struct.Struct('<8sHHQQQqqIH')
+# op, 3 indices comparés, 2 indices échangés, 2 valeurs écrites, comparaisons, échanges
+EVENT_RECORD = struct.Struct('<B3i2i2d2q')
+CHUNK_INDEX_ENTRY = struct.Struct('<QQ')
+DEFAULT_CHUNK_STEPS = 65536
+
+
+def _kind_of(indices):
+    if isinstance(indices, range):
+        return KIND_RANGE
+    return KIND_TUPLE if indices else KIND_NONE
+
+
+def _op_of(code):
+    """Type d'étape d'un opcode ; déduit des natures d'indices pour la version 1."""
+    op = code >> 4
+    if op:
+        return op
+    swp_kind = (code >> 2) & 3
+    if swp_kind == KIND_TUPLE: # En version 1, tout tuple d'indices échangés était une écriture
+        return OP_WRITE
+    if swp_kind == KIND_NONE and code & 3:
+        return OP_COMPARE
+    return OP_MARK
+
+
+def _decode(kind, operands):
+    """Reconstruit un tuple ou un range à partir des opérandes stockés."""
+    if kind == KIND_RANGE:
+        return range(operands[0], operands[1])
+    if kind == KIND_TUPLE:
+        return tuple(i for i in operands if i != _NO_INDEX)
+    return ()
+
+
+class SortTrace:
+    """Journal d'une exécution : entrée, événements, images clés et compteurs finaux."""
+
+    def __init__(self, initial, algorithm_name='', keyframe_interval=None):
+        self.algorithm_name = algorithm_name
+        self.initial = array('d', initial)
+        self.size = len(initial)
+        self.keyframe_interval = keyframe_interval or max(DEFAULT_KEYFRAME_INTERVAL, self.size)
+
+        self.ops = array('B') # cmp_kind | (swp_kind << 2) | (op << 4)
+        self.compared = [array('i') for _ in range(MAX_COMPARED)]
+        self.swapped = [array('i') for _ in range(MAX_SWAPPED)]
+        self.values = [array('d') for _ in range(MAX_SWAPPED)] # Valeurs écrites aux indices échangés
+        self.comparisons = array('q')
+        self.swaps = array('q')
+        self.keyframes = [array('d', initial)] # keyframes[m] = état après m*K étapes
+
+    def __len__(self):
+        return len(self.ops)
+
+    @property
+    def final_comparisons(self):
+        return self.comparisons[-1] if self.comparisons else 0
+
+    @property
+    def final_swaps(self):
+        return self.swaps[-1] if self.swaps else 0
+
+    def append(self, event):
+        """Ajoute un StepEvent produit par un générateur de tri (event.arr = état après l'étape)."""
+        arr, compared, swapped = event.arr, event.compared, event.swapped
+        writes = event.op in WRITE_OPS
+        cmp_kind = _kind_of(compared)
+        swp_kind = _kind_of(swapped)
+        if cmp_kind == KIND_RANGE:
+            cmp_ops = (compared.start, compared.stop)
+        else:
+            cmp_ops = tuple(compared)
+        if swp_kind == KIND_RANGE:
+            swp_ops = (swapped.start, swapped.stop)
+        else:
+            swp_ops = tuple(swapped)
+        if len(cmp_ops) > MAX_COMPARED or len(swp_ops) > MAX_SWAPPED:
+            raise ValueError(f"Étape non représentable: {compared!r} / {swapped!r}")
+
+        self.ops.append(cmp_kind | (swp_kind << 2) | (event.op << 4))
+        for col, slot in enumerate(self.compared):
+            slot.append(cmp_ops[col] if col < len(cmp_ops) else _NO_INDEX)
+        for col, slot in enumerate(self.swapped):
+            index = swp_ops[col] if col < len(swp_ops) else _NO_INDEX
+            slot.append(index)
+            # Seules les écritures transportent des valeurs
+            self.values[col].append(arr[index] if writes and index != _NO_INDEX else 0.0)
+        self.comparisons.append(event.comparisons)
+        self.swaps.append(event.swaps)
+
+        if len(self.ops) % self.keyframe_interval == 0:
+            self.keyframes.append(array('d', arr))
+
+    def event(self, t):
+        """Étape t décodée : (op, compared, swapped, comparisons, swaps)."""
+        code = self.ops[t]
+        compared = _decode(code & 3, [slot[t] for slot in self.compared])
+        swapped = _decode((code >> 2) & 3, [slot[t] for slot in self.swapped])
+        return _op_of(code), compared, swapped, self.comparisons[t], self.swaps[t]
+
+    def _apply_writes(self, arr, t):
+        if _op_of(self.ops[t]) not in WRITE_OPS:
+            return
+        for col in range(MAX_SWAPPED):
+            index = self.swapped[col][t]
+            if index != _NO_INDEX:
+                arr[index] = self.values[col][t]
+
+    def state_at(self, t):
+        """Liste après les t premières étapes (0 <= t <= len), en O(n + K)."""
+        t = max(0, min(t, len(self)))
+        m = t // self.keyframe_interval
+        arr = list(self.keyframes[m])
+        for step in range(m * self.keyframe_interval, t):
+            self._apply_writes(arr, step)
+        return arr
+
+    def player(self, start=0):
+        """Itérateur de relecture à partir de l'étape `start` (voir TracePlayer)."""
+        return TracePlayer(self, start)
+
+
+class TracePlayer:
+    """Rejoue un SortTrace en produisant un StepEvent réutilisé, comme les générateurs de tri.
+
+    `position` est le nombre d'étapes déjà appliquées à `arr`.
+    """
+
+    def __init__(self, trace, start=0):
+        self.trace = trace
+        self.position = max(0, min(start, len(trace)))
+        self.arr = trace.state_at(self.position)
+        self._event = StepEvent(self.arr)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        t = self.position
+        if t >= len(self.trace):
+            raise StopIteration
+        self.trace._apply_writes(self.arr, t)
+        self.position = t + 1
+        return self._event.set(*self.trace.event(t))
+
+    def current(self):
+        """État courant sans avancer : StepEvent de la dernière étape appliquée."""
+        if self.position == 0:
+            return self._event.set(OP_MARK, (), (), 0, 0)
+        return self._event.set(*self.trace.event(self.position - 1))
+
+
+def _pad8(n):
+    return (8 - n % 8) % 8
+
+
+def save_trace(trace, path, compress=False, chunk_steps=DEFAULT_CHUNK_STEPS):
+    """Écrit `trace` (SortTrace) dans `path` au format binaire versionné."""
+    steps = len(trace)
+    name = trace.algorithm_name.encode('utf-8')
+    flags = FLAG_COMPRESSED if compress else 0
+    num_chunks = (steps + chunk_steps - 1) // chunk_steps
+
+    # Blocs d'événements encodés d'abord : leurs tailles alimentent l'index
+    pack = EVENT_RECORD.pack
+    cmp0, cmp1, cmp2 = trace.compared
+    swp0, swp1 = trace.swapped
+    val0, val1 = trace.values
+    chunks = []
+    for c in range(num_chunks):
+        start = c * chunk_steps
+        stop = min(steps, start + chunk_steps)
+        raw = b''.join(pack(trace.ops[t], cmp0[t], cmp1[t], cmp2[t], swp0[t], swp1[t],
+                            val0[t], val1[t], trace.comparisons[t], trace.swaps[t])
+                       for t in range(start, stop))
+        chunks.append(zlib.compress(raw) if compress else raw)
+
+    with open(path, 'wb') as f:
+        header = FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, flags, trace.size, steps,
+                                  trace.keyframe_interval, trace.final_comparisons,
+                                  trace.final_swaps, chunk_steps, len(name))
+        f.write(header)
+        f.write(name)
+        f.write(b'\0' * _pad8(len(header) + len(name)))
+        for keyframe in trace.keyframes:
+            if sys.byteorder == 'little':
+                keyframe.tofile(f)
+            else:
+                f.write(_little_endian(keyframe))
+
+        offset = f.tell() + num_chunks * CHUNK_INDEX_ENTRY.size
+        for chunk in chunks:
+            f.write(CHUNK_INDEX_ENTRY.pack(offset, len(chunk)))
+            offset += len(chunk)
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _little_endian(values):
+    swapped = array('d', values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class MappedTrace:
+    """Trace lue depuis un fichier par projection mémoire, même interface que SortTrace.
+
+    Rien n'est chargé à l'ouverture hormis l'en-tête et l'index des blocs ; un
+    seul bloc d'événements décodé est gardé en cache.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # Fichier vide
+            self._file.close()
+            raise ValueError(f"{path}: fichier de trace vide")
+
+        (magic, version, flags, self.size, self._steps, self.keyframe_interval,
+         self.final_comparisons, self.final_swaps, self._chunk_steps,
+         name_len) = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: ce n'est pas un fichier de trace")
+        if version not in SUPPORTED_VERSIONS:
+            self.close()
+            raise ValueError(f"{path}: version de trace {version} non supportée")
+        self._compressed = bool(flags & FLAG_COMPRESSED)
+
+        pos = FILE_HEADER.size
+        self.algorithm_name = bytes(self._map[pos:pos + name_len]).decode('utf-8')
+        pos += name_len
+        pos += _pad8(pos)
+        self._keyframes_offset = pos
+        self._num_keyframes = self._steps // self.keyframe_interval + 1
+        pos += self._num_keyframes * self.size * 8
+        num_chunks = (self._steps + self._chunk_steps - 1) // self._chunk_steps
+        self._chunk_index = [CHUNK_INDEX_ENTRY.unpack_from(self._map, pos + c * CHUNK_INDEX_ENTRY.size)
+                             for c in range(num_chunks)]
+
+        self._cached_chunk = -1
+        self._cached_data = None
+
+    def __len__(self):
+        return self._steps
+
+    @property
+    def initial(self):
+        return self.keyframe(0)
+
+    def keyframe(self, m):
+        """Image clé m (état après m*K étapes) sous forme de liste."""
+        start = self._keyframes_offset + m * self.size * 8
+        values = array('d')
+        values.frombytes(self._map[start:start + self.size * 8])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values.tolist()
+
+    def _record(self, t):
+        """Enregistrement brut de l'étape t, en décodant son bloc si nécessaire."""
+        chunk, row = divmod(t, self._chunk_steps)
+        if chunk != self._cached_chunk:
+            offset, length = self._chunk_index[chunk]
+            if self._compressed:
+                self._cached_data = zlib.decompress(self._map[offset:offset + length])
+            else:
+                self._cached_data = memoryview(self._map)[offset:offset + length]
+            self._cached_chunk = chunk
+        return EVENT_RECORD.unpack_from(self._cached_data, row * EVENT_RECORD.size)
+
+    def event(self, t):
+        code, c0, c1, c2, s0, s1, _, _, comparisons, swaps = self._record(t)
+        return (_op_of(code), _decode(code & 3, (c0, c1, c2)), _decode((code >> 2) & 3, (s0, s1)),
+                comparisons, swaps)
+
+    def _apply_writes(self, arr, t):
+        code, _, _, _, s0, s1, v0, v1, _, _ = self._record(t)
+        if _op_of(code) not in WRITE_OPS:
+            return
+        if s0 != _NO_INDEX:
+            arr[s0] = v0
+        if s1 != _NO_INDEX:
+            arr[s1] = v1
+
+    def state_at(self, t):
+        t = max(0, min(t, len(self)))
+        m = t // self.keyframe_interval
+        arr = self.keyframe(m)
+        for step in range(m * self.keyframe_interval, t):
+            self._apply_writes(arr, step)
+        return arr
+
+    def player(self, start=0):
+        return TracePlayer(self, start)
+
+    def close(self):
+        self._cached_data = None
+        self._map.close()
+        self._file.close()
+
+
+def load_trace(path):
+    """Ouvre un fichier de trace en projection mémoire (voir MappedTrace)."""
+    return MappedTrace(path)
+
+
+def record_trace(sort_function, data, algorithm_name='', keyframe_interval=None):
+    """Vide le générateur `sort_function(copie de data)` dans un SortTrace."""
+    trace = SortTrace(data, algorithm_name, keyframe_interval)
+    append = trace.append
+    for event in sort_function(list(data)):
+        append(event)
+    return trace
+
+
+def main(argv=None):
+    """Enregistre un tri dans un fichier, à rejouer avec `python visualizer.py --replay FICHIER`."""
+    from config import DISORDER_OPTIONS
+    from sorting import SORTING_ALGORITHMS, generate_list
+
+    parser = argparse.ArgumentParser(description="Enregistre la trace d'un tri dans un fichier.")
+    parser.add_argument('algorithm', choices=list(SORTING_ALGORITHMS.keys()))
+    parser.add_argument('size', type=int)
+    parser.add_argument('-o', '--output', required=True, help="Fichier de trace à écrire")
+    parser.add_argument('-d', '--disorder', choices=DISORDER_OPTIONS, default='random')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-z', '--compress', action='store_true', help="Compresser les événements (zlib)")
+    args = parser.parse_args(argv)
+
+    data = generate_list(args.size, disorder_type=args.disorder, seed=args.seed)
+    trace = record_trace(SORTING_ALGORITHMS[args.algorithm], data, args.algorithm)
+    save_trace(trace, args.output, compress=args.compress)
+    print(f"{args.output}: {len(trace)} étapes, {trace.final_comparisons} comparaisons, {trace.final_swaps} échanges")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+# sort_worker.py
+"""Exécution d'un générateur de tri dans un thread producteur.
+
+Le producteur convertit chaque StepEvent en enregistrement compact
+(op, compared, swapped, valeurs écrites, comparaisons, échanges, phase,
+profondeur, mémoire auxiliaire) et les publie par paquets dans un
+tampon circulaire borné : quand il est plein, le producteur attend
+(backpressure). Des deux côtés, le verrou n'est pris qu'une fois par paquet
+et le consommateur n'est réveillé que lorsqu'un paquet arrive dans un tampon
+vide. Le consommateur (le visualiseur) rejoue les événements sur sa
+propre copie de la liste, à son rythme, sans jamais lire la liste du thread.
+"""
+import threading
+
+from step_event import StepEvent, WRITE_OPS
+
+DEFAULT_CAPACITY = 65536 # Événements en attente au maximum
+DEFAULT_BATCH = 1024 # Événements retirés du tampon par prise de verrou
+PUBLISH_BATCH = 256 # Événements publiés par le producteur par prise de verrou
+
+
+class StepRingBuffer:
+    """Tampon circulaire borné, un producteur / un consommateur."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0 # Prochain élément à lire
+        self._count = 0
+        self._closed = False # Le producteur a terminé
+        self._cancelled = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """Ajoute un élément, en attendant s'il n'y a plus de place.
+
+        Retourne False si le tampon a été annulé (le producteur doit s'arrêter).
+        """
+        return self.put_batch((item,))
+
+    def put_batch(self, items):
+        """Ajoute les éléments de `items` dans l'ordre, en attendant la place nécessaire.
+
+        Le verrou est pris une fois par remplissage ; le consommateur n'est
+        réveillé que si le tampon était vide (il n'attend que dans ce cas).
+        Retourne False si le tampon a été annulé (le producteur doit s'arrêter).
+        """
+        start = 0
+        total = len(items)
+        while start < total:
+            with self._cond:
+                while self._count == self.capacity and not self._cancelled:
+                    self._cond.wait()
+                if self._cancelled:
+                    return False
+                was_empty = self._count == 0
+                n = min(total - start, self.capacity - self._count)
+                tail = self._head + self._count
+                for k in range(n):
+                    self._items[(tail + k) % self.capacity] = items[start + k]
+                self._count += n
+                start += n
+                if was_empty:
+                    self._cond.notify_all()
+        return True
+
+    def get_batch(self, max_items=DEFAULT_BATCH):
+        """Retire jusqu'à `max_items` éléments, en attendant qu'il y en ait au moins un.
+
+        Retourne une liste vide quand le producteur a terminé et que tout a été lu,
+        ou après une annulation.
+        """
+        with self._cond:
+            while self._count == 0 and not self._closed and not self._cancelled:
+                self._cond.wait()
+            if self._cancelled:
+                return []
+            n = min(max_items, self._count)
+            batch = []
+            for _ in range(n):
+                batch.append(self._items[self._head])
+                self._items[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._count -= n
+            self._cond.notify_all()
+            return batch
+
+    def available(self):
+        with self._cond:
+            return self._count
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Signale la fin de la production."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def cancel(self):
+        """Débloque et arrête producteur et consommateur."""
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+
+class SortWorker:
+    """Fait tourner `sort_function(data)` dans un thread démon qui alimente un StepRingBuffer."""
+
+    def __init__(self, sort_function, data, capacity=DEFAULT_CAPACITY):
+        self.buffer = StepRingBuffer(capacity)
+        self.error = None
+        self._batch_remaining = 0 # Événements retirés du tampon mais pas encore rejoués
+        self._thread = threading.Thread(target=self._produce, args=(sort_function, data), daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _produce(self, sort_function, data):
+        put_batch = self.buffer.put_batch
+        chunk = []
+        append = chunk.append
+        try:
+            for event in sort_function(data):
+                # Seules les écritures transportent des valeurs
+                swapped = event.swapped
+                values = tuple(event.arr[i] for i in swapped) if event.op in WRITE_OPS else None
+                append((event.op, event.compared, swapped, values, event.comparisons, event.swaps,
+                        event.phase, event.depth, event.aux))
+                if len(chunk) >= PUBLISH_BATCH:
+                    if not put_batch(chunk):
+                        return # Annulé
+                    chunk.clear()
+        except Exception as e:
+            self.error = e
+        finally:
+            if chunk:
+                put_batch(chunk) # Dernier paquet (et étapes précédant une erreur)
+            self.buffer.close()
+
+    def pending(self):
+        """Nombre d'étapes rejouables tout de suite sans bloquer."""
+        return self.buffer.available() + self._batch_remaining
+
+    def finished(self):
+        """Vrai quand le producteur a terminé : plus aucune attente possible."""
+        return self.buffer.closed
+
+    def steps(self, arr):
+        """Générateur consommateur : rejoue les événements sur `arr` (copie de l'entrée).
+
+        Produit un StepEvent réutilisé, comme les générateurs de sorting.py.
+        """
+        get_batch = self.buffer.get_batch
+        event = StepEvent(arr)
+        set_event = event.set
+        while True:
+            batch = get_batch()
+            if not batch:
+                break
+            self._batch_remaining = len(batch)
+            for op, compared, swapped, values, comparisons, swaps, phase, depth, aux in batch:
+                self._batch_remaining -= 1
+                if values is not None:
+                    for i, value in zip(swapped, values):
+                        arr[i] = value
+                event.phase = phase
+                event.depth = depth
+                event.aux = aux
+                yield set_event(op, compared, swapped, comparisons, swaps)
+        if self.error is not None:
+            raise self.error
+
+    def cancel(self, timeout=1.0):
+        """Arrête le producteur (ESC/R) et attend la fin du thread."""
+        self.buffer.cancel()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
@@ -1,44 +1,81 @@
 # sorting.py
-import random
 import time # Pour l'analyse de performance basique
+from array import array
+from collections import Counter
+from itertools import chain, repeat
+from input_generator import generate
+from metrics import DEFAULT_COUNTER_LABELS, InstrumentedArray, SortMetrics, print_metrics
+from step_event import StepEvent
 
-def _measure_time(func):
-    """Décorateur simple pour mesurer le temps d'exécution."""
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError: # NumPy absent : versions rapides en Python pur
+    np = None
+    HAS_NUMPY = False
+
+def _measure_time(func, labels=None, name=None, hooks=(print_metrics,)):
+    """Décorateur simple pour mesurer le temps d'exécution.
+
+    `func` est une version rapide (non tracée) qui retourne
+    (liste_triée, comparaisons, échanges) : on mesure le tri lui-même et non
+    le coût de construction des états intermédiaires du générateur.
+    `labels` nomme ces deux compteurs (voir COUNTER_LABELS). Les mesures
+    (metrics.SortMetrics) sont passées à chaque fonction de `hooks` ; par
+    défaut, elles sont affichées.
+    """
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
-        # Exécute le générateur jusqu'à la fin pour obtenir le résultat final et les stats
-        gen = func(*args, **kwargs)
-        final_state = None
-        comparisons = 0
-        swaps = 0
-        try:
-            while True:
-                state = next(gen)
-                # Dans une utilisation réelle pour la visu, on traiterait 'state' ici
-                # Pour la mesure de temps, on capture juste les dernières stats
-                final_state = state[0] # La liste triée
-                comparisons = state[3] if len(state) > 3 else comparisons
-                swaps = state[4] if len(state) > 4 else swaps
-        except StopIteration:
-            pass # Le générateur est épuisé
-
+        final_state, comparisons, swaps = func(*args, **kwargs)
         end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        print(f"Algorithme: {func.__name__}")
-        print(f"Temps d'exécution: {execution_time:.6f} secondes")
-        print(f"Comparaisons: {comparisons}")
-        print(f"Échanges: {swaps}")
+        metrics = SortMetrics(name or func.__name__, len(final_state), labels)
+        metrics.elapsed = end_time - start_time
+        metrics.comparisons = comparisons
+        metrics.swaps = swaps
+        for hook in hooks:
+            hook(metrics)
         # Retourne la liste triée pour la version CLI
         return final_state
     return wrapper
 
 # --- Implémentations des Générateurs de Tri ---
 
-# Chaque fonction doit yield au moins:
-# yield list_state, compared_indices, swapped_indices, comparison_count, swap_count
+# Chaque fonction crée un StepEvent (step_event.py) et le yield après l'avoir
+# mis à jour avec l'une de ses méthodes, au moins une fois en fin de tri :
+#     yield ev.compare(compared_indices, comparison_count, swap_count)
+#     yield ev.swap(swapped_indices, ...) / ev.write(written_indices, ...)
+#     yield ev.mark(highlighted_range, ...) / ev.done(...)
+# Le même objet sert à toutes les étapes : aucune allocation par yield.
+# Les indices sont soit un petit tuple (i, j), soit un `range(start, stop)` pour
+# surligner une plage : taille constante à produire et test `i in ...` en O(1),
+# au lieu d'un tuple(range(...)) alloué en O(n) à chaque étape.
+# Toute écriture dans la liste est signalée par swap ou write, avec les indices
+# écrits ; mark ne fait que surligner (le visualiseur s'appuie sur `op` pour ne
+# redessiner que les barres modifiées).
+# Les algorithmes en plusieurs temps déclarent leur phase avant d'en faire le
+# travail (ev.phase = 'partition'), et tiennent à jour ev.depth (récursion ou
+# pile explicite) et ev.aux (entrées auxiliaires vivantes) : metrics.py en
+# tire temps par phase, profondeur et mémoire auxiliaire maximales.
+#
+# Les algorithmes n'utilisent que len(), l'indexation et l'affectation d'un
+# élément : ils trient sur place aussi bien une list qu'un tampon typé
+# (array.array('d'), memoryview inscriptible, tableau NumPy), sans copie
+# préalable en liste. Seuls les tableaux auxiliaires du tri fusion passent par
+# _aux_copy, car la tranche d'un memoryview ou d'un tableau NumPy est une vue.
+
+
+def _aux_copy(arr, start, stop):
+    """Copie indépendante de arr[start:stop], du même type de tampon que arr."""
+    part = arr[start:stop]
+    if isinstance(part, (list, array, InstrumentedArray)): # Tranches déjà copiées
+        return part
+    if isinstance(part, memoryview):
+        return memoryview(bytearray(part)).cast(part.format)
+    return part.copy() # NumPy
 
 def selection_sort(arr):
     """Tri par sélection. Yield l'état après chaque swap."""
+    ev = StepEvent(arr)
     n = len(arr)
     comparisons = 0
     swaps = 0
@@ -46,20 +83,21 @@ def selection_sort(arr):
         min_idx = i
         for j in range(i + 1, n):
             comparisons += 1
-            yield arr, (i, j), (), comparisons, swaps # Comparaison
+            yield ev.compare((i, j), comparisons, swaps) # Comparaison
             if arr[j] < arr[min_idx]:
                 min_idx = j
         
         if min_idx != i:
             arr[i], arr[min_idx] = arr[min_idx], arr[i]
             swaps += 1
-            yield arr, (), (i, min_idx), comparisons, swaps # Swap
+            yield ev.swap((i, min_idx), comparisons, swaps) # Swap
         # Optionnel: yield après chaque passage externe pour marquer la partie triée
-        yield arr, (), (), comparisons, swaps 
-    yield arr, (), (), comparisons, swaps # État final
+        yield ev.mark((), comparisons, swaps)
+    yield ev.done(comparisons, swaps) # État final
 
 def bubble_sort(arr):
     """Tri à bulles. Yield l'état après chaque comparaison et swap."""
+    ev = StepEvent(arr)
     n = len(arr)
     comparisons = 0
     swaps = 0
@@ -67,18 +105,19 @@ def bubble_sort(arr):
         swapped_in_pass = False
         for j in range(0, n - i - 1):
             comparisons += 1
-            yield arr, (j, j + 1), (), comparisons, swaps # Comparaison
+            yield ev.compare((j, j + 1), comparisons, swaps) # Comparaison
             if arr[j] > arr[j + 1]:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
                 swaps += 1
                 swapped_in_pass = True
-                yield arr, (), (j, j + 1), comparisons, swaps # Swap
+                yield ev.swap((j, j + 1), comparisons, swaps) # Swap
         if not swapped_in_pass:
             break # Optimisation: si pas d'échange, la liste est triée
-    yield arr, (), (), comparisons, swaps # État final
+    yield ev.done(comparisons, swaps) # État final
 
 def insertion_sort(arr):
     """Tri par insertion. Yield l'état pendant le décalage et l'insertion."""
+    ev = StepEvent(arr)
     n = len(arr)
     comparisons = 0
     swaps = 0
@@ -87,133 +126,175 @@ def insertion_sort(arr):
         j = i - 1
         # Comparaison initiale avant la boucle while
         comparisons += 1 
-        yield arr, (i, j), (), comparisons, swaps # Comparaison initiale key vs arr[j]
+        yield ev.compare((i, j), comparisons, swaps) # Comparaison initiale key vs arr[j]
         
         while j >= 0 and key < arr[j]:
             comparisons += 1 # Compte la comparaison dans la condition while
             arr[j + 1] = arr[j] # Décalage (considéré comme un 'swap' conceptuel pour la visu)
             swaps += 1 
-            yield arr, (i, j), (j + 1, j), comparisons, swaps # Décalage
+            yield ev.write((j + 1,), comparisons, swaps, compared=(i, j)) # Décalage de arr[j] en j + 1
             j -= 1
             # Si j>=0, il y aura une autre comparaison dans le while suivant
             if j >= 0:
-                 yield arr, (i, j), (), comparisons, swaps # Comparaison pour le prochain tour de while
+                 yield ev.compare((i, j), comparisons, swaps) # Comparaison pour le prochain tour de while
 
         if arr[j + 1] != key: # Vérifie si un décalage a eu lieu
              arr[j + 1] = key
              # Pas un swap au sens strict, mais on peut le visualiser comme la fin du déplacement
-             yield arr, (), (j + 1, i), comparisons, swaps # Insertion finale
+             yield ev.write((j + 1,), comparisons, swaps, compared=(i,)) # Insertion finale
         
-    yield arr, (), (), comparisons, swaps # État final
+    yield ev.done(comparisons, swaps) # État final
 
 
 # --- Tri Fusion (Merge Sort) ---
-# Plus complexe à visualiser pas à pas avec yield de manière intuitive.
-# Une approche est de yield l'état après chaque fusion partielle.
+# Version ascendante (bottom-up) : on fusionne des blocs de largeur 1, 2, 4...
+# Pas de récursion ni de chaîne de `yield from`, donc reprendre le générateur
+# coûte O(1) par étape quelle que soit la taille de la liste.
 
 def merge_sort(arr):
-    """Tri fusion (récursif). Yield l'état après chaque fusion."""
+    """Tri fusion ascendant (itératif). Yield l'état après chaque écriture et chaque fusion."""
+    ev = StepEvent(arr)
+    n = len(arr)
     comparisons = 0
     swaps = 0 # Merge sort ne fait pas de 'swaps' directs, mais on compte les écritures dans le tableau auxiliaire
 
-    def merge(arr, left, mid, right):
-        nonlocal comparisons, swaps
-        n1 = mid - left + 1
-        n2 = right - mid
+    width = 1
+    while width < n:
+        for left in range(0, n - width, 2 * width):
+            mid = left + width - 1
+            right = min(left + 2 * width - 1, n - 1)
 
-        L = arr[left : mid + 1]
-        R = arr[mid + 1 : right + 1]
+            ev.phase = 'copie'
+            L = _aux_copy(arr, left, mid + 1)
+            R = _aux_copy(arr, mid + 1, right + 1)
+            n1 = len(L)
+            n2 = len(R)
+            i = j = 0
+            k = left
+            ev.aux = n1 + n2
+            yield ev.mark(range(left, right + 1), comparisons, swaps) # Blocs copiés dans L et R
+            ev.phase = 'fusion'
 
-        i = j = 0
-        k = left
+            while i < n1 and j < n2:
+                comparisons += 1
+                yield ev.compare((left + i, mid + 1 + j), comparisons, swaps) # Comparaison entre L[i] et R[j]
+                if L[i] <= R[j]:
+                    arr[k] = L[i]
+                    i += 1
+                else:
+                    arr[k] = R[j]
+                    j += 1
+                swaps += 1 # Compte chaque écriture dans arr
+                yield ev.write((k,), comparisons, swaps) # Placement dans arr[k]
+                k += 1
 
-        while i < n1 and j < n2:
-            comparisons += 1
-            yield arr, (left + i, mid + 1 + j), (), comparisons, swaps # Comparaison entre L[i] et R[j]
-            if L[i] <= R[j]:
+            while i < n1:
                 arr[k] = L[i]
+                swaps += 1
+                yield ev.write((k,), comparisons, swaps) # Placement résiduel L
                 i += 1
-            else:
+                k += 1
+
+            while j < n2:
                 arr[k] = R[j]
+                swaps += 1
+                yield ev.write((k,), comparisons, swaps) # Placement résiduel R
                 j += 1
-            swaps += 1 # Compte chaque écriture dans arr
-            yield arr, (), (k,), comparisons, swaps # Placement dans arr[k]
-            k += 1
-
-        while i < n1:
-            arr[k] = L[i]
-            swaps += 1
-            yield arr, (), (k,), comparisons, swaps # Placement résiduel L
-            i += 1
-            k += 1
-
-        while j < n2:
-            arr[k] = R[j]
-            swaps += 1
-            yield arr, (), (k,), comparisons, swaps # Placement résiduel R
-            j += 1
-            k += 1
+                k += 1
 
-    def merge_sort_recursive(arr, left, right):
-        if left < right:
-            mid = left + (right - left) // 2
-            yield from merge_sort_recursive(arr, left, mid)
-            yield from merge_sort_recursive(arr, mid + 1, right)
-            yield from merge(arr, left, mid, right)
-            # Yield un état stable après la fusion complète de ce niveau
-            yield arr, (), tuple(range(left, right + 1)), comparisons, swaps
+            # Yield un état stable après la fusion complète de ce bloc
+            ev.aux = 0 # L et R ne servent plus
+            yield ev.mark(range(left, right + 1), comparisons, swaps)
+        width *= 2
 
-    yield from merge_sort_recursive(arr, 0, len(arr) - 1)
-    yield arr, (), (), comparisons, swaps # État final
+    yield ev.done(comparisons, swaps) # État final
 
 # --- Tri Rapide (Quick Sort) ---
-# Similaire à Merge Sort pour la complexité de visualisation.
-# Yield avant/après partitionnement et pendant les swaps.
+# Itératif avec pile explicite : pivot médiane-de-trois (listes triées ou
+# inversées ne dégénèrent plus) et plus petite partition traitée d'abord, la
+# plus grande étant empilée. La pile reste en O(log n). Partition de Hoare,
+# comme intro_sort : les deux curseurs s'arrêtent sur les valeurs égales au
+# pivot, si bien que les doublons (few_unique, zipf, liste constante) sont
+# répartis des deux côtés au lieu de rendre le tri quadratique.
+
+def _median_of_three(arr, low, mid, high):
+    """Retourne (indice de la médiane de arr[low], arr[mid], arr[high], comparaisons utilisées)."""
+    a, b, c = arr[low], arr[mid], arr[high]
+    if a < b:
+        if b < c:
+            return mid, 2
+        return (high, 3) if a < c else (low, 3)
+    if a < c:
+        return low, 2
+    return (high, 3) if b < c else (mid, 3)
 
 def quick_sort(arr):
-    """Tri rapide (récursif). Yield pendant les swaps et après partition."""
+    """Tri rapide (itératif). Yield pendant les swaps et après partition."""
+    ev = StepEvent(arr)
     comparisons = 0
     swaps = 0
+    stack = [(0, len(arr) - 1)]
 
-    def partition(arr, low, high):
-        nonlocal comparisons, swaps
-        pivot = arr[high]
-        i = low - 1
-        yield arr, (high,), tuple(range(low, high)), comparisons, swaps # Highlight pivot and range being partitioned
+    while stack:
+        low, high = stack.pop()
+        ev.depth = len(stack)
+        while low < high:
+            # Choix du pivot : médiane de trois
+            ev.phase = 'pivot'
+            mid = (low + high) // 2
+            median, used = _median_of_three(arr, low, mid, high)
+            comparisons += used
+            yield ev.compare((low, mid, high), comparisons, swaps) # Choix du pivot
+            pivot = arr[median]
 
-        for j in range(low, high):
-            comparisons += 1
-            yield arr, (j, high), (), comparisons, swaps # Compare arr[j] with pivot
-            if arr[j] < pivot:
-                i += 1
+            # Partition de Hoare : arr[low..j] <= pivot <= arr[j+1..high]
+            ev.phase = 'partition'
+            yield ev.mark(range(low, high + 1), comparisons, swaps, compared=(median,)) # Plage à partitionner
+            i, j = low, high
+            while True:
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps) # arr[i] comparé au pivot
+                    if not arr[i] < pivot:
+                        break
+                    i += 1
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps) # arr[j] comparé au pivot
+                    if not pivot < arr[j]:
+                        break
+                    j -= 1
+                if i >= j:
+                    break
                 arr[i], arr[j] = arr[j], arr[i]
                 swaps += 1
-                yield arr, (), (i, j), comparisons, swaps # Swap elements
-
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        swaps += 1
-        yield arr, (), (i + 1, high), comparisons, swaps # Swap pivot into place
-        return i + 1
+                yield ev.swap((i, j), comparisons, swaps) # Swap elements
+                i += 1
+                j -= 1
+            yield ev.mark(range(low, high + 1), comparisons, swaps) # Show result of partition
 
-    def quick_sort_recursive(arr, low, high):
-        if low < high:
-            pi = yield from partition(arr, low, high)
-            yield arr, (), tuple(range(low, high+1)), comparisons, swaps # Show result of partition
-            yield from quick_sort_recursive(arr, low, pi - 1)
-            yield from quick_sort_recursive(arr, pi + 1, high)
+            # Plus petite partition d'abord, la plus grande attend sur la pile
+            if j - low < high - j - 1:
+                stack.append((j + 1, high))
+                high = j
+            else:
+                stack.append((low, j))
+                low = j + 1
+            ev.depth = len(stack)
 
-    yield from quick_sort_recursive(arr, 0, len(arr) - 1)
-    yield arr, (), (), comparisons, swaps # Final state
+    yield ev.done(comparisons, swaps) # Final state
 
 # --- Tri par Tas (Heap Sort) ---
 def heap_sort(arr):
     """Tri par tas. Yield pendant le heapify et l'extraction."""
+    ev = StepEvent(arr)
     n = len(arr)
     comparisons = 0
     swaps = 0
 
-    def heapify(arr, n, i):
+    def heapify(arr, n, i, depth=1):
         nonlocal comparisons, swaps
+        ev.depth = depth # Niveau de récursion
         largest = i
         left = 2 * i + 1
         right = 2 * i + 2
@@ -221,42 +302,46 @@ def heap_sort(arr):
         # Compare parent with left child
         if left < n:
             comparisons += 1
-            yield arr, (i, left), (), comparisons, swaps
+            yield ev.compare((i, left), comparisons, swaps)
             if arr[left] > arr[largest]:
                 largest = left
         
         # Compare current largest with right child
         if right < n:
             comparisons += 1
-            yield arr, (largest, right), (), comparisons, swaps
+            yield ev.compare((largest, right), comparisons, swaps)
             if arr[right] > arr[largest]:
                 largest = right
 
         if largest != i:
             arr[i], arr[largest] = arr[largest], arr[i]
             swaps += 1
-            yield arr, (), (i, largest), comparisons, swaps # Swap happened
-            yield from heapify(arr, n, largest) # Recursively heapify the affected sub-tree
+            yield ev.swap((i, largest), comparisons, swaps) # Swap happened
+            yield from heapify(arr, n, largest, depth + 1) # Recursively heapify the affected sub-tree
+        ev.depth = depth - 1
 
     # Construire le tas max (Build max heap)
+    ev.phase = 'construction du tas'
     for i in range(n // 2 - 1, -1, -1):
         yield from heapify(arr, n, i)
-        yield arr, (), tuple(range(n)), comparisons, swaps # Show state after heapifying node i
+        yield ev.mark(range(n), comparisons, swaps) # Show state after heapifying node i
 
     # Extraire les éléments un par un (Extract elements one by one)
+    ev.phase = 'extraction'
     for i in range(n - 1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i] # Mettre le max à la fin
         swaps += 1
-        yield arr, (), (0, i), comparisons, swaps # Swap root with last element
+        yield ev.swap((0, i), comparisons, swaps) # Swap root with last element
         yield from heapify(arr, i, 0) # Heapify la racine du tas réduit
-        yield arr, (), tuple(range(i)), comparisons, swaps # Show state after heapify root on reduced heap
+        yield ev.mark(range(i), comparisons, swaps) # Show state after heapify root on reduced heap
 
-    yield arr, (), (), comparisons, swaps # Final state
+    yield ev.done(comparisons, swaps) # Final state
 
 
 # --- Tri à Peigne (Comb Sort) ---
 def comb_sort(arr):
     """Tri à peigne. Yield pendant les comparaisons et swaps."""
+    ev = StepEvent(arr)
     n = len(arr)
     gap = n
     shrink = 1.3
@@ -273,15 +358,1404 @@ def comb_sort(arr):
         i = 0
         while i + gap < n:
             comparisons += 1
-            yield arr, (i, i + gap), (), comparisons, swaps # Comparaison
+            yield ev.compare((i, i + gap), comparisons, swaps) # Comparaison
             if arr[i] > arr[i + gap]:
                 arr[i], arr[i + gap] = arr[i + gap], arr[i]
                 swaps += 1
                 sorted_flag = False # Un échange a eu lieu, donc pas encore trié
-                yield arr, (), (i, i + gap), comparisons, swaps # Swap
+                yield ev.swap((i, i + gap), comparisons, swaps) # Swap
             i += 1
             
-    yield arr, (), (), comparisons, swaps # Final state
+    yield ev.done(comparisons, swaps) # Final state
+
+
+# --- Tri Introspectif (Introsort) ---
+# Tri rapide itératif (pivot médiane de trois, partition de Hoare) qui passe au
+# tri par tas quand la profondeur dépasse 2 log2(n), et au tri par insertion
+# pour les partitions d'au plus INTRO_INSERTION_CUTOFF éléments : O(n log n)
+# dans le pire cas. Les deux curseurs de Hoare s'arrêtent sur les valeurs
+# égales au pivot, ce qui répartit les doublons des deux côtés : une liste de
+# valeurs toutes égales reste en O(n log n) (même partition que quick_sort).
+
+INTRO_INSERTION_CUTOFF = 16
+
+def _intro_depth_limit(n):
+    """Profondeur de partition maximale avant le passage au tri par tas : 2 * floor(log2 n)."""
+    return 2 * max(1, n.bit_length() - 1)
+
+def intro_sort(arr):
+    """Tri introspectif (itératif). Yield pendant les partitions, le tas et les insertions."""
+    ev = StepEvent(arr)
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+
+    def insertion(low, high):
+        """Tri par insertion de arr[low..high] (petites partitions)."""
+        nonlocal comparisons, swaps
+        ev.phase = 'insertion'
+        for i in range(low + 1, high + 1):
+            key = arr[i]
+            j = i - 1
+            while j >= low:
+                comparisons += 1
+                yield ev.compare((i, j), comparisons, swaps) # key comparée à arr[j]
+                if not key < arr[j]:
+                    break
+                arr[j + 1] = arr[j]
+                swaps += 1
+                yield ev.write((j + 1,), comparisons, swaps) # Décalage
+                j -= 1
+            if j + 1 != i:
+                arr[j + 1] = key
+                swaps += 1
+                yield ev.write((j + 1,), comparisons, swaps) # Insertion
+        yield ev.mark(range(low, high + 1), comparisons, swaps)
+
+    def sift_down(low, root, size):
+        """Tamisage dans le tas max arr[low:low + size] (indices relatifs à low)."""
+        nonlocal comparisons, swaps
+        while True:
+            largest = root
+            left = 2 * root + 1
+            right = left + 1
+            if left < size:
+                comparisons += 1
+                yield ev.compare((low + root, low + left), comparisons, swaps)
+                if arr[low + left] > arr[low + largest]:
+                    largest = left
+            if right < size:
+                comparisons += 1
+                yield ev.compare((low + largest, low + right), comparisons, swaps)
+                if arr[low + right] > arr[low + largest]:
+                    largest = right
+            if largest == root:
+                return
+            arr[low + root], arr[low + largest] = arr[low + largest], arr[low + root]
+            swaps += 1
+            yield ev.swap((low + root, low + largest), comparisons, swaps)
+            root = largest
+
+    def heap(low, high):
+        """Tri par tas de arr[low..high] (partition trop profonde)."""
+        nonlocal swaps
+        ev.phase = 'tri par tas'
+        size = high - low + 1
+        for root in range(size // 2 - 1, -1, -1):
+            yield from sift_down(low, root, size)
+        for end in range(size - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            swaps += 1
+            yield ev.swap((low, low + end), comparisons, swaps) # Maximum placé en fin de partition
+            yield from sift_down(low, 0, end)
+        yield ev.mark(range(low, high + 1), comparisons, swaps)
+
+    stack = [(0, n - 1, _intro_depth_limit(n))]
+    while stack:
+        low, high, depth = stack.pop()
+        ev.depth = len(stack)
+        while low < high:
+            if high - low < INTRO_INSERTION_CUTOFF:
+                yield from insertion(low, high)
+                break
+            if depth == 0:
+                yield from heap(low, high)
+                break
+            depth -= 1
+
+            ev.phase = 'pivot'
+            mid = (low + high) // 2
+            median, used = _median_of_three(arr, low, mid, high)
+            comparisons += used
+            yield ev.compare((low, mid, high), comparisons, swaps) # Choix du pivot
+            pivot = arr[median]
+
+            # Partition de Hoare : arr[low..j] <= pivot <= arr[j+1..high]
+            ev.phase = 'partition'
+            i, j = low, high
+            while True:
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps) # arr[i] comparé au pivot
+                    if not arr[i] < pivot:
+                        break
+                    i += 1
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps) # arr[j] comparé au pivot
+                    if not pivot < arr[j]:
+                        break
+                    j -= 1
+                if i >= j:
+                    break
+                arr[i], arr[j] = arr[j], arr[i]
+                swaps += 1
+                yield ev.swap((i, j), comparisons, swaps) # Swap
+                i += 1
+                j -= 1
+            yield ev.mark(range(low, high + 1), comparisons, swaps) # Résultat de la partition
+
+            # Plus petite partition d'abord, la plus grande attend sur la pile
+            if j - low < high - j - 1:
+                stack.append((j + 1, high, depth))
+                high = j
+            else:
+                stack.append((low, j, depth))
+                low = j + 1
+            ev.depth = len(stack)
+
+    yield ev.done(comparisons, swaps) # État final
+
+
+# --- Tri par Suites Naturelles (Timsort) ---
+# La liste est découpée en suites déjà croissantes (ou strictement
+# décroissantes, alors retournées), prolongées par insertion binaire jusqu'à
+# une longueur minimale entre 32 et 64. Les suites sont empilées et fusionnées
+# en gardant des longueurs équilibrées. Chaque fusion saute d'abord, par
+# recherche exponentielle (galop), le début de la suite gauche et la fin de la
+# suite droite déjà en place, puis passe en mode galop dès qu'une des suites
+# gagne TIM_MIN_GALLOP fois de suite. Sur une liste triée ou faite de longues
+# suites, le tri ne fait qu'O(n) comparaisons. Il est stable : à égalité,
+# l'élément de la suite gauche passe d'abord (doublons compris).
+
+TIM_MIN_GALLOP = 7
+
+def _tim_min_run(n):
+    """Longueur minimale d'une suite : n si n < 64, sinon entre 32 et 64."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _gallop(key, seq, lo, hi, right):
+    """Premier indice k de [lo, hi) tel que key < seq[k] (right) ou key <= seq[k] (sinon).
+
+    Recherche exponentielle depuis lo puis dichotomie : O(log d) comparaisons
+    pour une réponse à distance d. Retourne (k, comparaisons).
+    """
+    comparisons = 0
+    last = lo # seq[lo:last] précède key
+    bound = hi
+    probe = lo
+    step = 1
+    while probe < hi:
+        comparisons += 1
+        if (key < seq[probe]) if right else not (seq[probe] < key):
+            bound = probe
+            break
+        last = probe + 1
+        step *= 2
+        probe = lo + step - 1
+    while last < bound:
+        mid = (last + bound) // 2
+        comparisons += 1
+        if (key < seq[mid]) if right else not (seq[mid] < key):
+            bound = mid
+        else:
+            last = mid + 1
+    return last, comparisons
+
+def tim_sort(arr):
+    """Tri par suites naturelles (Timsort). Yield pendant la détection des suites et les fusions."""
+    ev = StepEvent(arr)
+    n = len(arr)
+    comparisons = 0
+    swaps = 0 # Écritures dans arr, comme pour le tri fusion
+    min_gallop = TIM_MIN_GALLOP
+    runs = [] # Pile des suites [début, longueur]
+
+    def merge_at(r):
+        """Fusionne les suites r et r + 1 de la pile."""
+        nonlocal comparisons, swaps, min_gallop
+        ev.phase = 'fusion'
+        lo, len_a = runs[r]
+        mid, len_b = runs[r + 1]
+        hi = mid + len_b
+        runs[r] = [lo, len_a + len_b]
+        del runs[r + 1]
+        ev.depth = len(runs)
+
+        # Début de A (<= B[0]) et fin de B (>= A[-1]) déjà à leur place
+        start = lo
+        lo, used = _gallop(arr[mid], arr, lo, mid, True)
+        comparisons += used
+        yield ev.mark(range(start, lo), comparisons, swaps, compared=(mid,)) # Début de A déjà en place
+        if lo == mid:
+            return
+        end = hi
+        hi, used = _gallop(arr[mid - 1], arr, mid, hi, False)
+        comparisons += used
+        yield ev.mark(range(hi, end), comparisons, swaps, compared=(mid - 1,)) # Fin de B déjà en place
+
+        A = _aux_copy(arr, lo, mid)
+        len_a = len(A)
+        ev.aux = len_a
+        i, j, k = 0, mid, lo
+        wins_a = wins_b = 0
+        while i < len_a and j < hi:
+            comparisons += 1
+            yield ev.compare((k, j), comparisons, swaps) # A[i] (copie) comparé à arr[j]
+            if arr[j] < A[i]:
+                arr[k] = arr[j]
+                j += 1
+                wins_b += 1
+                wins_a = 0
+            else:
+                arr[k] = A[i]
+                i += 1
+                wins_a += 1
+                wins_b = 0
+            swaps += 1
+            yield ev.write((k,), comparisons, swaps) # Placement dans arr[k]
+            k += 1
+
+            if wins_a >= min_gallop or wins_b >= min_gallop:
+                # Galop : copie par blocs tant qu'une suite gagne largement
+                while i < len_a and j < hi:
+                    e, used = _gallop(arr[j], A, i, len_a, True)
+                    comparisons += used
+                    count_a = e - i
+                    yield ev.compare((j,), comparisons, swaps) # arr[j] situé dans A par galop
+                    for t in range(i, e):
+                        arr[k] = A[t]
+                        swaps += 1
+                        yield ev.write((k,), comparisons, swaps)
+                        k += 1
+                    i = e
+                    if i >= len_a:
+                        break
+                    e, used = _gallop(A[i], arr, j, hi, False)
+                    comparisons += used
+                    count_b = e - j
+                    yield ev.compare(range(j, e), comparisons, swaps) # Bloc de B situé par galop
+                    for t in range(j, e):
+                        arr[k] = arr[t]
+                        swaps += 1
+                        yield ev.write((k,), comparisons, swaps)
+                        k += 1
+                    j = e
+                    if count_a < TIM_MIN_GALLOP and count_b < TIM_MIN_GALLOP:
+                        min_gallop += 1 # Le galop ne paie plus : plus difficile d'y revenir
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+                wins_a = wins_b = 0
+
+        # Reste de A ; le reste de B est déjà en place
+        for t in range(i, len_a):
+            arr[k] = A[t]
+            swaps += 1
+            yield ev.write((k,), comparisons, swaps)
+            k += 1
+        ev.aux = 0 # Copie de A libérée
+        yield ev.mark(range(lo, hi), comparisons, swaps) # Fusion terminée
+
+    def merge_collapse():
+        """Fusionne jusqu'à ce que les longueurs de la pile décroissent assez vite."""
+        while len(runs) > 1:
+            r = len(runs) - 2
+            if ((r > 0 and runs[r - 1][1] <= runs[r][1] + runs[r + 1][1])
+                    or (r > 1 and runs[r - 2][1] <= runs[r - 1][1] + runs[r][1])):
+                if runs[r - 1][1] < runs[r + 1][1]:
+                    r -= 1
+            elif runs[r][1] > runs[r + 1][1]:
+                break
+            yield from merge_at(r)
+
+    min_run = _tim_min_run(n)
+    lo = 0
+    while lo < n:
+        # Suite naturelle commençant en lo
+        ev.phase = 'suites'
+        run_end = lo + 1
+        if run_end < n:
+            comparisons += 1
+            yield ev.compare((lo, run_end), comparisons, swaps)
+            if arr[run_end] < arr[lo]: # Strictement décroissante : retournée (reste stable)
+                run_end += 1
+                while run_end < n:
+                    comparisons += 1
+                    yield ev.compare((run_end - 1, run_end), comparisons, swaps)
+                    if not arr[run_end] < arr[run_end - 1]:
+                        break
+                    run_end += 1
+                a, b = lo, run_end - 1
+                while a < b:
+                    arr[a], arr[b] = arr[b], arr[a]
+                    swaps += 1
+                    yield ev.swap((a, b), comparisons, swaps)
+                    a += 1
+                    b -= 1
+            else:
+                run_end += 1
+                while run_end < n:
+                    comparisons += 1
+                    yield ev.compare((run_end - 1, run_end), comparisons, swaps)
+                    if arr[run_end] < arr[run_end - 1]:
+                        break
+                    run_end += 1
+
+        # Suite trop courte : prolongée par insertion binaire
+        force = min(n, lo + min_run)
+        for i in range(run_end, force):
+            key = arr[i]
+            left, right = lo, i
+            while left < right:
+                m = (left + right) // 2
+                comparisons += 1
+                yield ev.compare((m, i), comparisons, swaps) # Recherche dichotomique de la place de key
+                if key < arr[m]:
+                    right = m
+                else:
+                    left = m + 1
+            for t in range(i, left, -1):
+                arr[t] = arr[t - 1]
+                swaps += 1
+                yield ev.write((t,), comparisons, swaps) # Décalage
+            if left != i:
+                arr[left] = key
+                swaps += 1
+                yield ev.write((left,), comparisons, swaps) # Insertion
+        run_end = max(run_end, force)
+
+        runs.append([lo, run_end - lo])
+        ev.depth = len(runs)
+        yield ev.mark(range(lo, run_end), comparisons, swaps) # Nouvelle suite
+        yield from merge_collapse()
+        lo = run_end
+
+    # Fusion des suites restantes, de la fin vers le début
+    while len(runs) > 1:
+        r = len(runs) - 2
+        if r > 0 and runs[r - 1][1] < runs[r + 1][1]:
+            r -= 1
+        yield from merge_at(r)
+
+    yield ev.done(comparisons, swaps) # État final
+
+
+# --- Tris par distribution (Radix, Bucket, Counting) ---
+# Ils ne comparent pas les éléments deux à deux : les compteurs du protocole
+# (4e et 5e champs) sont les passes et les écritures au lieu des comparaisons
+# et des échanges (voir COUNTER_LABELS). Une passe est un parcours complet
+# qui déplace les éléments. Chaque passe disperse une copie de la liste dans
+# `arr` : chaque écriture est signalée comme les autres algorithmes.
+#
+# Les clés de tri sont les bits IEEE-754 des valeurs converties en double :
+# bit de signe inversé pour les positifs, tous les bits inversés pour les
+# négatifs, l'ordre des entiers obtenus est celui des nombres. Les entiers
+# au-delà de 2**53 perdent donc leur ordre exact.
+
+RADIX_BITS = 8 # Bits par chiffre du tri par base : 256 seaux, 8 passes au plus
+_RADIX_MASK = (1 << RADIX_BITS) - 1
+_KEY_BITS = 64
+_SIGN_BIT = 1 << (_KEY_BITS - 1)
+_ALL_BITS = (1 << _KEY_BITS) - 1
+
+def _float_keys(values):
+    """Clés entières non signées de 64 bits, dans le même ordre que les valeurs."""
+    raw = array('Q')
+    raw.frombytes(array('d', values).tobytes())
+    return [key ^ _ALL_BITS if key & _SIGN_BIT else key | _SIGN_BIT for key in raw]
+
+def _digit_is_constant(keys, shift):
+    """Vrai si toutes les clés ont le même chiffre au rang `shift` : la passe est inutile."""
+    if not keys:
+        return True
+    digit = (keys[0] >> shift) & _RADIX_MASK
+    return all((key >> shift) & _RADIX_MASK == digit for key in keys)
+
+def _radix_order(keys):
+    """Indices des clés entières de 64 bits dans l'ordre croissant (base LSD, stable).
+
+    Retourne la liste d'indices ; les chiffres communs à toutes les clés sont
+    sautés, comme dans radix_sort.
+    """
+    n = len(keys)
+    order = list(range(n))
+    for shift in range(0, _KEY_BITS, RADIX_BITS):
+        if _digit_is_constant(keys, shift):
+            continue
+        buckets = [[] for _ in range(_RADIX_MASK + 1)]
+        for i in order:
+            buckets[(keys[i] >> shift) & _RADIX_MASK].append(i)
+        order = list(chain.from_iterable(buckets))
+    return order
+def radix_sort(arr):
+    """Tri par base LSD sur les bits IEEE-754. Yield après chaque écriture et chaque passe."""
+    ev = StepEvent(arr)
+    n = len(arr)
+    passes = 0
+    writes = 0
+    keys = _float_keys(arr)
+    ev.aux = n
+
+    for shift in range(0, _KEY_BITS, RADIX_BITS):
+        ev.phase = 'comptage'
+        if _digit_is_constant(keys, shift):
+            continue # Chiffre commun à toutes les clés (ex. exposant) : rien à déplacer
+        counts = [0] * (_RADIX_MASK + 1)
+        for key in keys:
+            counts[(key >> shift) & _RADIX_MASK] += 1
+        starts = []
+        position = 0
+        for count in counts:
+            starts.append(position)
+            position += count
+
+        src = _aux_copy(arr, 0, n)
+        src_keys = keys
+        keys = [0] * n
+        ev.aux = 3 * n + len(counts) + len(starts) # Copie, anciennes et nouvelles clés, compteurs
+        passes += 1
+        yield ev.mark(range(n), passes, writes) # Début de la passe
+        ev.phase = 'dispersion'
+        for i in range(n):
+            key = src_keys[i]
+            digit = (key >> shift) & _RADIX_MASK
+            k = starts[digit]
+            starts[digit] = k + 1
+            arr[k] = src[i]
+            keys[k] = key
+            writes += 1
+            yield ev.write((k,), passes, writes) # Dispersion dans le seau du chiffre
+
+    yield ev.done(passes, writes) # État final
+
+def bucket_sort(arr):
+    """Tri par seaux (un seau par élément entre le min et le max), puis insertion.
+
+    Yield après chaque écriture et au début de chaque passe.
+    """
+    ev = StepEvent(arr)
+    n = len(arr)
+    passes = 0
+    writes = 0
+    ev.phase = 'dispersion'
+    lo = min(arr) if n else 0
+    hi = max(arr) if n else 0
+
+    if lo < hi:
+        # Indice de seau croissant avec la valeur : seul l'intérieur des seaux reste à trier
+        scale = (n - 1) / (hi - lo)
+        src = _aux_copy(arr, 0, n)
+        buckets = [int((x - lo) * scale) for x in src]
+        counts = [0] * n
+        for b in buckets:
+            counts[b] += 1
+        starts = []
+        position = 0
+        for count in counts:
+            starts.append(position)
+            position += count
+        ev.aux = 4 * n # Copie, seau de chaque élément, compteurs et débuts des seaux
+
+        passes += 1
+        yield ev.mark(range(n), passes, writes) # Dispersion
+        for i in range(n):
+            b = buckets[i]
+            k = starts[b]
+            starts[b] = k + 1
+            arr[k] = src[i]
+            writes += 1
+            yield ev.write((k,), passes, writes)
+
+        ev.phase = 'insertion'
+        passes += 1
+        yield ev.mark(range(n), passes, writes) # Insertion dans chaque seau
+        for i in range(1, n):
+            key = arr[i]
+            j = i - 1
+            if not key < arr[j]:
+                continue
+            while j >= 0 and key < arr[j]:
+                arr[j + 1] = arr[j]
+                writes += 1
+                yield ev.write((j + 1,), passes, writes) # Décalage
+                j -= 1
+            arr[j + 1] = key
+            writes += 1
+            yield ev.write((j + 1,), passes, writes) # Insertion
+
+    yield ev.done(passes, writes) # État final
+
+def counting_sort(arr):
+    """Tri par comptage des valeurs distinctes. Yield après chaque écriture.
+
+    Les valeurs distinctes sont ordonnées par base (_radix_order) : O(n + k)
+    pour k valeurs distinctes, sans comparaison. Une seule passe réécrit la liste.
+    """
+    ev = StepEvent(arr)
+    n = len(arr)
+    passes = 0
+    writes = 0
+    ev.phase = 'comptage'
+    counts = {}
+    for x in arr:
+        counts[x] = counts.get(x, 0) + 1
+    distinct = list(counts)
+    ev.aux = 2 * len(distinct) # Table des effectifs et valeurs distinctes
+
+    if n:
+        passes += 1
+        yield ev.mark(range(n), passes, writes) # Réécriture
+        ev.phase = 'réécriture'
+        ev.aux = 4 * len(distinct) # ... et leurs clés et leur ordre
+        k = 0
+        for i in _radix_order(_float_keys(distinct)):
+            value = distinct[i]
+            for _ in range(counts[value]):
+                arr[k] = value
+                writes += 1
+                yield ev.write((k,), passes, writes)
+                k += 1
+
+    yield ev.done(passes, writes) # État final
+
+
+# --- Sélection : k-ième élément et k plus petits ---
+# Quand seuls les k plus petits éléments ou la médiane sont utiles, trier
+# toute la liste est du travail perdu :
+#   nth_element   place en arr[k] l'élément de rang k (0 = minimum), les plus
+#                 petits avant lui, les plus grands après (introselect :
+#                 partitions de Hoare, puis tri partiel par tas si elles
+#                 dégénèrent). O(n) en moyenne, O(n log n) au pire.
+#   partial_sort  place les k plus petits éléments, triés, en arr[:k] (tas max
+#                 des k premiers, puis chaque élément suivant remplace la
+#                 racine s'il est plus petit). O(n log k).
+# Ils suivent le protocole des générateurs de tri ; streaming_top_k (plus
+# bas) fait le même travail que partial_sort sur un itérateur, en O(k) mémoire.
+
+def _check_rank(n, k):
+    if not 0 <= k < n:
+        raise ValueError(f"rang {k} hors de la liste (0 à {n - 1})")
+
+def _check_count(n, k):
+    if not 1 <= k <= n:
+        raise ValueError(f"k doit être entre 1 et n (k = {k}, n = {n})")
+
+def _partial_sort_steps(ev, low, high, count, comparisons, swaps):
+    """Place les `count` plus petits éléments de ev.arr[low..high], triés, en tête de la plage.
+
+    Yield l'événement `ev` de l'appelant comme les tris, avec des compteurs
+    partant de `comparisons` et `swaps` ; retourne (comparisons, swaps).
+    """
+    arr = ev.arr
+    def sift_down(root, size):
+        nonlocal comparisons, swaps
+        while True:
+            largest = root
+            left = 2 * root + 1
+            right = left + 1
+            if left < size:
+                comparisons += 1
+                yield ev.compare((low + root, low + left), comparisons, swaps)
+                if arr[low + left] > arr[low + largest]:
+                    largest = left
+            if right < size:
+                comparisons += 1
+                yield ev.compare((low + largest, low + right), comparisons, swaps)
+                if arr[low + right] > arr[low + largest]:
+                    largest = right
+            if largest == root:
+                return
+            arr[low + root], arr[low + largest] = arr[low + largest], arr[low + root]
+            swaps += 1
+            yield ev.swap((low + root, low + largest), comparisons, swaps)
+            root = largest
+
+    ev.phase = 'construction du tas'
+    for root in range(count // 2 - 1, -1, -1):
+        yield from sift_down(root, count)
+    yield ev.mark(range(low, low + count), comparisons, swaps) # Tas des `count` premiers
+
+    ev.phase = 'sélection'
+    for i in range(low + count, high + 1):
+        comparisons += 1
+        yield ev.compare((low, i), comparisons, swaps) # Élément comparé au maximum du tas
+        if arr[i] < arr[low]:
+            arr[low], arr[i] = arr[i], arr[low]
+            swaps += 1
+            yield ev.swap((low, i), comparisons, swaps) # Il remplace la racine
+            yield from sift_down(0, count)
+
+    ev.phase = 'extraction'
+    for end in range(count - 1, 0, -1):
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        swaps += 1
+        yield ev.swap((low, low + end), comparisons, swaps)
+        yield from sift_down(0, end)
+    yield ev.mark(range(low, low + count), comparisons, swaps) # k plus petits, triés
+    return comparisons, swaps
+
+def partial_sort(arr, k=None):
+    """Tri partiel par tas : les k plus petits (défaut : 10 % de la liste) triés en arr[:k]."""
+    ev = StepEvent(arr)
+    n = len(arr)
+    k = max(1, n // 10) if k is None else k
+    if n:
+        _check_count(n, k)
+        comparisons, swaps = yield from _partial_sort_steps(ev, 0, n - 1, k, 0, 0)
+    else:
+        comparisons = swaps = 0
+    yield ev.done(comparisons, swaps) # État final
+
+def nth_element(arr, k=None):
+    """Introselect : l'élément de rang k (défaut : médiane inférieure) en arr[k].
+
+    Yield pendant les partitions et le tri partiel final.
+    """
+    ev = StepEvent(arr)
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    if n:
+        k = (n - 1) // 2 if k is None else k
+        _check_rank(n, k)
+        low, high = 0, n - 1
+        depth = _intro_depth_limit(n)
+        while high - low >= INTRO_INSERTION_CUTOFF and depth > 0:
+            depth -= 1
+            ev.phase = 'pivot'
+            mid = (low + high) // 2
+            median, used = _median_of_three(arr, low, mid, high)
+            comparisons += used
+            yield ev.compare((low, mid, high), comparisons, swaps) # Choix du pivot
+            pivot = arr[median]
+
+            # Partition de Hoare (comme intro_sort) : arr[low..j] <= pivot <= arr[j+1..high]
+            ev.phase = 'partition'
+            i, j = low, high
+            while True:
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps)
+                    if not arr[i] < pivot:
+                        break
+                    i += 1
+                while True:
+                    comparisons += 1
+                    yield ev.compare((i, j), comparisons, swaps)
+                    if not pivot < arr[j]:
+                        break
+                    j -= 1
+                if i >= j:
+                    break
+                arr[i], arr[j] = arr[j], arr[i]
+                swaps += 1
+                yield ev.swap((i, j), comparisons, swaps)
+                i += 1
+                j -= 1
+            yield ev.mark(range(low, high + 1), comparisons, swaps) # Résultat de la partition
+
+            # Seule la partition contenant le rang k est poursuivie
+            if k <= j:
+                high = j
+            else:
+                low = j + 1
+
+        # Petite plage, ou partitions trop profondes : tri partiel jusqu'au rang k
+        comparisons, swaps = yield from _partial_sort_steps(ev, low, high, k - low + 1, comparisons, swaps)
+        yield ev.mark((k,), comparisons, swaps) # Élément de rang k en place
+
+    yield ev.done(comparisons, swaps) # État final
+
+
+# --- Versions rapides (non tracées) ---
+# Même logique que les générateurs ci-dessus, sans yield : elles ne font que
+# compter les comparaisons et échanges. Les compteurs retournés doivent être
+# strictement identiques à ceux du dernier état produit par le générateur.
+# Chaque fonction trie `arr` en place et retourne (arr, comparisons, swaps).
+
+def selection_sort_fast(arr):
+    """Tri par sélection sans traçage."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            if arr[j] < arr[min_idx]:
+                min_idx = j
+        comparisons += n - i - 1
+        if min_idx != i:
+            arr[i], arr[min_idx] = arr[min_idx], arr[i]
+            swaps += 1
+    return arr, comparisons, swaps
+
+def bubble_sort_fast(arr):
+    """Tri à bulles sans traçage."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    for i in range(n):
+        swapped_in_pass = False
+        for j in range(0, n - i - 1):
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                swaps += 1
+                swapped_in_pass = True
+        comparisons += max(0, n - i - 1)
+        if not swapped_in_pass:
+            break
+    return arr, comparisons, swaps
+
+def insertion_sort_fast(arr):
+    """Tri par insertion sans traçage."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    for i in range(1, n):
+        key = arr[i]
+        j = i - 1
+        comparisons += 1 # Comparaison initiale, comme dans le générateur
+        while j >= 0 and key < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        shifts = i - 1 - j
+        comparisons += shifts
+        swaps += shifts
+        if arr[j + 1] != key:
+            arr[j + 1] = key
+    return arr, comparisons, swaps
+
+def merge_sort_fast(arr):
+    """Tri fusion ascendant sans traçage (les écritures sont comptées comme 'swaps')."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+
+    width = 1
+    while width < n:
+        for left in range(0, n - width, 2 * width):
+            mid = left + width - 1
+            right = min(left + 2 * width - 1, n - 1)
+            L = _aux_copy(arr, left, mid + 1)
+            R = _aux_copy(arr, mid + 1, right + 1)
+            n1 = len(L)
+            n2 = len(R)
+            i = j = 0
+            k = left
+            while i < n1 and j < n2:
+                comparisons += 1
+                if L[i] <= R[j]:
+                    arr[k] = L[i]
+                    i += 1
+                else:
+                    arr[k] = R[j]
+                    j += 1
+                k += 1
+            # Placements résiduels : une écriture par élément restant
+            arr[k : k + n1 - i] = L[i:]
+            k += n1 - i
+            arr[k : k + n2 - j] = R[j:]
+            swaps += right - left + 1
+        width *= 2
+
+    return arr, comparisons, swaps
+
+def quick_sort_fast(arr):
+    """Tri rapide itératif sans traçage."""
+    comparisons = 0
+    swaps = 0
+    stack = [(0, len(arr) - 1)]
+
+    while stack:
+        low, high = stack.pop()
+        while low < high:
+            mid = (low + high) // 2
+            median, used = _median_of_three(arr, low, mid, high)
+            comparisons += used
+            pivot = arr[median]
+
+            i, j = low, high
+            while True:
+                start = i
+                while arr[i] < pivot:
+                    i += 1
+                comparisons += i - start + 1
+                start = j
+                while pivot < arr[j]:
+                    j -= 1
+                comparisons += start - j + 1
+                if i >= j:
+                    break
+                arr[i], arr[j] = arr[j], arr[i]
+                swaps += 1
+                i += 1
+                j -= 1
+
+            if j - low < high - j - 1:
+                stack.append((j + 1, high))
+                high = j
+            else:
+                stack.append((low, j))
+                low = j + 1
+
+    return arr, comparisons, swaps
+
+def heap_sort_fast(arr):
+    """Tri par tas sans traçage (heapify itératif, mêmes comparaisons)."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+
+    def heapify(arr, n, i):
+        nonlocal comparisons, swaps
+        while True:
+            largest = i
+            left = 2 * i + 1
+            right = 2 * i + 2
+            if left < n:
+                comparisons += 1
+                if arr[left] > arr[largest]:
+                    largest = left
+            if right < n:
+                comparisons += 1
+                if arr[right] > arr[largest]:
+                    largest = right
+            if largest == i:
+                return
+            arr[i], arr[largest] = arr[largest], arr[i]
+            swaps += 1
+            i = largest
+
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(arr, n, i)
+
+    for i in range(n - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        swaps += 1
+        heapify(arr, i, 0)
+
+    return arr, comparisons, swaps
+
+def comb_sort_fast(arr):
+    """Tri à peigne sans traçage."""
+    n = len(arr)
+    gap = n
+    shrink = 1.3
+    sorted_flag = False
+    comparisons = 0
+    swaps = 0
+
+    while not sorted_flag:
+        gap = int(gap / shrink)
+        if gap <= 1:
+            gap = 1
+            sorted_flag = True
+
+        for i in range(n - gap):
+            if arr[i] > arr[i + gap]:
+                arr[i], arr[i + gap] = arr[i + gap], arr[i]
+                swaps += 1
+                sorted_flag = False
+        comparisons += max(0, n - gap)
+
+    return arr, comparisons, swaps
+
+def intro_sort_fast(arr):
+    """Tri introspectif sans traçage."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+
+    def insertion(low, high):
+        nonlocal comparisons, swaps
+        for i in range(low + 1, high + 1):
+            key = arr[i]
+            j = i - 1
+            while j >= low:
+                comparisons += 1
+                if not key < arr[j]:
+                    break
+                arr[j + 1] = arr[j]
+                swaps += 1
+                j -= 1
+            if j + 1 != i:
+                arr[j + 1] = key
+                swaps += 1
+
+    def sift_down(low, root, size):
+        nonlocal comparisons, swaps
+        while True:
+            largest = root
+            left = 2 * root + 1
+            right = left + 1
+            if left < size:
+                comparisons += 1
+                if arr[low + left] > arr[low + largest]:
+                    largest = left
+            if right < size:
+                comparisons += 1
+                if arr[low + right] > arr[low + largest]:
+                    largest = right
+            if largest == root:
+                return
+            arr[low + root], arr[low + largest] = arr[low + largest], arr[low + root]
+            swaps += 1
+            root = largest
+
+    def heap(low, high):
+        nonlocal swaps
+        size = high - low + 1
+        for root in range(size // 2 - 1, -1, -1):
+            sift_down(low, root, size)
+        for end in range(size - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            swaps += 1
+            sift_down(low, 0, end)
+
+    stack = [(0, n - 1, _intro_depth_limit(n))]
+    while stack:
+        low, high, depth = stack.pop()
+        while low < high:
+            if high - low < INTRO_INSERTION_CUTOFF:
+                insertion(low, high)
+                break
+            if depth == 0:
+                heap(low, high)
+                break
+            depth -= 1
+
+            mid = (low + high) // 2
+            median, used = _median_of_three(arr, low, mid, high)
+            comparisons += used
+            pivot = arr[median]
+
+            i, j = low, high
+            while True:
+                start = i
+                while arr[i] < pivot:
+                    i += 1
+                comparisons += i - start + 1
+                start = j
+                while pivot < arr[j]:
+                    j -= 1
+                comparisons += start - j + 1
+                if i >= j:
+                    break
+                arr[i], arr[j] = arr[j], arr[i]
+                swaps += 1
+                i += 1
+                j -= 1
+
+            if j - low < high - j - 1:
+                stack.append((j + 1, high, depth))
+                high = j
+            else:
+                stack.append((low, j, depth))
+                low = j + 1
+
+    return arr, comparisons, swaps
+
+def tim_sort_fast(arr):
+    """Tri par suites naturelles sans traçage (les écritures sont comptées comme 'swaps')."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    min_gallop = TIM_MIN_GALLOP
+    runs = []
+
+    def merge_at(r):
+        nonlocal comparisons, swaps, min_gallop
+        lo, len_a = runs[r]
+        mid, len_b = runs[r + 1]
+        hi = mid + len_b
+        runs[r] = [lo, len_a + len_b]
+        del runs[r + 1]
+
+        lo, used = _gallop(arr[mid], arr, lo, mid, True)
+        comparisons += used
+        if lo == mid:
+            return
+        hi, used = _gallop(arr[mid - 1], arr, mid, hi, False)
+        comparisons += used
+
+        A = _aux_copy(arr, lo, mid)
+        len_a = len(A)
+        i, j, k = 0, mid, lo
+        wins_a = wins_b = 0
+        while i < len_a and j < hi:
+            comparisons += 1
+            if arr[j] < A[i]:
+                arr[k] = arr[j]
+                j += 1
+                wins_b += 1
+                wins_a = 0
+            else:
+                arr[k] = A[i]
+                i += 1
+                wins_a += 1
+                wins_b = 0
+            k += 1
+
+            if wins_a >= min_gallop or wins_b >= min_gallop:
+                while i < len_a and j < hi:
+                    e, used = _gallop(arr[j], A, i, len_a, True)
+                    comparisons += used
+                    count_a = e - i
+                    for t in range(i, e):
+                        arr[k] = A[t]
+                        k += 1
+                    i = e
+                    if i >= len_a:
+                        break
+                    e, used = _gallop(A[i], arr, j, hi, False)
+                    comparisons += used
+                    count_b = e - j
+                    for t in range(j, e): # k <= t : copie vers la gauche sans écrasement
+                        arr[k] = arr[t]
+                        k += 1
+                    j = e
+                    if count_a < TIM_MIN_GALLOP and count_b < TIM_MIN_GALLOP:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+                wins_a = wins_b = 0
+
+        for t in range(i, len_a):
+            arr[k] = A[t]
+            k += 1
+        swaps += k - lo # Une écriture par élément placé
+
+    def merge_collapse():
+        while len(runs) > 1:
+            r = len(runs) - 2
+            if ((r > 0 and runs[r - 1][1] <= runs[r][1] + runs[r + 1][1])
+                    or (r > 1 and runs[r - 2][1] <= runs[r - 1][1] + runs[r][1])):
+                if runs[r - 1][1] < runs[r + 1][1]:
+                    r -= 1
+            elif runs[r][1] > runs[r + 1][1]:
+                break
+            merge_at(r)
+
+    min_run = _tim_min_run(n)
+    lo = 0
+    while lo < n:
+        run_end = lo + 1
+        if run_end < n:
+            comparisons += 1
+            if arr[run_end] < arr[lo]:
+                run_end += 1
+                while run_end < n and arr[run_end] < arr[run_end - 1]:
+                    run_end += 1
+                a, b = lo, run_end - 1
+                swaps += (b - a + 1) // 2
+                while a < b:
+                    arr[a], arr[b] = arr[b], arr[a]
+                    a += 1
+                    b -= 1
+            else:
+                run_end += 1
+                while run_end < n and not arr[run_end] < arr[run_end - 1]:
+                    run_end += 1
+            comparisons += run_end - lo - 2 + (run_end < n) # Comparaison qui a arrêté la suite
+
+        force = min(n, lo + min_run)
+        for i in range(run_end, force):
+            key = arr[i]
+            left, right = lo, i
+            while left < right:
+                m = (left + right) // 2
+                comparisons += 1
+                if key < arr[m]:
+                    right = m
+                else:
+                    left = m + 1
+            for t in range(i, left, -1):
+                arr[t] = arr[t - 1]
+            if left != i:
+                arr[left] = key
+                swaps += i - left + 1
+        run_end = max(run_end, force)
+
+        runs.append([lo, run_end - lo])
+        merge_collapse()
+        lo = run_end
+
+    while len(runs) > 1:
+        r = len(runs) - 2
+        if r > 0 and runs[r - 1][1] < runs[r + 1][1]:
+            r -= 1
+        merge_at(r)
+
+    return arr, comparisons, swaps
+
+
+def _radix_order_numpy(values):
+    """_radix_order vectorisé : (indices triant `values`, passes effectuées).
+
+    Chaque passe est un tri stable des chiffres de 8 bits, que NumPy fait par
+    comptage (tri par base) et non par comparaisons.
+    """
+    keys = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    sign = np.uint64(_SIGN_BIT)
+    keys = np.where(keys & sign, ~keys, keys | sign)
+    n = len(keys)
+    order = np.arange(n)
+    passes = 0
+    for shift in range(0, _KEY_BITS, RADIX_BITS):
+        digits = ((keys >> np.uint64(shift)) & np.uint64(_RADIX_MASK)).astype(np.uint8)
+        if not n or np.bincount(digits, minlength=_RADIX_MASK + 1).max() == n:
+            continue
+        perm = np.argsort(digits, kind='stable')
+        keys = keys[perm]
+        order = order[perm]
+        passes += 1
+    return order, passes
+
+def _assign(arr, values):
+    """Recopie `values` (liste ou tableau NumPy de même longueur) dans arr, en place."""
+    if isinstance(arr, list):
+        arr[:] = values if isinstance(values, list) else values.tolist()
+    elif isinstance(arr, (array, memoryview)):
+        typecode = arr.typecode if isinstance(arr, array) else arr.format
+        values = array(typecode, values if isinstance(values, list) else values.tolist())
+        if isinstance(arr, array):
+            arr[:] = values
+        else:
+            arr[:] = memoryview(values)
+    else: # NumPy
+        arr[:] = values
+
+def radix_sort_fast(arr):
+    """Tri par base LSD sans traçage : chaque passe est traitée d'un bloc (NumPy s'il est installé)."""
+    n = len(arr)
+    if HAS_NUMPY:
+        values = np.array(arr)
+        order, passes = _radix_order_numpy(values)
+        if passes:
+            _assign(arr, values[order])
+        return arr, passes, passes * n
+
+    keys = _float_keys(arr)
+    values = list(arr)
+    passes = 0
+    for shift in range(0, _KEY_BITS, RADIX_BITS):
+        if _digit_is_constant(keys, shift):
+            continue
+        key_buckets = [[] for _ in range(_RADIX_MASK + 1)]
+        value_buckets = [[] for _ in range(_RADIX_MASK + 1)]
+        for key, value in zip(keys, values):
+            digit = (key >> shift) & _RADIX_MASK
+            key_buckets[digit].append(key)
+            value_buckets[digit].append(value)
+        keys = list(chain.from_iterable(key_buckets))
+        values = list(chain.from_iterable(value_buckets))
+        passes += 1
+    if passes:
+        _assign(arr, values)
+    return arr, passes, passes * n
+
+def _insertion_writes(values, start, stop):
+    """Tri par insertion de values[start:stop] (liste) ; retourne les écritures, comptées comme bucket_sort."""
+    writes = 0
+    for i in range(start + 1, stop):
+        key = values[i]
+        j = i - 1
+        if not key < values[j]:
+            continue
+        while j >= start and key < values[j]:
+            values[j + 1] = values[j]
+            j -= 1
+        writes += i - j # Décalages et insertion
+        values[j + 1] = key
+    return writes
+
+def bucket_sort_fast(arr):
+    """Tri par seaux sans traçage (dispersion vectorisée avec NumPy s'il est installé)."""
+    n = len(arr)
+    if n < 2:
+        return arr, 0, 0
+    if HAS_NUMPY:
+        values = np.array(arr)
+        floats = values.astype(np.float64)
+        lo, hi = floats.min(), floats.max()
+        if not lo < hi:
+            return arr, 0, 0
+        buckets = ((floats - lo) * ((n - 1) / (hi - lo))).astype(np.intp)
+        order = np.argsort(buckets, kind='stable')
+        buckets = buckets[order]
+        scattered = floats[order]
+        out = values[order].tolist()
+        # Seuls les seaux contenant une descente ont besoin de l'insertion
+        descents = np.flatnonzero(scattered[1:] < scattered[:-1]) + 1
+        writes = n
+        if len(descents):
+            unsorted = np.unique(buckets[descents])
+            starts = np.searchsorted(buckets, unsorted, 'left').tolist()
+            stops = np.searchsorted(buckets, unsorted, 'right').tolist()
+            for start, stop in zip(starts, stops):
+                writes += _insertion_writes(out, start, stop)
+        _assign(arr, out)
+        return arr, 2, writes
+
+    lo, hi = min(arr), max(arr)
+    if not lo < hi:
+        return arr, 0, 0
+    scale = (n - 1) / (hi - lo)
+    buckets = [[] for _ in range(n)]
+    for x in arr:
+        buckets[int((x - lo) * scale)].append(x)
+    out = []
+    writes = n
+    for bucket in buckets:
+        if len(bucket) > 1:
+            writes += _insertion_writes(bucket, 0, len(bucket))
+        out.extend(bucket)
+    _assign(arr, out)
+    return arr, 2, writes
+
+def counting_sort_fast(arr):
+    """Tri par comptage sans traçage (valeurs distinctes ordonnées avec NumPy s'il est installé)."""
+    n = len(arr)
+    if not n:
+        return arr, 0, 0
+    counts = Counter(arr.tolist() if HAS_NUMPY and isinstance(arr, np.ndarray) else arr)
+    distinct = list(counts)
+    if HAS_NUMPY:
+        order, _ = _radix_order_numpy(distinct)
+        values = np.array(distinct)[order]
+        _assign(arr, np.repeat(values, np.array([counts[value] for value in distinct])[order]))
+    else:
+        out = []
+        for i in _radix_order(_float_keys(distinct)):
+            value = distinct[i]
+            out.extend(repeat(value, counts[value]))
+        _assign(arr, out)
+    return arr, 1, n
+
+
+def _sift_down_fast(arr, low, root, size):
+    """Tamisage dans le tas max arr[low:low + size]. Retourne (comparaisons, échanges)."""
+    comparisons = 0
+    swaps = 0
+    while True:
+        largest = root
+        left = 2 * root + 1
+        right = left + 1
+        if left < size:
+            comparisons += 1
+            if arr[low + left] > arr[low + largest]:
+                largest = left
+        if right < size:
+            comparisons += 1
+            if arr[low + right] > arr[low + largest]:
+                largest = right
+        if largest == root:
+            return comparisons, swaps
+        arr[low + root], arr[low + largest] = arr[low + largest], arr[low + root]
+        swaps += 1
+        root = largest
+
+def _partial_sort_fast(arr, low, high, count):
+    """_partial_sort_steps sans traçage. Retourne (comparaisons, échanges)."""
+    comparisons = 0
+    swaps = 0
+    for root in range(count // 2 - 1, -1, -1):
+        c, s = _sift_down_fast(arr, low, root, count)
+        comparisons += c
+        swaps += s
+    for i in range(low + count, high + 1):
+        if arr[i] < arr[low]:
+            arr[low], arr[i] = arr[i], arr[low]
+            c, s = _sift_down_fast(arr, low, 0, count)
+            comparisons += c
+            swaps += s + 1
+    comparisons += max(0, high + 1 - low - count)
+    for end in range(count - 1, 0, -1):
+        arr[low], arr[low + end] = arr[low + end], arr[low]
+        c, s = _sift_down_fast(arr, low, 0, end)
+        comparisons += c
+        swaps += s + 1
+    return comparisons, swaps
+
+def partial_sort_fast(arr, k=None):
+    """Tri partiel par tas sans traçage."""
+    n = len(arr)
+    if not n:
+        return arr, 0, 0
+    k = max(1, n // 10) if k is None else k
+    _check_count(n, k)
+    comparisons, swaps = _partial_sort_fast(arr, 0, n - 1, k)
+    return arr, comparisons, swaps
+
+def nth_element_fast(arr, k=None):
+    """Introselect sans traçage."""
+    n = len(arr)
+    if not n:
+        return arr, 0, 0
+    k = (n - 1) // 2 if k is None else k
+    _check_rank(n, k)
+    comparisons = 0
+    swaps = 0
+    low, high = 0, n - 1
+    depth = _intro_depth_limit(n)
+    while high - low >= INTRO_INSERTION_CUTOFF and depth > 0:
+        depth -= 1
+        mid = (low + high) // 2
+        median, used = _median_of_three(arr, low, mid, high)
+        comparisons += used
+        pivot = arr[median]
+        i, j = low, high
+        while True:
+            start = i
+            while arr[i] < pivot:
+                i += 1
+            comparisons += i - start + 1
+            start = j
+            while pivot < arr[j]:
+                j -= 1
+            comparisons += start - j + 1
+            if i >= j:
+                break
+            arr[i], arr[j] = arr[j], arr[i]
+            swaps += 1
+            i += 1
+            j -= 1
+        if k <= j:
+            high = j
+        else:
+            low = j + 1
+    c, s = _partial_sort_fast(arr, low, high, k - low + 1)
+    return arr, comparisons + c, swaps + s
+
+def streaming_top_k(iterable, k):
+    """Les k plus petits éléments d'un itérable, triés, en un seul parcours et O(k) mémoire.
+
+    Les éléments sont lus au fil de l'eau (ex. blocs d'un fichier) : un tas max
+    garde les k meilleurs vus jusqu'ici. Retourne (liste triée, comparaisons,
+    échanges), avec les mêmes compteurs que partial_sort_fast sur la liste entière.
+    """
+    if k < 1:
+        raise ValueError(f"k doit être positif (reçu {k})")
+    heap = []
+    iterator = iter(iterable)
+    for x in iterator:
+        heap.append(x)
+        if len(heap) == k:
+            break
+    count = len(heap)
+    comparisons = 0
+    swaps = 0
+    for root in range(count // 2 - 1, -1, -1):
+        c, s = _sift_down_fast(heap, 0, root, count)
+        comparisons += c
+        swaps += s
+    for x in iterator:
+        comparisons += 1
+        if x < heap[0]:
+            heap[0] = x
+            c, s = _sift_down_fast(heap, 0, 0, count)
+            comparisons += c
+            swaps += s + 1
+    for end in range(count - 1, 0, -1):
+        heap[0], heap[end] = heap[end], heap[0]
+        c, s = _sift_down_fast(heap, 0, 0, end)
+        comparisons += c
+        swaps += s + 1
+    return heap, comparisons, swaps
 
 
 # --- Dictionnaire des algorithmes pour accès facile ---
@@ -294,34 +1768,73 @@ SORTING_ALGORITHMS = {
     "Quick Sort": quick_sort,
     "Heap Sort": heap_sort,
     "Comb Sort": comb_sort,
+    "Intro Sort": intro_sort,
+    "Tim Sort": tim_sort,
+    "Radix Sort": radix_sort,
+    "Bucket Sort": bucket_sort,
+    "Counting Sort": counting_sort,
+}
+
+# Versions rapides, mêmes clés que SORTING_ALGORITHMS
+SORTING_ALGORITHMS_FAST = {
+    "Selection Sort": selection_sort_fast,
+    "Bubble Sort": bubble_sort_fast,
+    "Insertion Sort": insertion_sort_fast,
+    "Merge Sort": merge_sort_fast,
+    "Quick Sort": quick_sort_fast,
+    "Heap Sort": heap_sort_fast,
+    "Comb Sort": comb_sort_fast,
+    "Intro Sort": intro_sort_fast,
+    "Tim Sort": tim_sort_fast,
+    "Radix Sort": radix_sort_fast,
+    "Bucket Sort": bucket_sort_fast,
+    "Counting Sort": counting_sort_fast,
+}
+
+# Sélection (k-ième élément, k plus petits) : mêmes protocoles que les tris,
+# paramètre k optionnel (défaut : médiane, 10 % plus petits). Ces fonctions ne
+# trient pas toute la liste : elles ne figurent pas dans SORTING_ALGORITHMS.
+SELECTION_ALGORITHMS = {
+    "Quickselect (médiane)": nth_element,
+    "Partial Sort (top 10 %)": partial_sort,
+}
+
+SELECTION_ALGORITHMS_FAST = {
+    "Quickselect (médiane)": nth_element_fast,
+    "Partial Sort (top 10 %)": partial_sort_fast,
 }
 
+# Noms des deux compteurs de chaque algorithme (DEFAULT_COUNTER_LABELS, de
+# metrics.py, par défaut : comparaisons et échanges). Les tris par fusion
+# comptent des écritures, y compris les versions parallèles (parallel_sort.py).
+COUNTER_LABELS = {
+    "Merge Sort": ("comparaisons", "écritures"),
+    "Tim Sort": ("comparaisons", "écritures"),
+    "Parallel Merge Sort": ("comparaisons", "écritures"),
+    "Sample Sort": ("comparaisons", "écritures"),
+    "Radix Sort": ("passes", "écritures"),
+    "Bucket Sort": ("passes", "écritures"),
+    "Counting Sort": ("passes", "écritures"),
+}
+
+def counter_labels(name):
+    """(nom du 1er compteur, nom du 2e compteur) de l'algorithme `name`."""
+    return COUNTER_LABELS.get(name, DEFAULT_COUNTER_LABELS)
+
 SORTING_ALGORITHMS_TIMED = {
-    "Selection Sort": _measure_time(selection_sort),
-    "Bubble Sort": _measure_time(bubble_sort),
-    "Insertion Sort": _measure_time(insertion_sort),
-    "Merge Sort": _measure_time(merge_sort),
-    "Quick Sort": _measure_time(quick_sort),
-    "Heap Sort": _measure_time(heap_sort),
-    "Comb Sort": _measure_time(comb_sort),
+    name: _measure_time(func, counter_labels(name), name) for name, func in SORTING_ALGORITHMS_FAST.items()
 }
 
 # --- Fonctions utilitaires ---
-def generate_list(size, min_val=0.0, max_val=100.0, disorder_type='random'):
-    """Génère une liste de nombres réels avec différents types de désordre."""
-    if disorder_type == 'random':
-        return [random.uniform(min_val, max_val) for _ in range(size)]
-    elif disorder_type == 'sorted':
-        return sorted([random.uniform(min_val, max_val) for _ in range(size)])
-    elif disorder_type == 'reversed':
-        return sorted([random.uniform(min_val, max_val) for _ in range(size)], reverse=True)
-    elif disorder_type == 'nearly_sorted':
-        arr = sorted([random.uniform(min_val, max_val) for _ in range(size)])
-        # Introduire quelques swaps pour le désordre léger
-        swaps = max(1, size // 10) 
-        for _ in range(swaps):
-            i, j = random.sample(range(size), 2)
-            arr[i], arr[j] = arr[j], arr[i]
-        return arr
-    else: # Défaut sur random
-        return [random.uniform(min_val, max_val) for _ in range(size)]
\ No newline at end of file
+def generate_list(size, min_val=0.0, max_val=100.0, disorder_type='random', seed=None, typecode=None):
+    """Génère une liste de nombres réels avec différents types de désordre.
+
+    Les formes disponibles sont celles de input_generator.DISTRIBUTIONS (une
+    forme inconnue donne une liste aléatoire). Avec `seed`, la liste est
+    reproductible. Avec `typecode` ('d' ou 'f'), le résultat est un
+    array.array compact (8 ou 4 octets par élément au lieu d'environ 32 pour
+    une liste de floats).
+    """
+    if typecode:
+        return generate(size, min_val, max_val, disorder_type, seed, output='array', typecode=typecode)
+    return generate(size, min_val, max_val, disorder_type, seed)
@@ -0,0 +1,122 @@
+# step_event.py
+"""Événement produit à chaque étape par les générateurs de tri.
+
+Chaque générateur de sorting.py crée un seul StepEvent au départ et le remet
+à jour avant chaque yield : aucune allocation par étape, et les champs sont
+lus par leur nom (event.comparisons) au lieu d'une position dans un tuple.
+L'objet produit n'est valable que jusqu'à l'étape suivante : un consommateur
+qui veut le garder en copie les champs (ou utilise copy()).
+
+Champs :
+    op           nature de l'étape (OP_COMPARE, OP_SWAP, OP_WRITE, OP_MARK, OP_DONE)
+    arr          la liste triée sur place (toujours le même objet)
+    compared     indices comparés : petit tuple, ou range pour une plage
+    swapped      indices écrits (OP_SWAP, OP_WRITE) ou plage surlignée (OP_MARK)
+    comparisons  compteurs cumulés (passes et écritures pour les tris par
+    swaps        distribution, voir sorting.COUNTER_LABELS)
+    phase        nom de la phase en cours (None si l'algorithme n'en déclare pas)
+    depth        profondeur de récursion ou taille de la pile explicite
+    aux          entrées auxiliaires vivantes (copies, clés, seaux)
+
+Les trois derniers champs ne changent que quand l'algorithme change de phase,
+empile ou alloue : le générateur les affecte directement (ev.phase = ...),
+ils restent valables pour les étapes suivantes. Ils alimentent les mesures
+détaillées de metrics.py.
+
+Un consommateur qui ne s'intéresse qu'à certaines étapes teste `op` : seuls
+les événements de WRITE_OPS modifient la liste (leurs indices `swapped` sont
+ceux à redessiner ou à recopier). Un nouveau champ pourra être ajouté à
+__slots__ sans casser les consommateurs existants.
+"""
+
+OP_COMPARE = 1 # Comparaison, sans écriture
+OP_SWAP = 2 # Échange de deux éléments
+OP_WRITE = 3 # Écriture (décalage, placement depuis un tableau auxiliaire)
+OP_MARK = 4 # Plage surlignée (bloc fusionné, partition...), sans écriture
+OP_DONE = 5 # État final
+
+WRITE_OPS = frozenset((OP_SWAP, OP_WRITE))
+OP_NAMES = {
+    OP_COMPARE: 'compare',
+    OP_SWAP: 'swap',
+    OP_WRITE: 'write',
+    OP_MARK: 'mark',
+    OP_DONE: 'done',
+}
+
+
+class StepEvent:
+    """Étape d'un tri, réutilisée d'un yield à l'autre (voir le module)."""
+
+    __slots__ = ('op', 'arr', 'compared', 'swapped', 'comparisons', 'swaps', 'phase', 'depth', 'aux')
+
+    def __init__(self, arr, op=OP_MARK, compared=(), swapped=(), comparisons=0, swaps=0,
+                 phase=None, depth=0, aux=0):
+        self.op = op
+        self.arr = arr
+        self.compared = compared
+        self.swapped = swapped
+        self.comparisons = comparisons
+        self.swaps = swaps
+        self.phase = phase
+        self.depth = depth
+        self.aux = aux
+
+    def __repr__(self):
+        return (f"StepEvent({OP_NAMES.get(self.op, self.op)}, compared={self.compared!r}, "
+                f"swapped={self.swapped!r}, comparisons={self.comparisons}, swaps={self.swaps})")
+
+    def copy(self):
+        """Instantané des champs (la liste `arr` reste partagée)."""
+        return StepEvent(self.arr, self.op, self.compared, self.swapped, self.comparisons, self.swaps,
+                         self.phase, self.depth, self.aux)
+
+    # Mise à jour pour le yield suivant : chaque méthode retourne l'événement lui-même
+
+    def set(self, op, compared, swapped, comparisons, swaps):
+        self.op = op
+        self.compared = compared
+        self.swapped = swapped
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
+
+    def compare(self, compared, comparisons, swaps):
+        self.op = OP_COMPARE
+        self.compared = compared
+        self.swapped = ()
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
+
+    def swap(self, swapped, comparisons, swaps, compared=()):
+        self.op = OP_SWAP
+        self.compared = compared
+        self.swapped = swapped
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
+
+    def write(self, written, comparisons, swaps, compared=()):
+        self.op = OP_WRITE
+        self.compared = compared
+        self.swapped = written
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
+
+    def mark(self, marked, comparisons, swaps, compared=()):
+        self.op = OP_MARK
+        self.compared = compared
+        self.swapped = marked
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
+
+    def done(self, comparisons, swaps):
+        self.op = OP_DONE
+        self.compared = ()
+        self.swapped = ()
+        self.comparisons = comparisons
+        self.swaps = swaps
+        return self
@@ -0,0 +1,184 @@
+# vector_renderer.py
+"""Rendu vectorisé (NumPy + pygame.surfarray) pour les très grandes listes.
+
+Au lieu d'un appel pygame.draw par élément, on échantillonne un élément par
+colonne de pixels, on calcule hauteurs, couleurs et masques de surbrillance
+sous forme de tableaux NumPy, et on écrit directement dans le tampon de pixels
+de l'écran. Le coût par frame dépend de la taille de la zone de dessin, pas de n.
+
+NumPy est optionnel : HAS_NUMPY vaut False s'il n'est pas installé, et le
+visualiseur garde alors son rendu pygame habituel.
+"""
+import math
+
+import pygame
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError: # NumPy absent : le visualiseur utilise le rendu pygame
+    np = None
+    HAS_NUMPY = False
+
+
+def _highlight_mask(indices, sample_idx):
+    """Masque booléen des échantillons surlignés (indices = tuple ou range)."""
+    if isinstance(indices, range):
+        return (sample_idx >= indices.start) & (sample_idx < indices.stop)
+    if not indices:
+        return np.zeros(sample_idx.shape, dtype=bool)
+    return np.isin(sample_idx, np.fromiter(indices, dtype=np.int64, count=len(indices)))
+
+
+def _blend(colors, mask, rgba):
+    """Mélange alpha de `rgba` sur les lignes de `colors` (N, 3) sélectionnées par `mask`."""
+    r, g, b, a = rgba
+    alpha = a / 255.0
+    colors[mask] = colors[mask] * (1.0 - alpha) + np.array((r, g, b), dtype=np.float64) * alpha
+
+
+def _sample(data, sample_idx):
+    """Valeurs de `data` aux indices échantillonnés, en O(nombre d'échantillons)."""
+    return np.fromiter(map(data.__getitem__, sample_idx.tolist()), dtype=np.float64, count=len(sample_idx))
+
+
+def _map_rgb(surface, rgb):
+    """Convertit un tableau (..., 3) uint8 en pixels entiers au format de `surface`."""
+    rshift, gshift, bshift, _ = surface.get_shifts()
+    rloss, gloss, bloss, _ = surface.get_losses()
+    rgb = rgb.astype(np.uint32)
+    return (((rgb[..., 0] >> rloss) << rshift)
+            | ((rgb[..., 1] >> gloss) << gshift)
+            | ((rgb[..., 2] >> bloss) << bshift))
+
+
+def _write_columns(surface, area, bar_heights, col_colors, background):
+    """Écrit dans `area` des colonnes de hauteur `bar_heights` posées sur le bas de la zone."""
+    height = area.height
+    rows = np.arange(height)
+    # Masque (colonne, ligne) : pixel dans la barre si ligne >= hauteur - hauteur_barre
+    in_bar = rows[None, :] >= (height - bar_heights)[:, None]
+    col_colors = col_colors.astype(np.uint8)
+    background = np.array(background[:3], dtype=np.uint8)
+
+    if surface.get_bytesize() == 4:
+        # Un entier par pixel : bien moins de mémoire à remplir qu'en RGB séparé
+        image = np.where(in_bar, _map_rgb(surface, col_colors)[:, None], _map_rgb(surface, background))
+        pixels = pygame.surfarray.pixels2d(surface)
+    else:
+        image = np.where(in_bar[:, :, None], col_colors[:, None, :], background)
+        pixels = pygame.surfarray.pixels3d(surface)
+    try:
+        pixels[area.left:area.right, area.top:area.bottom] = image
+    finally:
+        del pixels # Déverrouille la surface
+
+
+def draw_bars_numpy(surface, area, data, max_val, compared, swapped, colors, bar_spacing=2):
+    """Dessine les barres de `data` dans `area` (pygame.Rect) de `surface`.
+
+    `colors` : dict avec 'background', 'bar' (RGB), 'highlight', 'swap' (RGBA).
+    """
+    n = len(data)
+    width, height = area.width, area.height
+    if n == 0 or width <= 0 or height <= 0:
+        return
+
+    # Élément affiché par chaque colonne de pixels
+    columns = np.arange(width)
+    positions = columns * (n / width)
+    sample_idx = np.minimum(positions.astype(np.int64), n - 1)
+
+    # Espacement entre barres seulement si chaque barre fait au moins 2 fois l'espacement
+    slot_width = width / n
+    if slot_width >= 2 * (bar_spacing + 1):
+        frac = positions - sample_idx
+        is_gap = (1.0 - frac) * slot_width <= bar_spacing
+    else:
+        is_gap = np.zeros(width, dtype=bool)
+
+    values = _sample(data, sample_idx)
+    if max_val == 0: max_val = 1 # Éviter division par zéro
+    bar_heights = np.clip(values / max_val * (height * 0.95), 0, height).astype(np.int64)
+    bar_heights[is_gap] = 0
+
+    # Couleur par colonne, avec surbrillances mélangées comme un blit SRCALPHA
+    col_colors = np.empty((width, 3), dtype=np.float64)
+    col_colors[:] = colors['bar'][:3]
+    _blend(col_colors, _highlight_mask(compared, sample_idx), colors['highlight'])
+    _blend(col_colors, _highlight_mask(swapped, sample_idx), colors['swap'])
+
+    _write_columns(surface, area, bar_heights, col_colors, colors['background'])
+
+
+def _disk_offsets(radius, ring_width=None):
+    """Décalages (dx, dy) d'un disque plein ou d'un anneau de largeur `ring_width`."""
+    r = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(r, r, indexing='ij')
+    dist2 = dx * dx + dy * dy
+    mask = dist2 <= radius * radius
+    if ring_width is not None:
+        inner = max(0, radius - ring_width)
+        mask &= dist2 > inner * inner
+    return dx[mask], dy[mask]
+
+
+def _hsv_hue_to_rgb(hue):
+    """Teinte (degrés) -> RGB uint8 pour saturation et valeur à 100 %."""
+    h = (hue % 360) / 60.0
+    x = 1.0 - np.abs(h % 2 - 1.0)
+    sector = h.astype(np.int64) % 6
+    rgb = np.zeros(hue.shape + (3,), dtype=np.float64)
+    ones = np.ones_like(x)
+    zeros = np.zeros_like(x)
+    table = [(ones, x, zeros), (x, ones, zeros), (zeros, ones, x),
+             (zeros, x, ones), (x, zeros, ones), (ones, zeros, x)]
+    for s, (r, g, b) in enumerate(table):
+        sel = sector == s
+        rgb[sel, 0] = r[sel]
+        rgb[sel, 1] = g[sel]
+        rgb[sel, 2] = b[sel]
+    return (rgb * 255).astype(np.uint8)
+
+
+def _stamp(pixels, xs, ys, colors, offsets):
+    """Tamponne `offsets` autour de chaque point (xs, ys) avec sa couleur, en restant dans l'image."""
+    dx, dy = offsets
+    px = (xs[:, None] + dx[None, :]).ravel()
+    py = (ys[:, None] + dy[None, :]).ravel()
+    cols = np.repeat(colors, len(dx), axis=0)
+    inside = (px >= 0) & (px < pixels.shape[0]) & (py >= 0) & (py < pixels.shape[1])
+    pixels[px[inside], py[inside]] = cols[inside]
+
+
+def draw_circle_numpy(surface, center, radius, data, max_val, compared, swapped, colors,
+                      point_radius=5, highlight_radius=8, highlight_width=2):
+    """Cercle de points colorés par valeur, un point par position angulaire distincte."""
+    n = len(data)
+    if n == 0:
+        return
+
+    # Au plus un point par pixel de circonférence : au-delà, ils se recouvrent
+    samples = max(1, min(n, int(2 * math.pi * radius)))
+    sample_idx = (np.arange(samples) * (n / samples)).astype(np.int64)
+    if samples < n:
+        point_radius = min(point_radius, 2)
+
+    values = _sample(data, sample_idx)
+    if max_val <= 0: max_val = 1
+    angles = np.radians(sample_idx * (360.0 / n) - 90) # -90 pour commencer en haut
+    xs = (center[0] + np.cos(angles) * radius).astype(np.int64)
+    ys = (center[1] + np.sin(angles) * radius).astype(np.int64)
+    point_colors = _hsv_hue_to_rgb(values / max_val * 360)
+
+    pixels = pygame.surfarray.pixels3d(surface)
+    try:
+        _stamp(pixels, xs, ys, point_colors, _disk_offsets(point_radius))
+        ring = _disk_offsets(highlight_radius, highlight_width)
+        for indices, rgba in ((compared, colors['highlight']), (swapped, colors['swap'])):
+            mask = _highlight_mask(indices, sample_idx)
+            if mask.any():
+                ring_colors = np.tile(np.array(rgba[:3], dtype=np.uint8), (int(mask.sum()), 1))
+                _stamp(pixels, xs[mask], ys[mask], ring_colors, ring)
+    finally:
+        del pixels
@@ -1,10 +1,20 @@
 # visualizer.py
 import pygame
 import sys
+import argparse
 import random
 import math
 import time
-from sorting import SORTING_ALGORITHMS, generate_list # Utilise les générateurs bruts ici
+from collections import OrderedDict
+from sorting import SORTING_ALGORITHMS, SELECTION_ALGORITHMS, counter_labels, generate_list # Utilise les générateurs bruts ici
+from sort_worker import SortWorker
+from step_event import WRITE_OPS
+from metrics import DEFAULT_COUNTER_LABELS, MetricsRecorder
+from vector_renderer import HAS_NUMPY, draw_bars_numpy, draw_circle_numpy
+from binning import ColumnBins
+from sort_trace import record_trace, load_trace
+from result_cache import ResultCache, cache_key
+from race import Race, LOCKSTEP_MODES
 
 # --- Initialisation Pygame ---
 pygame.init()
@@ -15,6 +25,37 @@ SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 700
 FPS = 60
 
+# Ordonnanceur des étapes de tri (indépendant du FPS)
+DEFAULT_STEPS_PER_SECOND = 60.0 # Une étape par frame à 60 FPS, comme l'ancienne vitesse x1.0
+MIN_STEPS_PER_SECOND = 0.5
+MAX_STEPS_PER_SECOND = 5_000_000.0
+SPEED_STEP_FACTOR = 1.5 # Multiplicateur appliqué par HAUT/BAS
+STEP_TIME_BUDGET = 0.6 / FPS # Part de chaque frame consacrée à l'avancement du tri
+MAX_FRAME_DT = 0.1 # Plafond du temps crédité par frame (évite une rafale après un gel)
+RATE_WINDOW = 0.5 # Fenêtre (s) de mesure du débit réellement atteint
+USE_SORT_WORKER = False # Calcul du tri dans un thread séparé (bascule avec W)
+RECORD_TRACE = False # Enregistrer le tri pour pouvoir reculer et naviguer (bascule avec T)
+RESULT_CACHE_DIR = None # Répertoire du cache des traces et résultats (None : cache en mémoire seulement)
+SHOW_METRICS = True # Mesures détaillées : phase, écritures, pile et mémoire auxiliaire (bascule avec I)
+
+# Mode course (touche M) : plusieurs algorithmes côte à côte sur la même liste
+RACE_ALGORITHMS = None # Noms des algorithmes en course (None : tous les tris de SORTING_ALGORITHMS)
+RACE_LOCKSTEP = 'comparisons' # 'comparisons' ou 'time' (bascule avec L)
+RACE_COMPARISONS_PER_SECOND = 1000.0 # Vitesse minimale de l'horloge au départ d'une course
+RACE_LABEL_HEIGHT = 36 # Deux lignes de texte en haut de chaque panneau
+RACE_PANE_GAP = 8
+TIMELINE_RECT = pygame.Rect(SCREEN_WIDTH * 0.05, 24, SCREEN_WIDTH * 0.9, 12) # Frise temporelle
+TIMELINE_BAND = pygame.Rect(0, 0, SCREEN_WIDTH, 48) # Bande du haut repeinte avec la frise
+
+# Rendu : 'pygame' (un appel de dessin par élément), 'numpy' (vectorisé, nécessite NumPy)
+# ou 'auto' (NumPy au-delà de VECTOR_RENDER_THRESHOLD éléments s'il est installé).
+# En 'auto' seulement, des barres plus nombreuses que les colonnes de pixels passent
+# par la vue agrégée (min, max, moyenne par colonne), prioritaire sur NumPy ; un
+# moteur choisi explicitement avec N est toujours respecté.
+RENDERER = 'auto'
+RENDERER_MODES = ['auto', 'numpy', 'pygame']
+VECTOR_RENDER_THRESHOLD = 1000
+
 # Couleurs de base (Thème par défaut - peut-être "Antique")
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -32,11 +73,13 @@ try:
     TITLE_FONT = pygame.font.Font(None, 74) # Ou charger depuis assets/fonts/
     UI_FONT = pygame.font.Font(None, 36)
     STATS_FONT = pygame.font.Font(None, 28)
+    RACE_FONT = pygame.font.Font(None, 20)
 except pygame.error:
     print("Erreur chargement police par défaut. Utilisation fallback.")
     TITLE_FONT = pygame.font.SysFont('arial', 74)
     UI_FONT = pygame.font.SysFont('arial', 36)
     STATS_FONT = pygame.font.SysFont('arial', 28)
+    RACE_FONT = pygame.font.SysFont('arial', 16)
 
 # Sons (Charger depuis assets/sounds/)
 try:
@@ -52,6 +95,81 @@ except pygame.error as e:
     print(f"Erreur chargement sons : {e}. Les sons seront désactivés.")
     sound_compare, sound_swap, sound_done, sound_click = None, None, None, None
 
+def _blend_rgb(base, rgba):
+    """Couleur opaque obtenue en posant `rgba` (avec alpha) sur `base`."""
+    alpha = rgba[3] / 255.0
+    return tuple(int(b * (1.0 - alpha) + c * alpha) for b, c in zip(base[:3], rgba[:3]))
+
+def _format_rate(rate):
+    """Débit lisible : une décimale pour les petites valeurs, séparateur de milliers sinon."""
+    return f"{rate:.1f}" if rate < 100 else f"{rate:,.0f}"
+
+
+# --- Cache de surfaces ---
+class SurfaceCache:
+    """Cache LRU des surfaces réutilisées d'une frame à l'autre.
+
+    Deux familles : rectangles de surbrillance (clé taille/couleur) et textes
+    rendus (clé police/texte/couleur). Les entrées les moins récemment utilisées
+    sont évincées au-delà de `max_entries`.
+
+    Les textes qui changent presque à chaque frame (compteurs, temps, vitesse,
+    horloge de course) passent par `volatile_text`, un second LRU de
+    `max_volatile` entrées : ils ne chassent pas les libellés stables du premier.
+    """
+    def __init__(self, max_entries=256, max_volatile=64):
+        self.max_entries = max_entries
+        self.max_volatile = max_volatile
+        self._surfaces = OrderedDict()
+        self._volatile = OrderedDict()
+        self._screen_size = None
+
+    @staticmethod
+    def _get_from(store, limit, key, build):
+        surf = store.get(key)
+        if surf is None:
+            surf = build()
+            store[key] = surf
+            if len(store) > limit:
+                store.popitem(last=False) # Évince la plus ancienne
+        else:
+            store.move_to_end(key)
+        return surf
+
+    def _get(self, key, build):
+        return self._get_from(self._surfaces, self.max_entries, key, build)
+
+    def highlight(self, size, color):
+        """Surface SRCALPHA de taille `size` remplie de `color`."""
+        size = (int(size[0]), int(size[1]))
+        def build():
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill(color)
+            return surf
+        return self._get(('highlight', size, color), build)
+
+    def text(self, font, text, color):
+        """Texte rendu (anti-aliasé) avec `font`."""
+        return self._get(('text', font, text, color), lambda: font.render(text, True, color))
+
+    def volatile_text(self, font, text, color):
+        """Comme `text`, pour un texte qui change d'une frame à l'autre."""
+        return self._get_from(self._volatile, self.max_volatile, (font, text, color),
+                              lambda: font.render(text, True, color))
+
+    def check_screen_size(self, size):
+        """Vide le cache si la taille de la fenêtre a changé ; retourne True dans ce cas."""
+        if size == self._screen_size:
+            return False
+        self._screen_size = size
+        self.clear()
+        return True
+
+    def clear(self):
+        self._surfaces.clear()
+        self._volatile.clear()
+
+
 # --- Classe principale de la visualisation ---
 class Visualizer:
     def __init__(self):
@@ -59,21 +177,41 @@ class Visualizer:
         pygame.display.set_caption("Les Papyrus de Héron - Visualisation de Tri")
         self.clock = pygame.time.Clock()
 
-        self.algorithms = SORTING_ALGORITHMS
+        self.algorithms = {**SORTING_ALGORITHMS, **SELECTION_ALGORITHMS} # Tris, puis sélections (médiane, top k)
         self.selected_algorithm_name = list(self.algorithms.keys())[0]
         self.list_data = []
         self.list_size = 50 # Taille par défaut
         self.min_val = 0.0
         self.max_val = 100.0
         self.disorder_type = 'random'
+        self.list_seed = None # Graine de la liste courante (R rejoue la même liste)
         self.theme = 'egyptian' # egyptian, futuristic, natural
         self.visualization_type = 'bars' # bars, circle, spiral, grid
+        self.renderer = RENDERER # auto, numpy, pygame (bascule avec N)
 
         self.sorting_generator = None
         self.is_sorting = False
         self.is_paused = False
         self.step_by_step = False
-        self.sort_speed = 1.0 # Facteur de vitesse (1.0 = normal)
+        self.steps_per_second = DEFAULT_STEPS_PER_SECOND # Débit cible de l'ordonnanceur
+        self.achieved_rate = 0.0 # Débit réellement atteint (pas/s), affiché dans les stats
+        self._step_credit = 0.0 # Fraction d'étape reportée d'une frame à l'autre
+        self._last_update_time = 0.0
+        self._rate_window_start = 0.0
+        self._rate_window_steps = 0
+        self.use_worker = USE_SORT_WORKER
+        self.sort_worker = None # SortWorker actif en mode producteur/consommateur
+        self.record_mode = RECORD_TRACE
+        self.trace = None # SortTrace du tri en cours (mode enregistrement)
+        self.trace_player = None # TracePlayer servant de générateur en mode enregistrement
+        self.replay_trace = None # Trace chargée depuis un fichier (mode --replay)
+        self.result_cache = ResultCache(RESULT_CACHE_DIR) # Traces déjà enregistrées, par liste
+        self._scrubbing = False # Glisser-déposer en cours sur la frise
+        self.race = None # Race en cours (mode course)
+        self.race_mode = RACE_LOCKSTEP
+        self._race_layout_cache = None # (clé, disposition) des panneaux de course
+        self.show_metrics = SHOW_METRICS
+        self.metrics = None # MetricsRecorder du tri en cours (None : mesures désactivées)
 
         self.comparisons = 0
         self.swaps = 0
@@ -82,7 +220,20 @@ class Visualizer:
 
         self.current_compared = ()
         self.current_swapped = ()
-        
+
+        # Rendu incrémental des barres (dirty rectangles)
+        self.surface_cache = SurfaceCache() # Surbrillances et textes rendus
+        self.bars_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) # Calque persistant des barres
+        self._bar_cache = [] # (valeur, comparée, échangée) telle que dessinée, par barre
+        self._dirty_bars = set() # Indices écrits par l'algorithme depuis la dernière frame
+        self._drawn_compared = ()
+        self._drawn_swapped = ()
+        self._screen_in_sync = False # True si l'écran affiche le calque des barres à jour
+
+        # Vue agrégée (une colonne de pixels = un groupe d'éléments) pour les très grandes listes
+        self.column_bins = None
+        self._bins_valid = False # False : reconstruire les colonnes depuis list_data
+
         self.state = 'menu' # 'menu', 'sorting', 'finished'
 
         self._setup_ui()
@@ -113,6 +264,8 @@ class Visualizer:
             HIGHLIGHT_COLOR = (255, 255, 0, 150) # Jaune
             SWAP_COLOR = (255, 69, 0, 150) # Orange-Rouge
         # Ajouter d'autres thèmes
+        self.surface_cache.clear() # Les surfaces en cache portent les anciennes couleurs
+        self._screen_in_sync = False # Les couleurs ont changé : prochain rendu complet
         print(f"Thème appliqué: {self.theme}")
 
 
@@ -143,14 +296,43 @@ class Visualizer:
                      self.is_paused = not self.is_paused
                      if not self.is_paused:
                          self.start_time = time.perf_counter() - self.time_elapsed # Reprend le chrono
-                 if event.key == pygame.K_RIGHT and self.is_paused and self.step_by_step: # Pas-à-pas
+                         self._reset_scheduler()
+                 if event.key == pygame.K_RIGHT and self.is_paused and (self.step_by_step or self.trace_player): # Pas-à-pas
                      self.update_sorting(force_step=True)
+                 if event.key == pygame.K_LEFT and self.trace is not None and (self.is_paused or self.state == 'finished'): # Pas en arrière
+                     self.seek_trace(self.trace_player.position - 1)
                  if event.key == pygame.K_UP: # Augmenter vitesse
-                     self.sort_speed = min(10.0, self.sort_speed * 1.2)
+                     self.steps_per_second = min(MAX_STEPS_PER_SECOND, self.steps_per_second * SPEED_STEP_FACTOR)
                  if event.key == pygame.K_DOWN: # Diminuer vitesse
-                     self.sort_speed = max(0.1, self.sort_speed / 1.2)
-                 if event.key == pygame.K_r: # Reset la visualisation avec les mêmes paramètres
-                     self.start_sorting()
+                     self.steps_per_second = max(MIN_STEPS_PER_SECOND, self.steps_per_second / SPEED_STEP_FACTOR)
+                 if event.key == pygame.K_f and self.is_sorting: # Finir instantanément
+                     self.finish_sorting_instantly()
+                 if event.key == pygame.K_n: # Change de moteur de rendu
+                     self.renderer = RENDERER_MODES[(RENDERER_MODES.index(self.renderer) + 1) % len(RENDERER_MODES)]
+                     self._screen_in_sync = False
+                     print(f"Rendu: {self.renderer}" + ("" if HAS_NUMPY else " (NumPy absent : rendu pygame)"))
+                 if event.key == pygame.K_t: # Enregistrement (pris en compte au prochain tri)
+                     self.record_mode = not self.record_mode
+                     print(f"Enregistrement de la trace: {'activé' if self.record_mode else 'désactivé'}")
+                 if event.key == pygame.K_w: # Tri dans un thread séparé (pris en compte au prochain tri)
+                     self.use_worker = not self.use_worker
+                     print(f"Thread de tri: {'activé' if self.use_worker else 'désactivé'}")
+                 if event.key == pygame.K_i: # Mesures détaillées (prises en compte au prochain tri)
+                     self.show_metrics = not self.show_metrics
+                     print(f"Mesures détaillées: {'activées' if self.show_metrics else 'désactivées'}")
+                 if event.key == pygame.K_m: # Course entre algorithmes sur une nouvelle liste
+                     self.start_race()
+                 if event.key == pygame.K_l: # Course au même nombre de comparaisons / au même temps
+                     mode = LOCKSTEP_MODES[(LOCKSTEP_MODES.index(self.race_mode) + 1) % len(LOCKSTEP_MODES)]
+                     try:
+                         if self.race is not None:
+                             self.race.mode = mode
+                         self.race_mode = mode
+                         print(f"Course: mode {self.race_mode}")
+                     except ValueError as e: # Tris par distribution en course : mode 'time' seulement
+                         print(f"Course: {e}")
+                 if event.key == pygame.K_r: # Reset la visualisation avec la même liste
+                     self.restart(same_list=True)
 
 
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -160,6 +342,11 @@ class Visualizer:
                     elif self.state == 'sorting' or self.state == 'finished':
                         self.handle_sorting_clicks(event.pos) # Pour boutons pause/reset etc.
 
+            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self._scrubbing = False
+            if event.type == pygame.MOUSEMOTION and self._scrubbing:
+                self._seek_from_timeline(event.pos[0])
+
 
     def handle_menu_clicks(self, mouse_pos):
         # Vérifier si un bouton du menu a été cliqué
@@ -179,34 +366,137 @@ class Visualizer:
              self.start_sorting()
 
     def handle_sorting_clicks(self, mouse_pos):
+         if self.trace is not None and TIMELINE_RECT.inflate(0, 12).collidepoint(mouse_pos):
+             self._scrubbing = True
+             self._seek_from_timeline(mouse_pos[0])
+             return
          # Gérer clics sur boutons pendant le tri (ex: Pause, Reset, Menu)
          reset_button_rect = pygame.Rect(10, SCREEN_HEIGHT - 60, 100, 40) # À définir
          menu_button_rect = pygame.Rect(120, SCREEN_HEIGHT - 60, 100, 40) # À définir
          
          if reset_button_rect.collidepoint(mouse_pos):
              if sound_click: sound_click.play()
-             self.start_sorting() # Relance avec les mêmes params
+             self.restart(same_list=True) # Relance avec la même liste
          elif menu_button_rect.collidepoint(mouse_pos):
              if sound_click: sound_click.play()
              self.reset_sorting()
              self.state = 'menu'
 
 
-    def generate_new_list(self):
-        self.list_data = generate_list(self.list_size, self.min_val, self.max_val, self.disorder_type)
+    def generate_new_list(self, same_list=False):
+        if not same_list or self.list_seed is None:
+            self.list_seed = random.randrange(2**32)
+        self.list_data = generate_list(self.list_size, self.min_val, self.max_val, self.disorder_type,
+                                       seed=self.list_seed)
         # Normaliser si nécessaire pour certaines visualisations (ex: couleurs)
         self.max_list_val = max(self.list_data) if self.list_data else 1 # Éviter division par zéro
 
 
-    def start_sorting(self):
-        self.generate_new_list()
+    def load_replay(self, path):
+        """Mode --replay : rejoue un fichier de trace sans recalculer le tri."""
+        self.replay_trace = load_trace(path)
+        self.selected_algorithm_name = self.replay_trace.algorithm_name
+        self.list_size = self.replay_trace.size
+        print(f"Trace chargée: {path} ({len(self.replay_trace)} étapes)")
+        self.start_sorting()
+
+    def _cache_key(self):
+        return cache_key(self.selected_algorithm_name, self.list_size, self.disorder_type,
+                         self.min_val, self.max_val, self.list_seed)
+
+    def start_sorting(self, same_list=False):
+        if self.replay_trace is not None:
+            self.list_data = self.replay_trace.initial
+            self.max_list_val = max(self.list_data) if self.list_data else 1
+        else:
+            self.generate_new_list(same_list)
         if not self.list_data:
             print("Impossible de trier une liste vide.")
             return
 
-        sort_function = self.algorithms[self.selected_algorithm_name]
-        self.sorting_generator = sort_function(self.list_data[:]) # Travaille sur une copie
-        
+        self._stop_worker()
+        self.race = None
+        self.trace = None
+        self.trace_player = None
+        sort_function = self.algorithms.get(self.selected_algorithm_name) # Inutile en mode --replay
+        # Seule l'entrée utilisable est demandée au cache : la trace en mode
+        # enregistrement, sinon le résultat final
+        cached_trace = cached_result = None
+        if self.replay_trace is None and self.record_mode:
+            cached_trace = self.result_cache.get_trace(self._cache_key())
+        elif self.replay_trace is None:
+            cached_result = self.result_cache.get_result(self._cache_key())
+        if cached_result is not None and 'final' in cached_result:
+            # Même algorithme sur la même liste, sans trace : l'état final est affiché directement
+            self._finish_from_result(cached_result)
+            return
+        if self.replay_trace is not None:
+            # Le fichier projeté en mémoire sert de générateur, étape par étape
+            self.trace = self.replay_trace
+            self.trace_player = self.trace.player()
+            self.sorting_generator = self.trace_player
+        elif cached_trace is not None:
+            # Même algorithme sur la même liste : la trace déjà enregistrée est rejouée
+            self.trace = cached_trace
+            self.trace_player = self.trace.player()
+            self.sorting_generator = self.trace_player
+            print(f"Trace en cache: {len(self.trace)} étapes")
+        elif self.record_mode:
+            # Tout le tri est calculé d'avance ; l'affichage rejoue ensuite la trace
+            record_start = time.perf_counter()
+            self.trace = record_trace(sort_function, self.list_data, self.selected_algorithm_name)
+            self.result_cache.put_trace(self._cache_key(), self.trace)
+            self.trace_player = self.trace.player()
+            self.sorting_generator = self.trace_player
+            print(f"Trace enregistrée: {len(self.trace)} étapes en {time.perf_counter() - record_start:.3f} s")
+        elif self.use_worker:
+            # Le thread trie sa propre copie ; on rejoue ses événements sur une autre copie
+            self.sort_worker = SortWorker(sort_function, self.list_data[:]).start()
+            self.sorting_generator = self.sort_worker.steps(self.list_data[:])
+        else:
+            self.sorting_generator = sort_function(self.list_data[:]) # Travaille sur une copie
+        self.metrics = None
+        if self.show_metrics and self.trace is None: # Les traces n'enregistrent ni phase, ni pile, ni mémoire
+            self.metrics = MetricsRecorder(self.selected_algorithm_name, len(self.list_data),
+                                           counter_labels(self.selected_algorithm_name), timed=False)
+        self._begin_run()
+        print(f"Démarrage du tri: {self.selected_algorithm_name} ({self.list_size} éléments, type: {self.disorder_type})")
+
+    def start_race(self, same_list=False):
+        """Mode course : les algorithmes de RACE_ALGORITHMS sur des copies de la même liste."""
+        self.generate_new_list(same_list)
+        if not self.list_data:
+            print("Impossible de trier une liste vide.")
+            return
+        self._stop_worker()
+        self.trace = None
+        self.trace_player = None
+        self.sorting_generator = None
+        self.metrics = None
+        # Seuls les tris complets font la course ; ceux qui ne comparent pas
+        # (premier compteur en passes) n'en font partie qu'en mode 'time'
+        names = RACE_ALGORITHMS or list(SORTING_ALGORITHMS.keys())
+        uncounted = [name for name in names if counter_labels(name)[0] != DEFAULT_COUNTER_LABELS[0]]
+        if self.race_mode == 'comparisons' and uncounted:
+            names = [name for name in names if name not in uncounted]
+            if RACE_ALGORITHMS:
+                print(f"Course: {', '.join(uncounted)} écarté(s) du mode 'comparisons' (aucune comparaison)")
+            if not names:
+                return
+        self.race = Race(self.algorithms, names, self.list_data, self.race_mode, uncounted)
+        self.steps_per_second = max(self.steps_per_second, RACE_COMPARISONS_PER_SECOND)
+        self._begin_run()
+        print(f"Course: {', '.join(names)} ({self.list_size} éléments, type: {self.disorder_type}, mode: {self.race_mode})")
+
+    def restart(self, same_list=True):
+        """R / bouton Reset : relance la course ou le tri courant."""
+        if self.race is not None:
+            self.start_race(same_list)
+        else:
+            self.start_sorting(same_list)
+
+    def _begin_run(self):
+        """Remise à zéro commune au démarrage d'un tri ou d'une course."""
         self.is_sorting = True
         self.is_paused = False
         self.step_by_step = False # Mettre à True si un mode pas-à-pas est activé via UI
@@ -216,48 +506,172 @@ class Visualizer:
         self.time_elapsed = 0
         self.current_compared = ()
         self.current_swapped = ()
+        self._dirty_bars = set()
+        self._screen_in_sync = False
+        self._reset_scheduler()
+        self.achieved_rate = 0.0
+        self._bins_valid = False
         self.state = 'sorting'
-        print(f"Démarrage du tri: {self.selected_algorithm_name} ({self.list_size} éléments, type: {self.disorder_type})")
+
+    def _stop_worker(self):
+        """Annule proprement le thread de tri éventuel (ESC, R, nouveau tri)."""
+        if self.sort_worker is not None:
+            self.sort_worker.cancel()
+            self.sort_worker = None
 
     def reset_sorting(self):
+        self._stop_worker()
+        self.race = None
+        self.trace = None
+        self.trace_player = None
+        self._scrubbing = False
         self.is_sorting = False
         self.sorting_generator = None
+        self.metrics = None
         self.list_data = [] # Ou garder la dernière liste générée?
         self.comparisons = 0
         self.swaps = 0
         self.time_elapsed = 0
         self.current_compared = ()
         self.current_swapped = ()
+        self._dirty_bars = set()
+        self._screen_in_sync = False
+        self._bins_valid = False
+
+
+    def _reset_scheduler(self):
+        """Repart d'un crédit nul (début de tri, reprise après pause)."""
+        now = time.perf_counter()
+        self._step_credit = 0.0
+        self._last_update_time = now
+        self._rate_window_start = now
+        self._rate_window_steps = 0
+
+    def _advance(self, steps_to_take, deadline):
+        """Avance le générateur d'au plus `steps_to_take` étapes sans dépasser `deadline`.
+
+        Retourne le nombre d'étapes effectuées. StopIteration remonte à l'appelant,
+        après que le dernier état obtenu a été appliqué.
+        """
+        generator = self.sorting_generator
+        dirty = self._dirty_bars
+        perf_counter = time.perf_counter
+        observe = self.metrics.observe if self.metrics is not None else None
+        event = None
+        taken = 0
+        try:
+            while taken < steps_to_take:
+                event = next(generator) # StepEvent réutilisé (voir step_event.py)
+                if observe is not None:
+                    observe(event)
+                # Les indices peuvent être un range (plage surlignée) : `i in` reste en O(1)
+                taken += 1
+                # Seules les écritures (swap, write) modifient des barres : on note celles à redessiner
+                if event.op in WRITE_OPS:
+                    dirty.update(event.swapped)
+                if not taken & 0xFF and perf_counter() > deadline:
+                    break # Budget de la frame épuisé : le crédit restant est abandonné
+        finally:
+            if event is not None: # Seul le dernier état de la frame est affiché
+                self._apply_event(event)
+        return taken
+
+    def _apply_event(self, event):
+        """Copie l'état d'un StepEvent (valable jusqu'à l'étape suivante seulement)."""
+        self.list_data = event.arr
+        self.current_compared = event.compared
+        self.current_swapped = event.swapped
+        self.comparisons = event.comparisons
+        self.swaps = event.swaps
+
+    def _record_rate(self, taken):
+        """Met à jour le débit atteint, mesuré sur des fenêtres de RATE_WINDOW secondes."""
+        self._rate_window_steps += taken
+        now = time.perf_counter()
+        elapsed = now - self._rate_window_start
+        if elapsed >= RATE_WINDOW:
+            self.achieved_rate = self._rate_window_steps / elapsed
+            self._rate_window_start = now
+            self._rate_window_steps = 0
+
+    def _on_sorting_finished(self, store=True):
+        print("Tri terminé!")
+        if store:
+            self._store_result()
+        self.is_sorting = False
+        self.state = 'finished'
+        self.current_compared = ()
+        self.current_swapped = ()
+        self.sorting_generator = None # Important
+        self.sort_worker = None # Le producteur a déjà terminé
+        if sound_done: sound_done.play()
+
+    def _store_result(self):
+        """Mémorise l'état final du tri terminé : compteurs, liste obtenue et mesures si elles
+        sont suivies. Relancer le même tri hors mode enregistrement l'affiche alors directement.
+
+        Tous les tris sont concernés, enregistrés ou non : seule la trace,
+        qui permet de rejouer pas à pas sans recalculer, demande le mode enregistrement (T).
+        """
+        if self.race is not None or self.replay_trace is not None:
+            return
+        result = {'algorithm': self.selected_algorithm_name, 'size': len(self.list_data),
+                  'labels': list(counter_labels(self.selected_algorithm_name)),
+                  'comparisons': self.comparisons, 'swaps': self.swaps,
+                  'final': list(self.list_data)}
+        if self.metrics is not None:
+            for name, value in self.metrics.finish().as_dict().items():
+                result.setdefault(name, value)
+        self.result_cache.put_result(self._cache_key(), result)
 
+    def _finish_from_result(self, result):
+        """Affiche l'état final d'un résultat en cache (compteurs et liste), sans relancer le tri."""
+        self.sorting_generator = None
+        self.metrics = None
+        self._begin_run()
+        self.list_data = list(result['final']) # Copie : l'entrée du cache reste intacte
+        self.comparisons = result['comparisons']
+        self.swaps = result['swaps']
+        self._bins_valid = False
+        first_label, second_label = result['labels']
+        print(f"Résultat en cache: {self.selected_algorithm_name}, {self.comparisons} {first_label}, "
+              f"{self.swaps} {second_label}")
+        self._on_sorting_finished(store=False)
 
     def update_sorting(self, force_step=False):
         if not self.is_sorting or (self.is_paused and not force_step):
             return
+        if self.race is not None:
+            self.update_race(force_step)
+            return
 
         if self.sorting_generator:
             try:
-                # Ajuster le nombre d'étapes par frame basé sur la vitesse
-                steps_to_take = max(1, int(self.sort_speed)) if not force_step else 1
-                
-                final_step_data = None
-                for _ in range(steps_to_take):
-                     if self.sorting_generator is None: break # Peut être arrêté entre temps
-                     
-                     step_data = next(self.sorting_generator)
-                     # step_data = (list_state, compared_indices, swapped_indices, comps, swaps)
-                     self.list_data = step_data[0]
-                     self.current_compared = step_data[1]
-                     self.current_swapped = step_data[2]
-                     self.comparisons = step_data[3]
-                     self.swaps = step_data[4]
-                     final_step_data = step_data # Garder le dernier état de cette frame
-
-                     # Jouer les sons (seulement pour le dernier état de la frame pour éviter cacophonie)
-                     if _ == steps_to_take - 1:
-                         if self.current_compared and sound_compare:
-                             sound_compare.play()
-                         elif self.current_swapped and sound_swap:
-                             sound_swap.play()
+                if force_step:
+                    steps_to_take = 1
+                else:
+                    # Crédit d'étapes proportionnel au temps réel écoulé, pas au nombre de frames
+                    now = time.perf_counter()
+                    dt = min(now - self._last_update_time, MAX_FRAME_DT)
+                    self._last_update_time = now
+                    self._step_credit += self.steps_per_second * dt
+                    steps_to_take = int(self._step_credit)
+                    self._step_credit -= steps_to_take
+
+                # Avec un thread de tri, on ne consomme que ce qui est déjà prêt :
+                # la frame n'attend jamais le producteur
+                if self.sort_worker is not None and not self.sort_worker.finished():
+                    steps_to_take = min(steps_to_take, self.sort_worker.pending())
+
+                taken = self._advance(steps_to_take, time.perf_counter() + STEP_TIME_BUDGET)
+                self._record_rate(taken)
+
+                # Jouer les sons (seulement pour le dernier état de la frame pour éviter cacophonie)
+                if taken:
+                    if self.current_compared and sound_compare:
+                        sound_compare.play()
+                    elif self.current_swapped and sound_swap:
+                        sound_swap.play()
                 
                 # Mettre à jour le temps écoulé si pas en pause
                 if not self.is_paused:
@@ -268,46 +682,152 @@ class Visualizer:
                     self.is_paused = True
 
             except StopIteration:
-                print("Tri terminé!")
-                self.is_sorting = False
-                self.state = 'finished'
-                self.current_compared = ()
-                self.current_swapped = ()
-                self.sorting_generator = None # Important
-                if sound_done: sound_done.play()
+                self._on_sorting_finished()
             except Exception as e:
                 print(f"Erreur pendant le tri: {e}")
                 self.reset_sorting()
                 self.state = 'menu' # Retour au menu en cas d'erreur
 
+    def update_race(self, force_step=False):
+        """Une frame de course : l'horloge avance de steps_per_second comparaisons par seconde."""
+        try:
+            if force_step:
+                self.race.step()
+            else:
+                now = time.perf_counter()
+                dt = min(now - self._last_update_time, MAX_FRAME_DT)
+                self._last_update_time = now
+                self.race.update(self.steps_per_second * dt, STEP_TIME_BUDGET)
+        except Exception as e:
+            print(f"Erreur pendant la course: {e}")
+            self.reset_sorting()
+            self.state = 'menu'
+            return
+        if not self.is_paused:
+            self.time_elapsed = time.perf_counter() - self.start_time
+        if force_step:
+            self.is_paused = True
+        if self.race.done:
+            self._on_sorting_finished()
+
+    def finish_sorting_instantly(self):
+        """Vide le générateur d'un coup, sans rendu intermédiaire, puis affiche l'état final."""
+        if self.race is not None:
+            self.race.finish()
+            if not self.is_paused:
+                self.time_elapsed = time.perf_counter() - self.start_time
+            self._on_sorting_finished()
+            return
+        if not self.sorting_generator:
+            return
+        if self.trace is not None: # Trace enregistrée : saut direct à la fin en O(K)
+            self.seek_trace(len(self.trace))
+            self._on_sorting_finished()
+            return
+        event = None
+        try:
+            if self.metrics is not None:
+                observe = self.metrics.observe
+                for event in self.sorting_generator:
+                    observe(event)
+            else:
+                for event in self.sorting_generator:
+                    pass
+        except Exception as e:
+            print(f"Erreur pendant le tri: {e}")
+            self.reset_sorting()
+            self.state = 'menu'
+            return
+        if event is not None:
+            self._apply_event(event)
+        if not self.is_paused:
+            self.time_elapsed = time.perf_counter() - self.start_time
+        self._bins_valid = False # Écritures non suivies pendant le vidage
+        self._on_sorting_finished()
+
+    def seek_trace(self, t):
+        """Va à l'étape t de la trace enregistrée (O(K)) et met l'animation en pause."""
+        if self.trace is None:
+            return
+        self.trace_player = self.trace.player(t)
+        self.sorting_generator = self.trace_player
+        self.metrics = None # Mesures cumulées : plus valables après un saut dans la trace
+        self._apply_event(self.trace_player.current())
+        self.is_sorting = True
+        self.is_paused = True
+        self.state = 'sorting'
+        self._dirty_bars = set()
+        self._screen_in_sync = False
+        self._bins_valid = False
+
+    def _seek_from_timeline(self, x):
+        fraction = (x - TIMELINE_RECT.left) / TIMELINE_RECT.width
+        self.seek_trace(round(min(1.0, max(0.0, fraction)) * len(self.trace)))
+
     def draw(self):
+        if self.surface_cache.check_screen_size(self.screen.get_size()):
+            self._screen_in_sync = False # Fenêtre redimensionnée : tout est à redessiner
+
+        # Pendant le tri en barres, seules les zones modifiées sont repeintes
+        if (self.state == 'sorting' and self._uses_incremental_bars()
+                and self._screen_in_sync and len(self._bar_cache) == len(self.list_data)):
+            self.draw_incremental()
+            return
+
         self.screen.fill(BACKGROUND_COLOR) # Applique la couleur de fond du thème
+        self._screen_in_sync = False
 
         if self.state == 'menu':
             self.draw_menu()
         elif self.state == 'sorting' or self.state == 'finished':
-            self.draw_sorting_interface()
+            if self.race is not None:
+                self.draw_race()
+            else:
+                self.draw_sorting_interface()
             self.draw_stats()
             self.draw_controls() # Dessine les boutons Pause, Reset, etc.
+            if self.trace is not None:
+                self.draw_timeline()
             if self.state == 'finished':
                  # Afficher message "Terminé"
-                 finish_text = TITLE_FONT.render("Tri Terminé!", True, WHITE)
+                 finish_text = self.surface_cache.text(TITLE_FONT, "Tri Terminé!", WHITE)
                  finish_rect = finish_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
                  self.screen.blit(finish_text, finish_rect)
+            elif self._uses_incremental_bars():
+                 self._screen_in_sync = True # draw_bars vient de reconstruire calque et cache
+        self._dirty_bars.clear() # Écritures déjà prises en compte par ce rendu complet
 
 
         pygame.display.flip()
 
+    def draw_incremental(self):
+        """Frame partielle : barres modifiées + panneau de stats, puis display.update(rects)."""
+        dirty_rects = self.draw_bars_incremental()
+
+        if self.trace is not None:
+            self.screen.fill(BACKGROUND_COLOR, TIMELINE_BAND)
+            self.draw_timeline()
+            dirty_rects.append(TIMELINE_BAND)
+
+        # Le panneau du bas (stats, boutons) change à chaque frame : on le repeint en entier
+        panel_rect = pygame.Rect(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100)
+        self.screen.fill(BACKGROUND_COLOR, panel_rect)
+        self.draw_stats()
+        self.draw_controls()
+        dirty_rects.append(panel_rect)
+
+        pygame.display.update(dirty_rects)
+
     def draw_menu(self):
          # Dessiner le titre, les options (algos, taille, désordre, thème, visu), le bouton Start
-         title_surf = TITLE_FONT.render("Les Papyrus de Héron", True, WHITE)
+         title_surf = self.surface_cache.text(TITLE_FONT, "Les Papyrus de Héron", WHITE)
          title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 50))
          self.screen.blit(title_surf, title_rect)
          
          # --- Dessiner les boutons --- (Exemple simplifié)
          y_offset = 150
          # Algorithmes
-         algo_label = UI_FONT.render("Algorithme:", True, WHITE)
+         algo_label = self.surface_cache.text(UI_FONT, "Algorithme:", WHITE)
          self.screen.blit(algo_label, (50, y_offset))
          col_width = 200
          row_height = 40
@@ -316,7 +836,7 @@ class Visualizer:
               is_selected = (name == self.selected_algorithm_name)
               btn_color = LIGHT_GRAY if is_selected else GRAY
               pygame.draw.rect(self.screen, btn_color, btn_rect)
-              btn_text = STATS_FONT.render(name, True, BLACK)
+              btn_text = self.surface_cache.text(STATS_FONT, name, BLACK)
               btn_text_rect = btn_text.get_rect(center=btn_rect.center)
               self.screen.blit(btn_text, btn_text_rect)
               # Stocker le rect pour la détection de clic
@@ -328,7 +848,7 @@ class Visualizer:
          # Bouton Démarrer
          start_btn_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 100, 200, 50)
          pygame.draw.rect(self.screen, (0, 180, 0), start_btn_rect) # Vert
-         start_text = UI_FONT.render("Commencer le Tri", True, WHITE)
+         start_text = self.surface_cache.text(UI_FONT, "Commencer le Tri", WHITE)
          start_text_rect = start_text.get_rect(center=start_btn_rect.center)
          self.screen.blit(start_text, start_text_rect)
          self.buttons['start_button'] = start_btn_rect # Stocker pour clic
@@ -338,13 +858,60 @@ class Visualizer:
         if not self.list_data:
             return
 
-        if self.visualization_type == 'bars':
+        if self._use_binned_view():
+            self.draw_bars_binned()
+        elif self._use_vector_renderer():
+            self.draw_vectorized()
+        elif self.visualization_type == 'bars':
             self.draw_bars()
         elif self.visualization_type == 'circle':
             self.draw_circle()
         # Ajouter elif pour 'spiral', 'grid'...
 
-    def draw_bars(self):
+    def _bars_area_width(self):
+        return int(SCREEN_WIDTH * 0.9)
+
+    def _use_binned_view(self):
+        """Vrai si la liste compte plus d'éléments que la zone des barres n'a de pixels
+        et qu'aucun moteur de rendu n'a été imposé (mode 'auto')."""
+        return (self.renderer == 'auto' and self.visualization_type == 'bars'
+                and len(self.list_data) > self._bars_area_width())
+
+    def _uses_incremental_bars(self):
+        """Vrai si les barres passent par le calque persistant (une barre pygame par élément)."""
+        return (self.visualization_type == 'bars' and bool(self.list_data) and self.race is None
+                and not self._use_binned_view() and not self._use_vector_renderer())
+
+    def _use_vector_renderer(self):
+        """Vrai si le rendu NumPy doit être utilisé pour la liste courante."""
+        if not HAS_NUMPY or self.renderer == 'pygame':
+            return False
+        return self.renderer == 'numpy' or len(self.list_data) > VECTOR_RENDER_THRESHOLD
+
+    def _vector_colors(self):
+        return {
+            'background': BACKGROUND_COLOR,
+            'bar': BAR_COLOR,
+            'highlight': HIGHLIGHT_COLOR,
+            'swap': SWAP_COLOR,
+        }
+
+    def draw_vectorized(self):
+        """Rendu NumPy : coût proportionnel à la zone de dessin, pas au nombre d'éléments."""
+        colors = self._vector_colors()
+        if self.visualization_type == 'bars':
+            total_width = SCREEN_WIDTH * 0.9
+            area = pygame.Rect((SCREEN_WIDTH - total_width) // 2, 50, total_width, SCREEN_HEIGHT - 150)
+            draw_bars_numpy(self.screen, area, self.list_data, self.max_list_val,
+                            self.current_compared, self.current_swapped, colors)
+        elif self.visualization_type == 'circle':
+            center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
+            radius = min(SCREEN_WIDTH, SCREEN_HEIGHT) * 0.35
+            draw_circle_numpy(self.screen, center, radius, self.list_data, self.max_list_val,
+                              self.current_compared, self.current_swapped, colors)
+
+    def _bar_layout(self):
+        """Géométrie des barres : (start_x, bar_width, bar_spacing, y_start, hauteur de zone)."""
         num_bars = len(self.list_data)
         # Ajuster la zone de dessin pour laisser de la place aux stats/contrôles
         drawing_area_height = SCREEN_HEIGHT - 150 
@@ -355,41 +922,160 @@ class Visualizer:
         bar_spacing = 2 
         bar_width = (total_width - (num_bars - 1) * bar_spacing) / num_bars
         start_x = (SCREEN_WIDTH - total_width) // 2
+        return start_x, bar_width, bar_spacing, drawing_area_y_start, drawing_area_height
+
+    def _bar_column(self, i, layout):
+        """Colonne pleine hauteur occupée par la barre i (zone à effacer avant de la redessiner)."""
+        start_x, bar_width, bar_spacing, drawing_area_y_start, drawing_area_height = layout
+        bar_x = start_x + i * (bar_width + bar_spacing)
+        return pygame.Rect(bar_x, drawing_area_y_start, bar_width, drawing_area_height)
+
+    def _draw_bar(self, surface, i, val, layout, is_compared, is_swapped):
+        """Dessine la barre i (et sa surbrillance éventuelle) sur `surface`."""
+        start_x, bar_width, bar_spacing, drawing_area_y_start, drawing_area_height = layout
 
         # Valeur max pour normaliser la hauteur
         max_val = self.max_list_val 
         if max_val == 0: max_val = 1 # Éviter division par zéro
 
-        for i, val in enumerate(self.list_data):
-            bar_height = (val / max_val) * (drawing_area_height * 0.95) # Hauteur proportionnelle
-            bar_x = start_x + i * (bar_width + bar_spacing)
-            bar_y = drawing_area_y_start + drawing_area_height - bar_height
-            
-            rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-            
-            # Couleur de base
-            color = BAR_COLOR
-            
-            # Dessiner la barre
-            pygame.draw.rect(self.screen, color, rect)
+        bar_height = (val / max_val) * (drawing_area_height * 0.95) # Hauteur proportionnelle
+        bar_x = start_x + i * (bar_width + bar_spacing)
+        bar_y = drawing_area_y_start + drawing_area_height - bar_height
+        
+        rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
+        
+        # Couleur de base
+        color = BAR_COLOR
+        
+        # Dessiner la barre
+        pygame.draw.rect(surface, color, rect)
 
-            # --- Ajout des effets visuels ---
-            # Créer une surface pour le highlighting (avec alpha)
-            highlight_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
+        # --- Ajout des effets visuels ---
+        # Surbrillance (avec alpha) : une surface pleine hauteur par couleur, en cache,
+        # dont on ne copie que la partie couvrant la barre
+        if is_compared or is_swapped:
+            highlight_size = (bar_width, drawing_area_height)
+            highlight_area = pygame.Rect(0, 0, bar_width, bar_height)
 
             # Appliquer surbrillance/couleur spéciale
-            if i in self.current_compared:
-                 highlight_surface.fill(HIGHLIGHT_COLOR)
-                 self.screen.blit(highlight_surface, (bar_x, bar_y))
-            if i in self.current_swapped:
-                 highlight_surface.fill(SWAP_COLOR)
-                 self.screen.blit(highlight_surface, (bar_x, bar_y))
+            if is_compared:
+                 highlight_surface = self.surface_cache.highlight(highlight_size, HIGHLIGHT_COLOR)
+                 surface.blit(highlight_surface, (bar_x, bar_y), highlight_area)
+            if is_swapped:
+                 highlight_surface = self.surface_cache.highlight(highlight_size, SWAP_COLOR)
+                 surface.blit(highlight_surface, (bar_x, bar_y), highlight_area)
                  
-            # Ajouter ombres (optionnel, coûteux en perf)
-            # shadow_offset = 2
-            # shadow_rect = pygame.Rect(bar_x + shadow_offset, bar_y + shadow_offset, bar_width, bar_height)
-            # pygame.draw.rect(self.screen, (0,0,0,50), shadow_rect) # Ombre noire semi-transparente
+        # Ajouter ombres (optionnel, coûteux en perf)
+        # shadow_offset = 2
+        # shadow_rect = pygame.Rect(bar_x + shadow_offset, bar_y + shadow_offset, bar_width, bar_height)
+        # pygame.draw.rect(surface, (0,0,0,50), shadow_rect) # Ombre noire semi-transparente
 
+    def draw_bars(self):
+        """Redessine toutes les barres sur le calque persistant, puis le copie à l'écran."""
+        layout = self._bar_layout()
+        compared = self.current_compared
+        swapped = self.current_swapped
+
+        self.bars_layer.fill(BACKGROUND_COLOR)
+        self._bar_cache = []
+        for i, val in enumerate(self.list_data):
+            is_compared = i in compared
+            is_swapped = i in swapped
+            self._draw_bar(self.bars_layer, i, val, layout, is_compared, is_swapped)
+            self._bar_cache.append((val, is_compared, is_swapped))
+
+        self._dirty_bars = set()
+        self._drawn_compared = compared
+        self._drawn_swapped = swapped
+        self.screen.blit(self.bars_layer, (0, 0))
+
+    def draw_bars_incremental(self):
+        """Repeint sur le calque les seules barres dont la valeur ou la surbrillance a changé.
+
+        Retourne les rects d'écran correspondants (à passer à display.update).
+        """
+        layout = self._bar_layout()
+        compared = self.current_compared
+        swapped = self.current_swapped
+
+        # Candidats : barres écrites depuis la dernière frame, plus celles dont la
+        # surbrillance a pu changer (anciennes et nouvelles plages surlignées)
+        candidates = self._dirty_bars
+        self._dirty_bars = set()
+        if compared != self._drawn_compared:
+            candidates.update(self._drawn_compared)
+            candidates.update(compared)
+        if swapped != self._drawn_swapped:
+            candidates.update(self._drawn_swapped)
+            candidates.update(swapped)
+        self._drawn_compared = compared
+        self._drawn_swapped = swapped
+
+        dirty_rects = []
+        for i in candidates:
+            val = self.list_data[i]
+            state = (val, i in compared, i in swapped)
+            if self._bar_cache[i] == state:
+                continue
+            self._bar_cache[i] = state
+            column = self._bar_column(i, layout)
+            self.bars_layer.fill(BACKGROUND_COLOR, column)
+            self._draw_bar(self.bars_layer, i, val, layout, state[1], state[2])
+            self.screen.blit(self.bars_layer, column, column)
+            dirty_rects.append(column)
+        return dirty_rects
+
+
+    def draw_bars_binned(self):
+        """Vue agrégée : par colonne, barre jusqu'au min, enveloppe min-max et repère de moyenne.
+
+        Les colonnes sont mises à jour avec les seules écritures de la frame,
+        le dessin coûte O(largeur de la zone) quel que soit n.
+        """
+        num_bins = self._bars_area_width()
+        if self.column_bins is None or self.column_bins.num_bins != num_bins:
+            self.column_bins = ColumnBins(num_bins)
+            self._bins_valid = False
+        bins = self.column_bins
+        if not self._bins_valid or bins.size != len(self.list_data):
+            bins.rebuild(self.list_data)
+            self._bins_valid = True
+        else:
+            bins.update(self._dirty_bars, self.list_data)
+        self._dirty_bars.clear()
+
+        drawing_area_height = SCREEN_HEIGHT - 150
+        drawing_area_y_start = 50
+        bottom = drawing_area_y_start + drawing_area_height
+        start_x = (SCREEN_WIDTH - num_bins) // 2
+        max_val = self.max_list_val
+        if max_val == 0: max_val = 1 # Éviter division par zéro
+        scale = drawing_area_height * 0.95 / max_val
+
+        # Enveloppe : couleur des barres éclaircie ; moyenne : assombrie
+        envelope_color = tuple(c + (255 - c) // 2 for c in BAR_COLOR[:3])
+        mean_color = tuple(c // 2 for c in BAR_COLOR[:3])
+        compared_bins = bins.bins_for(self.current_compared)
+        swapped_bins = bins.bins_for(self.current_swapped)
+
+        draw_line = pygame.draw.line
+        screen = self.screen
+        for b in range(num_bins):
+            if not bins.counts[b]:
+                continue
+            x = start_x + b
+            y_min = bottom - bins.mins[b] * scale
+            y_max = bottom - bins.maxs[b] * scale
+            y_mean = bottom - bins.mean(b) * scale
+            if b in swapped_bins:
+                color = SWAP_COLOR[:3]
+            elif b in compared_bins:
+                color = HIGHLIGHT_COLOR[:3]
+            else:
+                color = BAR_COLOR
+            draw_line(screen, color, (x, bottom - 1), (x, y_min))
+            draw_line(screen, envelope_color, (x, y_min), (x, y_max))
+            draw_line(screen, mean_color, (x, y_mean - 1), (x, y_mean + 1))
 
     def draw_circle(self):
          # Implémentation pour la visualisation en cercle
@@ -427,22 +1113,151 @@ class Visualizer:
 
     # Ajouter draw_spiral(), draw_grid() ...
 
+    def _race_layout(self):
+        """Panneaux de la course et colonnes de barres, communes à tous les panneaux.
+
+        Calculé une fois par course (et par taille de fenêtre) : chaque frame ne
+        fait plus que lire les valeurs et remplir des rectangles.
+        """
+        count, n = len(self.race.lanes), len(self.list_data)
+        key = (count, n, self.screen.get_size())
+        if self._race_layout_cache is not None and self._race_layout_cache[0] == key:
+            return self._race_layout_cache[1]
+
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        area = pygame.Rect(SCREEN_WIDTH * 0.05, 50, SCREEN_WIDTH * 0.9, SCREEN_HEIGHT - 150)
+        pane_width = area.width // cols
+        pane_height = area.height // rows
+        panes = [pygame.Rect(area.left + (k % cols) * pane_width, area.top + (k // cols) * pane_height,
+                             pane_width - RACE_PANE_GAP, pane_height - RACE_PANE_GAP)
+                 for k in range(count)]
+        bars_width = pane_width - RACE_PANE_GAP
+        bars_height = pane_height - RACE_PANE_GAP - RACE_LABEL_HEIGHT
+
+        # Au plus une colonne par pixel : au-delà, un élément sur n/largeur est affiché
+        num_columns = min(n, bars_width)
+        slot = bars_width / num_columns
+        bar_spacing = 2 if slot >= 6 else 0
+        columns = []
+        for c in range(num_columns):
+            x = int(c * slot)
+            width = max(1, int((c + 1) * slot) - x - bar_spacing)
+            columns.append((x, width, c * n // num_columns)) # (x relatif, largeur, indice affiché)
+
+        layout = (panes, columns, bars_height)
+        self._race_layout_cache = (key, layout)
+        return layout
+
+    def draw_race(self):
+        """Un panneau par algorithme, dessinés en une seule passe avec la même disposition."""
+        panes, columns, bars_height = self._race_layout()
+        use_numpy = self._use_vector_renderer()
+        colors = self._vector_colors()
+        for lane, pane in zip(self.race.lanes, panes):
+            pygame.draw.rect(self.screen, LIGHT_GRAY if lane.finished else GRAY, pane, 1)
+            self.draw_race_label(lane, pane)
+            area = pygame.Rect(pane.left, pane.top + RACE_LABEL_HEIGHT, pane.width, bars_height)
+            if use_numpy:
+                draw_bars_numpy(self.screen, area, lane.list_data, self.max_list_val,
+                                lane.compared, lane.swapped, colors)
+            else:
+                self._draw_race_bars(lane, area, columns)
+
+    def _draw_race_bars(self, lane, area, columns):
+        max_val = self.max_list_val
+        if max_val == 0: max_val = 1 # Éviter division par zéro
+        scale = area.height * 0.95 / max_val
+        # Surbrillances opaques (couleur de barre déjà mélangée) : un seul fill par colonne
+        compared_color = _blend_rgb(BAR_COLOR, HIGHLIGHT_COLOR)
+        swapped_color = _blend_rgb(BAR_COLOR, SWAP_COLOR)
+        data, compared, swapped = lane.list_data, lane.compared, lane.swapped
+        fill = self.screen.fill
+        left, bottom = area.left, area.bottom
+        for x, width, i in columns:
+            height = int(data[i] * scale)
+            if height <= 0:
+                continue
+            if i in swapped:
+                color = swapped_color
+            elif i in compared:
+                color = compared_color
+            else:
+                color = BAR_COLOR
+            fill(color, (left + x, bottom - height, width, height))
+
+    def draw_race_label(self, lane, pane):
+        title = lane.name
+        if lane.rank is not None:
+            title = f"{lane.rank}{'er' if lane.rank == 1 else 'e'} - {title}"
+        first_label, second_label = counter_labels(lane.name)
+        counters = f"{lane.comparisons} {first_label}, {lane.swaps} {second_label}"
+        if self.race.mode == 'time':
+            counters += f", {lane.busy_time * 1000:.0f} ms"
+        self.screen.blit(self.surface_cache.text(RACE_FONT, title, WHITE), (pane.left + 4, pane.top + 2))
+        self.screen.blit(self.surface_cache.volatile_text(RACE_FONT, counters, WHITE), (pane.left + 4, pane.top + 18))
+
     def draw_stats(self):
         # Afficher les infos : algo, comparaisons, échanges, temps
-        algo_text = f"Algorithme: {self.selected_algorithm_name}"
-        comp_text = f"Comparaisons: {self.comparisons}"
-        swap_text = f"Échanges: {self.swaps}"
-        time_text = f"Temps écoulé: {self.time_elapsed:.3f} s"
-        speed_text = f"Vitesse: x{self.sort_speed:.1f}"
-
-        texts = [algo_text, comp_text, swap_text, time_text, speed_text]
+        if self.race is not None:
+            texts = self._race_stats()
+        else:
+            algo_text = f"Algorithme: {self.selected_algorithm_name}"
+            if self.sort_worker is not None:
+                algo_text += " (thread)"
+            first_label, second_label = counter_labels(self.selected_algorithm_name)
+            comp_text = f"{first_label.capitalize()}: {self.comparisons}"
+            swap_text = f"{second_label.capitalize()}: {self.swaps}"
+            time_text = f"Temps écoulé: {self.time_elapsed:.3f} s"
+            speed_text = (f"Vitesse: {_format_rate(self.steps_per_second)} pas/s"
+                          f" (réel: {_format_rate(self.achieved_rate)} pas/s)")
+            texts = [algo_text, comp_text, swap_text, time_text, speed_text]
         y_pos = SCREEN_HEIGHT - 100 # Positionnement en bas
 
         for i, text in enumerate(texts):
-            surf = STATS_FONT.render(text, True, WHITE)
+            # Seule la première ligne (algorithme ou mode de course) est stable
+            render = self.surface_cache.volatile_text if i else self.surface_cache.text
+            surf = render(STATS_FONT, text, WHITE)
             rect = surf.get_rect(left=10, top=y_pos + i * 25)
             self.screen.blit(surf, rect)
-            
+        if self.race is None and self.metrics is not None:
+            self.draw_metrics(y_pos)
+
+    def draw_metrics(self, top):
+        """Mesures détaillées (MetricsRecorder), au-dessus des boutons."""
+        metrics = self.metrics
+        texts = [f"Phase: {metrics.phase or '-'}   Écritures: {metrics.writes}",
+                 f"Pile max: {metrics.max_depth}   Mémoire aux. max: {metrics.aux_peak}"]
+        for i, text in enumerate(texts):
+            surf = self.surface_cache.volatile_text(RACE_FONT, text, WHITE)
+            self.screen.blit(surf, (SCREEN_WIDTH - 340, top + 4 + i * 18))
+
+    def _race_stats(self):
+        race = self.race
+        if race.mode == 'comparisons':
+            mode_text = "Course au même nombre de comparaisons (L)"
+            clock_text = f"Horloge: {int(race.clock)} comparaisons"
+            speed_text = f"Vitesse: {_format_rate(self.steps_per_second)} comparaisons/s"
+        else:
+            mode_text = "Course au même temps de calcul (L)"
+            clock_text = f"Tranche: {STEP_TIME_BUDGET * 1000 / max(1, len(race.active_lanes())):.2f} ms par algorithme et par frame"
+            speed_text = "Vitesse: maximale"
+        return [mode_text, f"Arrivés: {race.arrivals} / {len(race.lanes)}", clock_text,
+                f"Temps écoulé: {self.time_elapsed:.3f} s", speed_text]
+
+    def draw_timeline(self):
+        """Frise de la trace enregistrée : position courante, cliquable et glissable."""
+        total = len(self.trace)
+        position = self.trace_player.position if self.trace_player else total
+        pygame.draw.rect(self.screen, GRAY, TIMELINE_RECT)
+        if total:
+            done_width = TIMELINE_RECT.width * position / total
+            pygame.draw.rect(self.screen, LIGHT_GRAY, (TIMELINE_RECT.left, TIMELINE_RECT.top, done_width, TIMELINE_RECT.height))
+            knob_x = TIMELINE_RECT.left + done_width
+            pygame.draw.rect(self.screen, WHITE, (knob_x - 3, TIMELINE_RECT.top - 4, 6, TIMELINE_RECT.height + 8))
+        label = self.surface_cache.volatile_text(STATS_FONT, f"Étape {position} / {total}", WHITE)
+        self.screen.blit(label, label.get_rect(left=TIMELINE_RECT.left, bottom=TIMELINE_RECT.top - 2))
+
     def draw_controls(self):
          # Dessiner les boutons interactifs (Pause/Play, Reset, Menu, Step?)
          # Exemple simplifié pour Reset et Menu
@@ -450,12 +1265,12 @@ class Visualizer:
          menu_btn_rect = pygame.Rect(SCREEN_WIDTH - 120, SCREEN_HEIGHT - 60, 100, 40)
          
          pygame.draw.rect(self.screen, GRAY, reset_btn_rect)
-         reset_text = STATS_FONT.render("Reset (R)", True, BLACK)
+         reset_text = self.surface_cache.text(STATS_FONT, "Reset (R)", BLACK)
          self.screen.blit(reset_text, reset_text.get_rect(center=reset_btn_rect.center))
          self.buttons['reset_button'] = reset_btn_rect
 
          pygame.draw.rect(self.screen, GRAY, menu_btn_rect)
-         menu_text = STATS_FONT.render("Menu (Esc)", True, BLACK)
+         menu_text = self.surface_cache.text(STATS_FONT, "Menu (Esc)", BLACK)
          self.screen.blit(menu_text, menu_text.get_rect(center=menu_btn_rect.center))
          self.buttons['menu_button'] = menu_btn_rect
 
@@ -463,7 +1278,7 @@ class Visualizer:
          pause_btn_rect = pygame.Rect(SCREEN_WIDTH - 340, SCREEN_HEIGHT - 60, 100, 40)
          pause_text_str = "Pause (Spc)" if not self.is_paused else "Play (Spc)"
          pygame.draw.rect(self.screen, GRAY, pause_btn_rect)
-         pause_text = STATS_FONT.render(pause_text_str, True, BLACK)
+         pause_text = self.surface_cache.text(STATS_FONT, pause_text_str, BLACK)
          self.screen.blit(pause_text, pause_text.get_rect(center=pause_btn_rect.center))
          self.buttons['pause_button'] = pause_btn_rect 
          # Note: La logique de clic pour Pause est gérée au clavier pour l'instant
@@ -471,5 +1286,12 @@ class Visualizer:
 
 # --- Point d'entrée ---
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Les Papyrus de Héron - Visualisation de Tri")
+    parser.add_argument('--replay', metavar='FICHIER',
+                        help="Rejouer une trace enregistrée avec sort_trace.py")
+    args = parser.parse_args()
+
     visualizer = Visualizer()
-    visualizer.run()
\ No newline at end of file
+    if args.replay:
+        visualizer.load_replay(args.replay)
+    visualizer.run()